@@ -1,13 +1,14 @@
 from pico2d import *
+import resources
 
 class UIManager:
     def __init__(self, canvas_width, canvas_height):
         self.canvas_width = canvas_width
         self.canvas_height = canvas_height
 
-        # UI 이미지 로드
-        self.status_pane = load_image('status_pane.png')   # 상단 UI
-        self.toolbar = load_image('toolbar.png')           # 하단 UI
+        # UI 이미지 로드 (play_mode HUD와 같은 이미지를 공유)
+        self.status_pane = resources.image('status_pane.png')   # 상단 UI
+        self.toolbar = resources.image('toolbar.png')           # 하단 UI
 
         # 크기 설정 (이미지 크기 자동 사용)
         self.status_width = self.status_pane.w
@@ -29,3 +30,9 @@ class UIManager:
             self.canvas_width // 2,
             self.toolbar_height // 2 + offset_y
         )
+
+    def release(self):
+        # 더 이상 쓰지 않으면 참조를 돌려줘서 캐시가 필요할 때 내보낼 수 있게 함
+        resources.release(self.status_pane)
+        resources.release(self.toolbar)
+        self.status_pane = self.toolbar = None
@@ -1,8 +1,6 @@
-import struct
-p = 'assets/ratking.png'
-with open(p,'rb') as f:
-    b = f.read()
-# PNG IHDR chunk is at bytes 16..23 (big endian)
-w, h = struct.unpack('>II', b[16:24])
-print(w, h)
+import asset_manifest
 
+# 헤더만 읽어서 크기/칸 구성 출력 (asset_manifest 캐시 사용)
+p = 'assets/ratking.png'
+w, h = asset_manifest.image_size(p)
+print(w, h, asset_manifest.grid(p))
@@ -0,0 +1,157 @@
+# asset_loader.py
+# 이미지를 백그라운드 스레드에서 읽고 디코딩하는 비동기 로더
+#
+# 파일 읽기와 디코딩(IMG_Load_RW -> SDL_Surface)은 작업 스레드에서 하고,
+# 텍스처 업로드(SDL_CreateTextureFromSurface)만 메인 스레드에서 pump()가 시간 예산 안에서 처리합니다.
+# 업로드한 이미지는 resources 캐시에 넣어 두므로 나중에 resources.image()가 바로 돌려줍니다.
+# 핸들이 이미지마다 참조를 하나씩 잡고 있으므로(캐시에서 내보내지지 않게), 다 쓰면 handle.release() 하세요.
+#
+#     handle = asset_loader.load_images(['assets/map.jpg', ...])
+#     while not handle.done:       # 보통 game_framework.preload() 제너레이터 안에서
+#         handle.pump()
+#         yield
+#
+# 실제 pico2d 렌더러가 없으면(headless 등) 작업 스레드는 파일만 읽어 두고
+# 메인 스레드에서 평소처럼 resources.image()로 로드합니다.
+
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import resources
+
+try:
+    from sdl2 import SDL_RWFromConstMem, SDL_CreateTextureFromSurface, SDL_FreeSurface
+    from sdl2.sdlimage import IMG_Load_RW
+except ImportError:
+    IMG_Load_RW = None
+
+WORKERS = 4
+# pump() 한 번에 업로드에 쓰는 최대 시간 (초). 결과가 없으면 이만큼 기다렸다가 돌아감
+UPLOAD_BUDGET = 0.004
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='asset_loader')
+    return _executor
+
+
+def _decode(path, use_sdl):
+    """작업 스레드: 파일을 읽고 가능하면 SDL_Surface로 디코딩합니다."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not use_sdl:
+        return None
+    # IMG_Load_RW는 data를 복사하지 않으므로 디코딩이 끝날 때까지 data가 살아 있어야 함
+    surface = IMG_Load_RW(SDL_RWFromConstMem(data, len(data)), 1)
+    if not surface:
+        raise IOError(f'cannot decode {path}')
+    return surface
+
+
+class LoadHandle:
+    """load_images()가 돌려주는 완료 핸들. 진행률과 실패 목록을 알려 줍니다."""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.total = len(self.paths)
+        self.uploaded = 0
+        self.failed = []        # (경로, 오류 메시지)
+        self.images = []        # 올린 이미지 (핸들이 잡고 있는 resources 참조)
+        self.seconds = 0.0      # 시작부터 마지막 업로드까지 걸린 시간
+        self._ready = queue.Queue()
+        self._start = time.perf_counter()
+        # 창이 없거나 SDL_image가 없으면 작업 스레드는 파일만 읽고 업로드는 resources.image()로
+        self._backend = resources.texture_backend() if IMG_Load_RW is not None else None
+
+        executor = _get_executor()
+        for path in self.paths:
+            future = executor.submit(_decode, path, self._backend is not None)
+            future.add_done_callback(lambda f, p=path: self._ready.put((p, f)))
+
+    @property
+    def finished(self):
+        return self.uploaded + len(self.failed)
+
+    @property
+    def done(self):
+        return self.finished >= self.total
+
+    @property
+    def progress(self):
+        """0.0 ~ 1.0 (업로드까지 끝난 비율)."""
+        return self.finished / self.total if self.total else 1.0
+
+    def pump(self, budget=UPLOAD_BUDGET, wait=True):
+        """메인 스레드에서 호출: 디코딩이 끝난 이미지를 budget 초 안에서 텍스처로 올립니다.
+        wait=False면 디코딩이 끝난 것이 없을 때 기다리지 않고 바로 돌아갑니다."""
+        deadline = time.perf_counter() + budget
+        while not self.done:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                if wait:
+                    path, future = self._ready.get(timeout=remaining)
+                else:
+                    path, future = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._upload(path, future)
+        self.seconds = time.perf_counter() - self._start
+
+    def wait(self):
+        """모두 올라갈 때까지 기다립니다 (메인 스레드)."""
+        while not self.done:
+            self.pump(0.05)
+
+    def _upload(self, path, future):
+        try:
+            surface = future.result()
+            if surface is None:
+                # 렌더러가 없으면 평소 경로로 로드 (파일은 이미 OS 캐시에 올라와 있음)
+                image = resources.image(path)
+            else:
+                renderer, image_class = self._backend
+                texture = SDL_CreateTextureFromSurface(renderer, surface)
+                SDL_FreeSurface(surface)
+                if not texture:
+                    raise IOError(f'cannot create texture for {path}')
+                image = resources.adopt(path, image_class(texture))
+            self.images.append(image)
+            self.uploaded += 1
+        except Exception as e:
+            print(f"[asset_loader] {path} 실패: {e}")
+            self.failed.append((path, str(e)))
+
+    def release(self):
+        """핸들이 잡고 있던 이미지 참조를 돌려줍니다 (자원을 가져간 쪽의 참조는 그대로)."""
+        for image in self.images:
+            resources.release(image)
+        self.images.clear()
+
+
+def submit(fn, *args):
+    """fn(*args)를 작업 스레드에서 실행하고 Future를 돌려줍니다 (이미지 합성/저장처럼 메인 스레드를 막는 일).
+    fn은 pico2d/SDL을 건드리면 안 됩니다."""
+    return _get_executor().submit(fn, *args)
+
+
+def shutdown():
+    """작업 스레드를 정리합니다. 아직 시작하지 않은 읽기는 취소합니다 (다음 load_images()가 새로 만듦)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def load_images(paths):
+    """paths의 이미지를 백그라운드에서 읽기 시작하고 LoadHandle을 돌려줍니다.
+    이미 resources 캐시에 있거나 없는 파일은 건너뜁니다."""
+    todo = [p for p in paths if os.path.exists(p) and not resources.is_cached(p)]
+    return LoadHandle(todo)
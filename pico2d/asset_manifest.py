@@ -0,0 +1,396 @@
+# asset_manifest.py
+# 에셋 폴더의 이미지 정보(크기, 프레임 칸, 해시) 목록
+#
+#   python asset_manifest.py [--rebuild] [이미지 경로 ...]
+#
+# 크기는 이미지 헤더만 읽어서 구하고, 스프라이트 칸은 Pillow로 알파 채널을 읽어
+# 완전히 투명한 세로/가로 줄(칸 사이 틈)이 일정한 간격으로 나오는지 보고 추론합니다 (detect_grid).
+# GRID_OVERRIDES는 틈이 없어서 추론이 안 되는 이미지(불투명한 타일셋 등)나 후보 간격이 여러 개인
+# 경우에만 쓰는 덮어쓰기 표입니다. Pillow가 없으면 추론 없이 GRID_OVERRIDES만 씁니다.
+# 내용 해시(구운 타일 청크의 캐시 키 등에 씀)는 파일 전체를 읽어서 만듭니다.
+# 결과는 MANIFEST_PATH에 저장해 두고, 다음 실행부터는 파일의 수정 시각/크기가 같으면
+# 헤더도 픽셀도 해시도 다시 읽지 않으므로 시작할 때 파일마다 stat 한 번이면 됩니다.
+#
+#     fw, fh, rows, cols, frames = asset_manifest.grid('assets/guard.png')
+
+import fnmatch
+import hashlib
+import json
+import os
+import struct
+import sys
+
+ASSET_ROOT = 'assets'
+# 실행하면서 만드는 파일(매니페스트, 구운 타일 청크 등)을 두는 폴더. 에셋 폴더와 따로 두고 git에는 올리지 않음
+CACHE_DIR = '.cache'
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'manifest.json')
+MANIFEST_VERSION = 2
+
+# 생성물 폴더는 훑지 않음
+SKIP_DIRS = ('atlas', 'map_chunks')
+
+# 칸 구성 덮어쓰기 표: 파일 이름 패턴 -> (칸 너비, 칸 높이, 행, 열, 프레임 수)
+# 추론 결과가 없거나(틈 없는 이미지), 이 칸 너비/높이가 추론한 후보 간격 중 하나일 때만 씁니다.
+# None인 값은 이미지 크기로 계산합니다 (행 = 높이 // 칸 높이, 프레임 수 = 행 * 열).
+# 칸이 이미지 밖으로 나가면(guard.png는 101px이라 마지막 칸이 16px) frame_rect()가 잘라 줍니다.
+GRID_OVERRIDES = {
+    'guard.png': (17, 18, 1, 6, 6),     # 17px 간격 6프레임 (마지막 칸은 16px)
+    'bat.png': (16, 16, 1, 8, 7),       # 8칸 중 마지막 칸은 비어 있음
+    'tiles_*.png': (16, 16, None, None, None),
+}
+
+# 추론할 때 볼 가장 작은 칸 크기(px)
+MIN_CELL = 8
+_entries = None     # 루트 기준 상대 경로('guard.png') -> 정보 dict
+
+
+# -----------------------------
+# 헤더 읽기
+# -----------------------------
+def _png_size(f):
+    head = f.read(24)
+    if head[:8] != b'\x89PNG\r\n\x1a\n' or head[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', head[16:24])
+
+
+def _gif_size(f):
+    head = f.read(10)
+    if head[:4] != b'GIF8':
+        return None
+    return struct.unpack('<HH', head[6:10])
+
+
+def _bmp_size(f):
+    head = f.read(26)
+    if head[:2] != b'BM':
+        return None
+    w, h = struct.unpack('<ii', head[18:26])
+    return w, abs(h)
+
+
+def _jpeg_size(f):
+    if f.read(2) != b'\xff\xd8':
+        return None
+    # SOF 마커가 나올 때까지 세그먼트 길이만큼 건너뜀 (픽셀 데이터는 읽지 않음)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xd8, 0x01) or 0xd0 <= marker <= 0xd7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            h, w = struct.unpack('>HH', data[1:5])
+            return w, h
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+_READERS = {
+    '.png': ('png', _png_size),
+    '.jpg': ('jpeg', _jpeg_size),
+    '.jpeg': ('jpeg', _jpeg_size),
+    '.gif': ('gif', _gif_size),
+    '.bmp': ('bmp', _bmp_size),
+}
+
+
+def read_image_size(path):
+    """이미지 헤더만 읽어서 (형식, w, h)를 돌려줍니다. 이미지가 아니거나 읽지 못하면 None."""
+    reader = _READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        return None
+    kind, read = reader
+    try:
+        with open(path, 'rb') as f:
+            size = read(f)
+    except OSError:
+        return None
+    if size is None:
+        return None
+    return kind, size[0], size[1]
+
+
+# -----------------------------
+# 칸 추론
+# -----------------------------
+def _empty_lines(data, stride, count):
+    """알파 바이트열에서 stride 길이 줄 count개가 각각 완전히 투명한지."""
+    return [not data[i * stride:(i + 1) * stride].strip(b'\x00') for i in range(count)]
+
+
+def _runs(empty):
+    """불투명한 줄이 이어지는 구간들 [(시작, 끝 + 1), ...]."""
+    runs, start = [], None
+    for i, e in enumerate(empty):
+        if not e and start is None:
+            start = i
+        elif e and start is not None:
+            runs.append((start, i))
+            start = None
+    if start is not None:
+        runs.append((start, len(empty)))
+    return runs
+
+
+def _periods(empty, size):
+    """이 축에서 칸 간격이 될 수 있는 값들 (그럴듯한 것부터).
+
+    불투명한 구간(스프라이트 하나)마다 중심이 서로 다른 칸에 순서대로 들어가고, 칸 밖으로
+    p // 4 넘게 삐져나오지 않는 간격 p가 후보입니다. 마지막 칸은 p보다 조금 좁아도 됩니다
+    (guard.png: 101 = 17 * 5 + 16). 후보는 칸 경계(k * p)가 투명한 줄에 닿는 비율이 높은 순으로 정렬합니다.
+    """
+    runs = _runs(empty)
+    if len(runs) < 2:
+        return []
+    scored = []
+    for p in range(MIN_CELL, size // 2 + 1):
+        n = -(-size // p)
+        if size - (n - 1) * p < p - max(1, p // 8):
+            continue
+        slack = p // 4
+        last = -1
+        for start, end in runs:
+            cell = (start + end - 1) // 2 // p
+            if cell <= last or start < cell * p - slack or end > (cell + 1) * p + slack:
+                break
+            last = cell
+        else:
+            hits = sum(1 for k in range(1, n) if empty[k * p] or empty[k * p - 1])
+            scored.append((-hits / (n - 1), p))
+    return [p for _, p in sorted(scored)]
+
+
+def detect_grid(path):
+    """알파 채널의 투명한 틈으로 칸 구성을 추론합니다.
+
+    (grid, (가로 후보 간격들, 세로 후보 간격들))을 돌려주고, 어느 축에서도 간격을
+    찾지 못했거나 Pillow가 없거나 알파 채널이 없으면 (None, ([], [])).
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None, ([], [])
+    try:
+        with Image.open(path) as im:
+            if 'A' not in im.getbands() and 'transparency' not in im.info:
+                return None, ([], [])
+            alpha = im.convert('RGBA').getchannel('A')
+    except OSError:
+        return None, ([], [])
+    w, h = alpha.size
+    rows_data = alpha.tobytes()
+    cols_data = alpha.transpose(Image.Transpose.TRANSPOSE).tobytes()
+    px = _periods(_empty_lines(cols_data, h, w), w)
+    py = _periods(_empty_lines(rows_data, w, h), h)
+    if not px and not py:
+        return None, (px, py)
+
+    fw = px[0] if px else w
+    fh = py[0] if py else h
+    cols = -(-w // fw)
+    rows = -(-h // fh)
+    # 프레임 수 = 마지막으로 픽셀이 있는 칸까지 (뒤쪽 빈 칸은 세지 않음)
+    frames = 0
+    for index in range(rows * cols):
+        left, top = (index % cols) * fw, (index // cols) * fh
+        if alpha.crop((left, top, min(w, left + fw), min(h, top + fh))).getbbox():
+            frames = index + 1
+    if frames <= 1:
+        return None, (px, py)
+    # 아래쪽 빈 행은 칸 구성에서 뺌 (rat.png처럼 위쪽 행만 쓰는 시트)
+    rows = -(-frames // cols)
+    return (fw, fh, rows, cols, frames), (px, py)
+
+
+def infer_grid(name, w, h, detected=None, periods=None):
+    """(칸 너비, 칸 높이, 행, 열, 프레임 수)를 정합니다.
+
+    detected/periods는 detect_grid()의 결과입니다. 추론 결과가 있으면 그것을 쓰고,
+    GRID_OVERRIDES는 추론 결과가 없을 때나, 덮어쓰기 칸 크기가 추론한 후보 간격에도
+    들어 있을 때(여러 후보 중 하나를 고를 때)만 씁니다. 둘 다 없으면 이미지 전체가 한 프레임입니다.
+    """
+    base = os.path.basename(name)
+    px, py = periods or ([], [])
+    for pattern, override in GRID_OVERRIDES.items():
+        if not fnmatch.fnmatch(base, pattern):
+            continue
+        fw, fh, rows, cols, frames = override
+        if detected is not None and not ((fw == w or fw in px) and (fh == h or fh in py)):
+            # 추론한 간격과 맞지 않는 덮어쓰기는 쓰지 않음
+            break
+        rows = rows if rows is not None else max(1, h // fh)
+        cols = cols if cols is not None else max(1, w // fw)
+        frames = frames if frames is not None else rows * cols
+        return fw, fh, rows, cols, frames
+    if detected is not None:
+        return tuple(detected)
+    return w, h, 1, 1, 1
+
+
+def frame_rect(grid, index, image_w=None, image_h=None):
+    """index번 칸의 (left, bottom, w, h) (clip_draw처럼 왼쪽 아래 기준).
+
+    image_w/image_h를 주면 이미지 밖으로 나가는 칸(마지막 칸이 좁은 시트)은 이미지 안쪽까지만 돌려줍니다.
+    """
+    fw, fh, rows, cols = grid[:4]
+    col = index % cols
+    row = index // cols
+    left, bottom, w, h = col * fw, (rows - 1 - row) * fh, fw, fh
+    if image_w is not None:
+        w = max(0, min(w, image_w - left))
+    if image_h is not None:
+        h = max(0, min(h, image_h - bottom))
+    return left, bottom, w, h
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def _describe(path, rel, st):
+    size = read_image_size(path)
+    if size is None:
+        return None
+    kind, w, h = size
+    detected, periods = detect_grid(path)
+    return {
+        'format': kind,
+        'w': w,
+        'h': h,
+        'detected': list(detected) if detected else None,
+        'periods': [list(p) for p in periods],
+        'grid': list(infer_grid(rel, w, h, detected, periods)),
+        'hash': _file_hash(path),
+        'mtime': st.st_mtime,
+        'bytes': st.st_size,
+    }
+
+
+# -----------------------------
+# 스캔 / 캐시
+# -----------------------------
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == MANIFEST_VERSION:
+            return data['images']
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def scan(root=None, cache_path=None, rebuild=False, save=True):
+    """root 아래 이미지들의 정보를 모읍니다. 수정 시각/크기가 캐시와 같은 파일은 다시 읽지 않습니다."""
+    global _entries
+    root = root or ASSET_ROOT
+    cache_path = cache_path or MANIFEST_PATH
+    cached = {} if rebuild else _load_cache(cache_path)
+
+    entries = {}
+    changed = False
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = sorted(d for d in dir_names if d not in SKIP_DIRS)
+        for file_name in sorted(file_names):
+            if os.path.splitext(file_name)[1].lower() not in _READERS:
+                continue
+            path = os.path.join(dir_path, file_name)
+            rel = os.path.relpath(path, root).replace(os.sep, '/')
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            info = cached.get(rel)
+            if info is None or info['mtime'] != st.st_mtime or info['bytes'] != st.st_size:
+                info = _describe(path, rel, st)
+                changed = True
+                if info is None:
+                    continue
+            else:
+                # GRID_OVERRIDES가 바뀐 경우 (픽셀은 다시 읽지 않고 저장해 둔 추론 결과로 다시 정함)
+                g = infer_grid(rel, info['w'], info['h'], info['detected'], info['periods'])
+                if tuple(info['grid']) != g:
+                    info = dict(info, grid=list(g))
+                    changed = True
+            entries[rel] = info
+
+    if set(entries) != set(cached):
+        changed = True
+    if save and changed:
+        try:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'images': entries}, f,
+                          ensure_ascii=False, indent=1, sort_keys=True)
+        except OSError as e:
+            print(f"[manifest] {cache_path} 저장 실패: {e}")
+
+    if root == ASSET_ROOT:
+        _entries = entries
+    return entries
+
+
+def _key(path):
+    path = os.path.normpath(path).replace(os.sep, '/')
+    prefix = ASSET_ROOT.rstrip('/') + '/'
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+
+def get(path):
+    """이미지 정보 dict (format, w, h, detected, periods, grid, hash, mtime, bytes). 없으면 None."""
+    if _entries is None:
+        scan()
+    return _entries.get(_key(path))
+
+
+def image_size(path):
+    info = get(path)
+    return (info['w'], info['h']) if info else None
+
+
+def grid(path):
+    """(칸 너비, 칸 높이, 행, 열, 프레임 수). 매니페스트에 없으면 None."""
+    info = get(path)
+    return tuple(info['grid']) if info else None
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    rebuild = '--rebuild' in args
+    paths = [a for a in args if not a.startswith('--')]
+
+    # 에셋 경로가 상대 경로이므로 이 파일 위치에서 실행
+    paths = [os.path.relpath(os.path.abspath(p), os.path.dirname(os.path.abspath(__file__))) for p in paths]
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    entries = scan(rebuild=rebuild)
+
+    names = [_key(p) for p in paths] or sorted(entries)
+    for name in names:
+        info = entries.get(name)
+        if info is None:
+            print(f"{name}: 이미지가 아니거나 없음")
+            continue
+        fw, fh, rows, cols, frames = info['grid']
+        print(f"{name}: {info['w']}x{info['h']} {info['format']}  "
+              f"frame {fw}x{fh} x {frames} ({rows}x{cols})  {info['hash']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# atlas.py
+# atlas_builder.py가 만든 텍스처 아틀라스를 읽어서 프레임 이름으로 그리기
+#
+# 아틀라스가 없거나(빌드 안 함) 원본 파일이 빌드 이후 바뀌었으면(asset_manifest 내용 해시로 비교)
+# 해당 프레임은 없는 것으로 보고,
+# 호출하는 쪽(SpriteSheet, Ratking)은 원래 이미지로 그립니다.
+
+import json
+import os
+
+from pico2d import *
+import asset_manifest
+import resources
+
+ATLAS_PATH = 'assets/atlas/atlas.json'
+
+available = False
+_loaded = False
+_sheets = []        # 시트 이미지 (resources 참조를 잡고 있음)
+_frames = {}        # 프레임 이름 -> (시트 이미지, left, bottom, w, h)
+_sources = {}       # 원본 이름 -> 빌드 당시 정보 (grid 등)
+
+
+def load(path=None):
+    """아틀라스 인덱스와 시트 이미지를 읽습니다. 실패하면 available = False로 둡니다."""
+    global available, _loaded
+    unload()
+    _loaded = True
+
+    path = path or ATLAS_PATH
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        base = os.path.dirname(path)
+        for s in data['sheets']:
+            _sheets.append(resources.image(os.path.join(base, s['file'])))
+    except Exception as e:
+        print(f"[atlas] {path} 로드 실패: {e}")
+        unload()
+        _loaded = True
+        return False
+
+    # 빌드 이후 바뀐 원본은 아틀라스 프레임을 쓰지 않음 (빌드 당시 내용 해시와 비교).
+    # 매니페스트는 수정 시각/크기가 같으면 캐시된 해시를 쓰므로 파일을 다시 읽지 않음
+    src_dir = os.path.dirname(base)
+    manifest = asset_manifest.scan(src_dir, os.path.join(os.path.dirname(src_dir), asset_manifest.MANIFEST_PATH))
+    stale = set()
+    for name, info in data['sources'].items():
+        entry = manifest.get(info['file'])
+        if entry is None or entry['hash'] != info.get('hash'):
+            stale.add(name)
+        else:
+            _sources[name] = info
+    if stale:
+        print(f"[atlas] 빌드 이후 바뀐 이미지 {len(stale)}개는 원본으로 그립니다: {', '.join(sorted(stale))}")
+
+    for name, (s, x, y, w, h) in data['frames'].items():
+        if name.split('@')[0].split('/')[0] in _sources:
+            _frames[name] = (_sheets[s], x, y, w, h)
+    available = True
+    return True
+
+
+def unload():
+    """시트 이미지 참조를 돌려주고 프레임 목록을 비웁니다. 다음 frame()/sheet_frames()에서 다시 읽습니다."""
+    global available, _loaded
+    for sheet in _sheets:
+        resources.release(sheet)
+    _sheets.clear()
+    _frames.clear()
+    _sources.clear()
+    available = False
+    _loaded = False
+
+
+def sheet_paths(path=None):
+    """아틀라스 시트 이미지 경로 목록 (이미지는 로드하지 않음). 아틀라스가 없으면 빈 목록."""
+    path = path or ATLAS_PATH
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    base = os.path.dirname(path)
+    return [os.path.join(base, s['file']) for s in data.get('sheets', ())]
+
+
+def _ensure_loaded():
+    if not _loaded:
+        load()
+
+
+def frame(name):
+    """프레임 이름의 (시트 이미지, left, bottom, w, h). 없으면 None."""
+    _ensure_loaded()
+    return _frames.get(name)
+
+
+def sheet_frames(source, grid, mirrored=False):
+    """스프라이트 시트 source의 모든 칸을 번호 순서대로 돌려줍니다.
+
+    grid (칸 너비, 칸 높이, 행 수, 열 수)가 빌드할 때와 다르면 프레임 번호가 다른 칸을 가리키므로 None.
+    (둘 다 asset_manifest의 칸 구성을 쓰므로 보통은 같습니다.)
+    mirrored=True면 좌우 반전 프레임 목록 (빌드하지 않았으면 None).
+    """
+    _ensure_loaded()
+    info = _sources.get(source)
+    if info is None or info['grid'] is None or tuple(info['grid']) != tuple(grid):
+        return None
+    suffix = '@h' if mirrored else ''
+    frames = []
+    for i in range(info.get('frames', grid[2] * grid[3])):
+        f = _frames.get(f'{source}/{i}{suffix}')
+        if f is None:
+            return None
+        frames.append(f)
+    return frames
+
+
+def draw(name, x, y, w=None, h=None):
+    """프레임을 clip_draw로 그립니다. 아틀라스에 없으면 False."""
+    f = frame(name)
+    if f is None:
+        return False
+    image, left, bottom, fw, fh = f
+    image.clip_draw(left, bottom, fw, fh, x, y,
+                    w if w is not None else fw, h if h is not None else fh)
+    return True
@@ -0,0 +1,231 @@
+# atlas_builder.py
+# assets 폴더의 PNG들을 큰 시트 몇 장으로 묶는 오프라인 아틀라스 패커 (Pillow 필요)
+#
+#   python atlas_builder.py [--src assets] [--out assets/atlas] [--size 2048] [--padding 1]
+#                           [--max-frame 512] [--mirror-all]
+#   python atlas_builder.py --split-map assets/map.jpg [--chunk 1024]
+#
+# 결과물: <out>/atlas_0.png, atlas_1.png, ... 와 이름 -> 사각형 인덱스 atlas.json (생성물이라 git에는 올리지 않음)
+# - SPRITE_SHEETS의 스프라이트 시트는 asset_manifest의 칸 구성대로 'guard/0', 'guard/1', ... 프레임으로 자르고,
+#   좌우 반전 프레임('guard/0@h')도 미리 구워 둡니다 (clip_composite_draw 대신 clip_draw로 그리기 위해).
+# - 나머지 이미지는 파일 하나가 프레임 하나 ('status_pane')입니다.
+# - 사각형 좌표는 pico2d clip_draw와 같은 왼쪽 아래 기준입니다.
+# 런타임 쪽은 atlas.py를 보세요. 에셋을 바꾸면 다시 실행해야 합니다 (바뀐 파일은 atlas.py가 무시).
+#
+# --split-map은 텍스처 한 장에 담기 어려운 큰 배경 이미지를 chunk x chunk 조각으로 나눕니다.
+# 결과물: <이미지 폴더>/map_chunks/chunk_<열>_<행>.<확장자>와 chunks.json (play_mode.Background가 읽음, git에는 올리지 않음)
+
+import argparse
+import json
+import os
+import sys
+
+import asset_manifest
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ATLAS_VERSION = 2
+INDEX_NAME = 'atlas.json'
+
+# 칸으로 잘라서 반전 프레임까지 굽는 캐릭터 시트 (칸 구성은 게임 코드와 같은 asset_manifest 값)
+SPRITE_SHEETS = ('guard', 'ratking', 'bat')
+
+
+def cell_rect(grid, index, image_w=None, image_h=None):
+    """SpriteSheet.draw_frame과 같은 방식으로 index번 칸의 (left, bottom, w, h)를 계산합니다.
+    이미지 크기를 주면 이미지 밖으로 나가는 마지막 칸은 이미지 안쪽까지만 자릅니다."""
+    return asset_manifest.frame_rect(grid, index, image_w, image_h)
+
+
+def _crop(image, left, bottom, w, h):
+    # pico2d(왼쪽 아래 기준) 사각형을 PIL(왼쪽 위 기준) 박스로 바꿔 자름.
+    # 이미지 밖으로 나간 부분은 투명으로 채워져서 SDL이 잘라 그리던 결과와 같아짐
+    top = image.height - bottom - h
+    return image.crop((left, top, left + w, top + h))
+
+
+def collect(src, max_frame, mirror_all):
+    """src 폴더의 PNG를 읽어 (프레임 이름, PIL 이미지) 목록과 원본 정보를 돌려줍니다."""
+    frames = []
+    sources = {}
+    # 매니페스트 캐시는 src 폴더 안이 아니라 그 옆의 캐시 폴더에 둠 (기본 src면 게임과 같은 파일)
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(src)), asset_manifest.MANIFEST_PATH)
+    manifest = asset_manifest.scan(src, cache_path)
+    for file_name in sorted(os.listdir(src)):
+        path = os.path.join(src, file_name)
+        stem, ext = os.path.splitext(file_name)
+        if ext.lower() != '.png' or not os.path.isfile(path):
+            continue
+        try:
+            image = Image.open(path).convert('RGBA')
+        except Exception as e:
+            print(f"[atlas] {file_name} 건너뜀: {e}")
+            continue
+        if image.width > max_frame or image.height > max_frame:
+            # 큰 이미지(맵, 폰트 시트 등)는 따로 두는 편이 시트 공간을 덜 낭비함
+            print(f"[atlas] {file_name} 건너뜀: {image.width}x{image.height} > {max_frame}")
+            continue
+
+        grid = None
+        if stem in SPRITE_SHEETS and file_name in manifest:
+            grid = tuple(manifest[file_name]['grid'])
+            cells = [(f'{stem}/{i}', _crop(image, *cell_rect(grid, i, image.width, image.height)))
+                     for i in range(grid[4])]
+        else:
+            cells = [(stem, image)]
+        mirrored = grid is not None or mirror_all
+        for name, cell in cells:
+            frames.append((name, cell))
+            if mirrored:
+                frames.append((name + '@h', cell.transpose(Image.FLIP_LEFT_RIGHT)))
+
+        sources[stem] = {
+            'file': file_name,
+            'hash': manifest[file_name]['hash'] if file_name in manifest else None,
+            'size': [image.width, image.height],
+            'grid': list(grid[:4]) if grid is not None else None,
+            'frames': grid[4] if grid is not None else 1,
+            'mirrored': mirrored,
+        }
+    return frames, sources
+
+
+def pack(sizes, sheet_size, padding):
+    """선반(shelf) 방식으로 (w, h) 목록을 시트들에 배치합니다.
+
+    높이가 큰 것부터 한 줄(선반)씩 왼쪽에서 오른쪽으로 채우고, 줄이 차면 위로 새 줄을 엽니다.
+    돌려주는 값은 입력 순서대로 (시트 번호, 왼쪽, 위) (시트 왼쪽 위 기준 픽셀 좌표)입니다.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    sheet = 0
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i][0] + padding, sizes[i][1] + padding
+        if x + w > sheet_size:
+            # 다음 선반
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        if y + h > sheet_size:
+            # 다음 시트
+            sheet += 1
+            x = y = shelf_h = 0
+        placements[i] = (sheet, x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return placements
+
+
+def build(src='assets', out=None, sheet_size=2048, padding=1, max_frame=512, mirror_all=False):
+    """아틀라스를 만들고 인덱스(dict)를 돌려줍니다."""
+    out = out or os.path.join(src, 'atlas')
+    frames, sources = collect(src, min(max_frame, sheet_size - padding), mirror_all)
+    if not frames:
+        print("[atlas] 묶을 이미지가 없습니다.")
+        return None
+
+    placements = pack([cell.size for _, cell in frames], sheet_size, padding)
+    sheet_count = max(p[0] for p in placements) + 1
+
+    # 마지막 시트는 실제로 쓴 높이만큼만 만들어서 텍스처 메모리를 아낌
+    heights = [0] * sheet_count
+    for (_, cell), (s, x, y) in zip(frames, placements):
+        heights[s] = max(heights[s], y + cell.height)
+    sheets = [Image.new('RGBA', (sheet_size, heights[s]), (0, 0, 0, 0)) for s in range(sheet_count)]
+
+    index = {}
+    for (name, cell), (s, x, y) in zip(frames, placements):
+        sheets[s].paste(cell, (x, y))
+        # pico2d clip_draw 좌표(왼쪽 아래 기준)로 저장
+        index[name] = [s, x, heights[s] - y - cell.height, cell.width, cell.height]
+
+    os.makedirs(out, exist_ok=True)
+    sheet_info = []
+    for s, sheet in enumerate(sheets):
+        file_name = f'atlas_{s}.png'
+        sheet.save(os.path.join(out, file_name), optimize=True)
+        sheet_info.append({'file': file_name, 'w': sheet.width, 'h': sheet.height})
+
+    data = {
+        'version': ATLAS_VERSION,
+        'padding': padding,
+        'sheets': sheet_info,
+        'sources': sources,
+        'frames': index,
+    }
+    with open(os.path.join(out, INDEX_NAME), 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+    used = sum(cell.width * cell.height for _, cell in frames)
+    total = sum(sheet.width * sheet.height for sheet in sheets)
+    print(f"[atlas] {len(sources)} images, {len(frames)} frames -> {sheet_count} sheet(s) in {out} "
+          f"(fill {used / total * 100:.1f}%)")
+    return data
+
+
+def split_map(path, out=None, chunk=1024):
+    """배경 이미지를 chunk 크기 조각으로 나누고 인덱스(dict)를 돌려줍니다.
+
+    조각 좌표(x, y)는 원본 이미지에서 왼쪽 아래 기준 픽셀입니다 (clip_draw와 같음).
+    """
+    out = out or os.path.join(os.path.dirname(path), 'map_chunks')
+    image = Image.open(path)
+    ext = os.path.splitext(path)[1].lower()
+    os.makedirs(out, exist_ok=True)
+
+    chunks = []
+    for row, bottom in enumerate(range(0, image.height, chunk)):
+        for col, left in enumerate(range(0, image.width, chunk)):
+            w = min(chunk, image.width - left)
+            h = min(chunk, image.height - bottom)
+            file_name = f'chunk_{col}_{row}{ext}'
+            piece = _crop(image, left, bottom, w, h)
+            if ext in ('.jpg', '.jpeg'):
+                piece.convert('RGB').save(os.path.join(out, file_name), quality=95)
+            else:
+                piece.save(os.path.join(out, file_name))
+            chunks.append({'file': file_name, 'x': left, 'y': bottom, 'w': w, 'h': h})
+
+    src = os.path.dirname(os.path.abspath(path))
+    info = asset_manifest.scan(src, os.path.join(os.path.dirname(src), asset_manifest.MANIFEST_PATH)).get(os.path.basename(path))
+    data = {
+        'source': os.path.basename(path),
+        'hash': info['hash'] if info else None,
+        'size': [image.width, image.height],
+        'chunk': chunk,
+        'chunks': chunks,
+    }
+    with open(os.path.join(out, 'chunks.json'), 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    print(f"[atlas] {path} {image.width}x{image.height} -> {len(chunks)} chunk(s) in {out}")
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='assets 텍스처 아틀라스 빌더')
+    parser.add_argument('--src', default=None, help='기본값: 이 파일 옆의 assets')
+    parser.add_argument('--out', default=None, help='기본값: <src>/atlas')
+    parser.add_argument('--size', type=int, default=2048, help='시트 한 변 크기 (픽셀)')
+    parser.add_argument('--padding', type=int, default=1)
+    parser.add_argument('--max-frame', type=int, default=512, help='이보다 큰 이미지는 묶지 않음')
+    parser.add_argument('--mirror-all', action='store_true', help='모든 이미지의 좌우 반전 프레임도 만듦')
+    parser.add_argument('--split-map', metavar='IMAGE', help='아틀라스 대신 큰 배경 이미지를 조각으로 나눔')
+    parser.add_argument('--chunk', type=int, default=1024, help='--split-map 조각 한 변 크기 (픽셀)')
+    args = parser.parse_args(argv)
+
+    if Image is None:
+        print("atlas_builder.py는 Pillow가 필요합니다: pip install pillow")
+        return 1
+    if args.split_map:
+        return 0 if split_map(args.split_map, args.out, args.chunk) else 1
+    src = args.src or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+    data = build(src, args.out, args.size, args.padding, args.max_frame, args.mirror_all)
+    return 0 if data else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,14 +2,18 @@ from pico2d import *
 import math
 import game_framework
 import game_world
-import play_mode
+import resources
 
 PIXEL_PER_METER = 1.0 / 0.03
 GRAVITY = 9.8
 
 
 class Ball:
+    collision_groups = ('ball',)
+    swept_collision = True  # 약 1000px/s로 움직이므로 연속 충돌 검사
+    pooled = True           # game_world.spawn()으로 만들고 제거되면 풀에서 재사용
     image = None
+    IMAGE_CANDIDATES = ('assets/ball.png', 'assets/ball.jpg', 'assets/ball.jpeg')
     BASE_DRAW_SIZE = 21
     BASE_BB_RADIUS = 10
 
@@ -18,28 +22,39 @@ class Ball:
         return (self.x - scaled_radius, self.y - scaled_radius,
                 self.x + scaled_radius, self.y + scaled_radius)
 
+    @classmethod
+    def prepare_image(cls):
+        """이미지가 아직 없으면 한 번만 로드합니다 (png/jpg/jpeg 순서대로 시도)."""
+        if cls.image is not None:
+            return cls.image
+        last_error = None
+        for path in cls.IMAGE_CANDIDATES:
+            try:
+                cls.image = resources.image(path)
+                print(f"[Ball] 이미지 로드 성공: {path}")
+                last_error = None
+                break
+            except Exception as e:
+                print(f"[Ball] 이미지 로드 실패: {path} -> {e}")
+                last_error = e
+        if cls.image is None:
+            print(f"[Ball] 사용 가능한 ball 이미지를 찾지 못했습니다. 마지막 에러: {last_error}")
+        return cls.image
+
+    @classmethod
+    def release_image(cls):
+        resources.release(cls.image)
+        cls.image = None
+
     def __init__(self, x=400, y=300, throwin_speed=30, throwin_angle=0):
-        # 이미지가 아직 없으면 한 번만 로드 (png/jpg/jpeg 순서대로 시도)
-        if Ball.image is None:
-            candidates = [
-                'assets/ball.png',
-                'assets/ball.jpg',
-                'assets/ball.jpeg',
-            ]
-            last_error = None
-            for path in candidates:
-                try:
-                    Ball.image = load_image(path)
-                    print(f"[Ball] 이미지 로드 성공: {path}")
-                    last_error = None
-                    break
-                except Exception as e:
-                    print(f"[Ball] 이미지 로드 실패: {path} -> {e}")
-                    last_error = e
-            if Ball.image is None:
-                print(f"[Ball] 사용 가능한 ball 이미지를 찾지 못했습니다. 마지막 에러: {last_error}")
+        Ball.prepare_image()
+        self.reset(x, y, throwin_speed, throwin_angle)
 
+    def reset(self, x=400, y=300, throwin_speed=30, throwin_angle=0):
+        """풀에서 꺼내 재사용할 때 상태를 처음 만든 것처럼 되돌립니다."""
         self.x, self.y = x, y
+        # 직전 틱 위치 (그릴 때 game_framework.alpha로 보간)
+        self.prev_x, self.prev_y = x, y
         self.scale = 0.5
 
         self.xv = throwin_speed * math.cos(math.radians(throwin_angle))
@@ -48,15 +63,27 @@ class Ball:
         self.stopped = (throwin_speed == 0.0)
 
     def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
         if self.stopped:
             return
 
         # 수평 이동
+        prev_x = self.x
         self.x += self.xv * game_framework.frame_time * PIXEL_PER_METER
 
-        # 화면 밖 제거
-        if (self.x < -100 or self.x > play_mode.MAP_WIDTH + 100 or
-                self.y < -100 or self.y > play_mode.MAP_HEIGHT + 100):
+        # 벽에 맞으면 제거 (이동 경로 전체를 광선으로 검사하므로 빨라도 벽을 뚫지 않음)
+        cmap = game_world.collision_map
+        if cmap is not None and cmap.raycast(prev_x, self.y, self.x, self.y) is not None:
+            game_world.remove_object(self)
+            return
+
+        # 맵 밖 제거
+        bounds = game_world.world_bounds
+        if bounds is None:
+            return
+        left, bottom, right, top = bounds
+        if (self.x < left - 100 or self.x > right + 100 or
+                self.y < bottom - 100 or self.y > top + 100):
             game_world.remove_object(self)
 
     def draw(self):
@@ -64,11 +91,7 @@ class Ball:
         if Ball.image is None:
             return
 
-        window_left = getattr(play_mode.bg, "window_left", 0)
-        window_bottom = getattr(play_mode.bg, "window_bottom", 0)
-
-        sx = self.x - window_left
-        sy = self.y - window_bottom
+        sx, sy = game_world.render_position(self)
 
         dw = int(self.BASE_DRAW_SIZE * self.scale)
         dh = int(self.BASE_DRAW_SIZE * self.scale)
@@ -1,7 +1,9 @@
 from pico2d import *
 import game_framework
-from spritesheet import SpriteSheet
+from guard import SpriteSheet
 import game_world
+import text_cache
+import pathfinding
 
 # 단순한 Bat 적 클래스
 
@@ -23,15 +25,24 @@ STOP_DISTANCE = 20
 
 
 class Bat:
-    def __init__(self):
-        # 위치: 화면 상단 중앙 부근으로 배치해서 스케치 화면처럼 등장하게 함
-        try:
-            cw = get_canvas_width()
-            ch = get_canvas_height()
-        except Exception:
-            cw, ch = 576, 1024
-        self.x = cw // 2
-        self.y = ch - 100
+    collision_groups = ('bat', 'enemy')
+
+    # 폴백 그리기용 폰트 (모든 Bat이 공유, 처음 한 번만 로드 시도)
+    font = None
+    font_tried = False
+
+    def __init__(self, x=None, y=None):
+        # 위치(월드 좌표): 따로 주지 않으면 월드 상단 중앙 부근으로 배치해서 스케치 화면처럼 등장하게 함
+        # (이동은 collision_map/pathfinding의 월드 격자 위에서 하므로 화면 크기가 아니라 월드 크기 기준)
+        if game_world.world_bounds is not None:
+            left, bottom, right, top = game_world.world_bounds
+        else:
+            try:
+                left, bottom, right, top = 0, 0, get_canvas_width(), get_canvas_height()
+            except Exception:
+                left, bottom, right, top = 0, 0, 576, 1024
+        self.x = x if x is not None else (left + right) // 2
+        self.y = y if y is not None else top - 100
 
         self.frame = 0.0
         self.dir = -1
@@ -41,22 +52,16 @@ class Bat:
         self.sheet_cols = 1
         self.sheet_rows = 1
 
-        # 스프라이트 시트 로드 시도
+        # 스프라이트 시트 로드 시도 (칸 구성은 asset_manifest에서 가져옴: 16x16, 7프레임)
         try:
-            self.sheet = SpriteSheet('assets/bat.png', CLIP_W, CLIP_H)
+            self.sheet = SpriteSheet('assets/bat.png')
             self.sheet_cols = self.sheet.cols
             self.sheet_rows = self.sheet.rows
-            FRAMES = self.sheet_cols * self.sheet_rows
+            FRAMES = self.sheet.frames
         except Exception:
-            try:
-                self.sheet = SpriteSheet('bat.png', CLIP_W, CLIP_H)
-                self.sheet_cols = self.sheet.cols
-                self.sheet_rows = self.sheet.rows
-                FRAMES = self.sheet_cols * self.sheet_rows
-            except Exception:
-                # 스프라이트 시트가 없으면 None으로 두고 폴백 그리기 사용
-                self.sheet = None
-                FRAMES = 1
+            # 스프라이트 시트가 없으면 None으로 두고 폴백 그리기 사용
+            self.sheet = None
+            FRAMES = 1
 
         # FRAMES_PER_ACTION를 실제 프레임 수로 설정(더 자연스럽게)
         try:
@@ -104,43 +109,33 @@ class Bat:
             if player_cum is not None:
                 delta = int(player_cum - self.last_target_cumulative)
                 if delta > 0:
-                    # delta 픽만큼 아래로 이동하되, 맵의 솔리드(벽) 픽과 충돌하면 멈춤
-                    move_down = 0
-                    for i in range(delta):
-                        next_y = self.y - 1
-                        # check collision against map if available
-                        blocked = False
-                        try:
-                            if getattr(self, 'map', None) is not None and self.map.is_solid_at(self.x, next_y):
-                                blocked = True
-                        except Exception:
-                            blocked = False
-                        if blocked:
-                            break
-                        self.y = next_y
-                        move_down += 1
-                    self.last_target_cumulative += move_down
+                    # delta 픽셀만큼 아래로 이동하되, 벽이 있으면 벽 바로 위에서 멈춤
+                    move_y = -delta
+                    cmap = game_world.collision_map
+                    if cmap is not None:
+                        _, move_y = cmap.sweep(self.get_bb(), 0, move_y)
+                    self.y += move_y
+                    self.last_target_cumulative += int(-move_y)
         except Exception:
             pass
 
         # 2) 수평 보정: 플레이어 X에 빠르게 접근 (수평 추적)
         try:
             dx = self.target.x - self.x
+            # 벽을 돌아가야 하면 흐름장이 알려주는 다음 칸 쪽으로
+            waypoint = pathfinding.next_waypoint(self.x, self.y)
+            if waypoint is not None:
+                dx = waypoint[0] - self.x
             # tiny threshold
             if abs(dx) > 0.5:
                 step = self.horz_speed * game_framework.frame_time
                 move_x = max(-step, min(step, dx))
-                # attempted new x
-                new_x = self.x + move_x
-                blocked = False
-                try:
-                    if getattr(self, 'map', None) is not None and self.map.is_solid_at(new_x, self.y):
-                        blocked = True
-                except Exception:
-                    blocked = False
-                if not blocked:
-                    self.x = new_x
-                    self.dir = 1 if dx > 0 else -1
+                # 벽이 있으면 벽 바로 앞까지만 이동
+                cmap = game_world.collision_map
+                if cmap is not None:
+                    move_x, _ = cmap.sweep(self.get_bb(), move_x, 0)
+                self.x += move_x
+                self.dir = 1 if dx > 0 else -1
         except Exception:
             pass
 
@@ -154,7 +149,6 @@ class Bat:
                     print("DEBUG: Bat collided with Boy - triggering game over")
                     # 안전하게 제거: game_world.remove_object(boy) 등
                     try:
-                        import game_world
                         game_world.remove_object(self.target)
                     except Exception:
                         pass
@@ -165,39 +159,47 @@ class Bat:
         except Exception:
             pass
 
+    def _screen_bb(self):
+        x1, y1, x2, y2 = self.get_bb()
+        sx1, sy1 = game_world.to_screen(x1, y1)
+        sx2, sy2 = game_world.to_screen(x2, y2)
+        return sx1, sy1, sx2, sy2
+
     def draw(self):
+        # 월드 좌표 -> 화면 좌표
+        sx, sy = game_world.to_screen(self.x, self.y)
+
         # 스프라이트가 있으면 현재 프레임을 그림
         if self.sheet:
             try:
                 idx = int(self.frame) % max(1, self.frames_count)
                 flip = (self.dir < 0)
-                self.sheet.draw_frame(idx, self.x, self.y, TARGET_W, TARGET_H, flip=flip)
+                self.sheet.draw_frame(idx, sx, sy, TARGET_W, TARGET_H, flip=flip)
             except Exception:
                 # 실패 시 폴백 그리기
-                self._draw_fallback()
+                self._draw_fallback(sx, sy)
         else:
-            self._draw_fallback()
+            self._draw_fallback(sx, sy)
 
         # 디버그용 바운딩 박스
         try:
-            draw_rectangle(*self.get_bb())
+            draw_rectangle(*self._screen_bb())
         except Exception:
             pass
 
-    def _draw_fallback(self):
+    def _draw_fallback(self, sx, sy):
         # 스프라이트 파일이 없을 때 간단히 사각형과 텍스트로 표시
         try:
-            x1, y1, x2, y2 = self.get_bb()
-            draw_rectangle(x1, y1, x2, y2)
-            try:
-                f = load_font('assets/ENCR10B.TTF', 12)
-            except Exception:
+            draw_rectangle(*self._screen_bb())
+            if not Bat.font_tried:
+                Bat.font_tried = True
                 try:
-                    f = load_font('ENCR10B.TTF', 12)
+                    Bat.font = text_cache.font('ENCR10B.TTF', 12)
                 except Exception:
-                    f = None
+                    Bat.font = None
+            f = Bat.font
             if f:
-                f.draw(self.x - 10, self.y - TARGET_H // 2 - 12, 'BAT', (255, 0, 0))
+                f.draw(sx - 10, sy - TARGET_H // 2 - 12, 'BAT', (255, 0, 0))
         except Exception:
             pass
 
@@ -0,0 +1,397 @@
+# bench.py
+# 엔진 핫패스 마이크로 벤치마크 (창 없이 headless pico2d로 실행)
+#
+#   python bench.py run [--sizes 10,100,1000,10000] [--cases world_update,ball_update]
+#                       [--repeat 7] [--out bench_baseline.json]
+#   python bench.py compare 이전.json 새.json [--threshold 0.10]
+#
+# run은 케이스 x 엔티티 수마다 여러 라운드를 돌려 중앙값을 JSON으로 저장하고,
+# compare는 두 JSON을 비교해서 threshold(기본 10%)보다 느려진 항목이 있으면 종료 코드 1을 돌려줍니다.
+# 라운드 시간은 잡음에 약하므로 같은 기계에서 만든 결과끼리만 비교하세요.
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+# 게임 모듈보다 먼저 가짜 pico2d를 설치해야 함
+import headless
+headless.install()
+
+from pico2d import *
+import game_framework
+import game_world
+from state_machine import StateMachine
+from guard import Guard
+from ball import Ball
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_REPEAT = 7
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_OUT = 'bench_baseline.json'
+
+# 한 라운드가 최소 이 정도 시간(초)이 되도록 반복 횟수를 늘림 (타이머 해상도 보정)
+MIN_ROUND_TIME = 0.02
+# 이동하는 케이스는 반복이 너무 길면 엔티티가 목표에 도달/맵 밖으로 나가서 경로가 바뀜
+MAX_LOOPS = 1000
+
+DT = 1.0 / 60.0
+SEED = 2024
+
+
+# -----------------------------
+# 벤치마크용 더미 객체
+# -----------------------------
+class Box:
+    """AABB만 가진 빈 객체 (충돌/제거 케이스용)."""
+
+    def __init__(self, x, y, half=16, groups=()):
+        self.x, self.y = x, y
+        self.half = half
+        self.collision_groups = groups
+
+    def get_bb(self):
+        h = self.half
+        return self.x - h, self.y - h, self.x + h, self.y + h
+
+    def update(self):
+        pass
+
+    def draw(self):
+        pass
+
+    def handle_collision(self, group, other):
+        pass
+
+
+class Target:
+    """Guard가 쫓아가는 고정 목표."""
+
+    def __init__(self, x=0.0, y=0.0):
+        self.x, self.y = x, y
+
+
+def _ring(rng, n, radius_min, radius_max):
+    """원점 주변 고리 모양 영역에 n개의 좌표를 뿌립니다."""
+    points = []
+    for _ in range(n):
+        r = rng.uniform(radius_min, radius_max)
+        a = rng.uniform(0.0, 2.0 * math.pi)
+        points.append((r * math.cos(a), r * math.sin(a)))
+    return points
+
+
+# -----------------------------
+# 케이스
+# 각 케이스 함수는 n을 받아 (prepare, step)을 돌려줍니다.
+# prepare()는 매 라운드 시작 전에 불리고(시간 측정 제외, None 가능), step()이 측정 대상입니다.
+# -----------------------------
+def case_world_update(n):
+    """Guard n개가 목표를 쫓는 상태에서 game_world.update() 한 번 (업데이트 + 충돌 검사)."""
+    rng = random.Random(SEED)
+    start = _ring(rng, n, 2000.0, 4000.0)
+    game_world.init()
+    target = Box(0.0, 0.0, groups=('bench_target',))
+    game_world.add_object(target, 1)
+    guards = []
+    for x, y in start:
+        g = Guard(x, y, target)
+        guards.append(g)
+        game_world.add_object(g, 1)
+    game_world.add_collision_pair('enemy', 'bench_target', 'bench:chase', lambda group, a, b: None)
+
+    def prepare():
+        for g, (x, y) in zip(guards, start):
+            g.x, g.y = x, y
+
+    return prepare, game_world.update
+
+
+def case_check_collisions(n):
+    """두 그룹에 n/2개씩 흩어진 박스로 game_world.check_collisions() 한 번."""
+    rng = random.Random(SEED)
+    game_world.init()
+    # 엔티티 수가 늘어도 밀도가 비슷하도록 맵 크기를 키움
+    side = 64.0 * math.sqrt(max(n, 1)) * 2
+    for i in range(n):
+        group = ('bench_a',) if i % 2 == 0 else ('bench_b',)
+        game_world.add_object(Box(rng.uniform(0, side), rng.uniform(0, side), groups=group), 1)
+    game_world.add_collision_pair('bench_a', 'bench_b', 'bench:a:b', lambda group, a, b: None)
+    return None, game_world.check_collisions
+
+
+def case_remove_object(n):
+    """n개를 추가한 뒤 모두 remove_object() 하고 지연 제거를 비우는 비용."""
+    boxes = [Box(i, i, groups=('bench_a',)) for i in range(n)]
+    order = list(boxes)
+    random.Random(SEED).shuffle(order)
+
+    def prepare():
+        game_world.init()
+        for b in boxes:
+            game_world.add_object(b, 1)
+
+    def step():
+        for b in order:
+            game_world.remove_object(b)
+        game_world._flush_removals()
+
+    return prepare, step
+
+
+def case_state_machine(n):
+    """상태 두 개를 오가는 StateMachine에 이벤트 n개를 넣는 비용 (전이 절반, 무시 절반)."""
+
+    class State:
+        def enter(self, e):
+            pass
+
+        def exit(self, e):
+            pass
+
+        def do(self):
+            pass
+
+        def draw(self):
+            pass
+
+    def right_down(e):
+        return e[0] == 'INPUT' and e[1].type == SDL_KEYDOWN and e[1].key == SDLK_RIGHT
+
+    def right_up(e):
+        return e[0] == 'INPUT' and e[1].type == SDL_KEYUP and e[1].key == SDLK_RIGHT
+
+    def space_down(e):
+        return e[0] == 'INPUT' and e[1].type == SDL_KEYDOWN and e[1].key == SDLK_SPACE
+
+    idle, run = State(), State()
+    sm = StateMachine(idle, {
+        idle: {right_down: run, space_down: idle},
+        run: {right_up: idle, space_down: run},
+    })
+    sm.start()
+
+    cycle = [('INPUT', headless.Event(SDL_KEYDOWN, SDLK_RIGHT)),
+             ('INPUT', headless.Event(SDL_KEYDOWN, SDLK_a)),
+             ('INPUT', headless.Event(SDL_KEYUP, SDLK_RIGHT)),
+             ('INPUT', headless.Event(SDL_KEYUP, SDLK_a))]
+    events = [cycle[i % len(cycle)] for i in range(n)]
+
+    def prepare():
+        sm.cur_state = idle
+
+    def step():
+        handle = sm.handle_state_event
+        for e in events:
+            handle(e)
+
+    return prepare, step
+
+
+def case_draw_frame(n):
+    """SpriteSheet.draw_frame() n번 (프레임 번호/좌우 반전을 바꿔 가며)."""
+    sheet = Guard.prepare_sheet()
+    rng = random.Random(SEED)
+    calls = [(i % sheet.frames, rng.uniform(0, 800), rng.uniform(0, 600), i % 2 == 0)
+             for i in range(n)]
+
+    def step():
+        draw = sheet.draw_frame
+        for index, x, y, flip in calls:
+            draw(index, x, y, 96, 96, flip)
+
+    return None, step
+
+
+def case_guard_update(n):
+    """Guard.update() n번 (추적 이동 계산, game_world 없이)."""
+    rng = random.Random(SEED)
+    start = _ring(rng, n, 2000.0, 4000.0)
+    target = Target()
+    guards = [Guard(x, y, target) for x, y in start]
+
+    def prepare():
+        for g, (x, y) in zip(guards, start):
+            g.x, g.y = x, y
+
+    def step():
+        for g in guards:
+            g.update()
+
+    return prepare, step
+
+
+def case_ball_update(n):
+    """Ball.update() n번 (느린 속도로 맵 안에서 이동, game_world 없이)."""
+    rng = random.Random(SEED)
+    start = [(rng.uniform(0, 500), rng.uniform(0, 900)) for _ in range(n)]
+    game_world.set_world_bounds(1500, 900)
+    balls = [Ball(x, y, 1, 0) for x, y in start]
+
+    def prepare():
+        for b, (x, y) in zip(balls, start):
+            b.x, b.y = x, y
+
+    def step():
+        for b in balls:
+            b.update()
+
+    return prepare, step
+
+
+CASES = {
+    'world_update': case_world_update,
+    'check_collisions': case_check_collisions,
+    'remove_object': case_remove_object,
+    'state_machine': case_state_machine,
+    'draw_frame': case_draw_frame,
+    'guard_update': case_guard_update,
+    'ball_update': case_ball_update,
+}
+
+# 라운드 안에서 여러 번 돌리면 결과가 달라지는(상태를 소비하는) 케이스
+ONE_SHOT_CASES = ('remove_object',)
+
+
+# -----------------------------
+# 측정
+# -----------------------------
+def _time_round(prepare, step, loops):
+    if prepare is not None:
+        prepare()
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        step()
+    return time.perf_counter() - t0
+
+
+def _calibrate(prepare, step, one_shot):
+    """한 라운드가 MIN_ROUND_TIME 이상이 되는 반복 횟수를 찾습니다."""
+    if one_shot:
+        return 1
+    loops = 1
+    while loops < MAX_LOOPS:
+        if _time_round(prepare, step, loops) >= MIN_ROUND_TIME:
+            break
+        loops = min(loops * 2, MAX_LOOPS)
+    return loops
+
+
+def measure(name, n, repeat=DEFAULT_REPEAT):
+    """케이스 하나를 n개 엔티티로 측정하고 결과 dict를 돌려줍니다. 시간 단위는 ms/step."""
+    game_framework.frame_time = DT
+    prepare, step = CASES[name](n)
+    one_shot = name in ONE_SHOT_CASES
+    loops = _calibrate(prepare, step, one_shot)
+
+    samples = []
+    for _ in range(repeat):
+        samples.append(_time_round(prepare, step, loops) / loops)
+
+    median = statistics.median(samples)
+    game_world.init()
+    return {
+        'case': name,
+        'n': n,
+        'loops': loops,
+        'repeat': repeat,
+        'median_ms': median * 1000.0,
+        'min_ms': min(samples) * 1000.0,
+        'max_ms': max(samples) * 1000.0,
+        'per_entity_ns': median / max(n, 1) * 1e9,
+    }
+
+
+def run(cases, sizes, repeat=DEFAULT_REPEAT, out=DEFAULT_OUT):
+    results = {}
+    print(f"{'case':<18}{'n':>7}{'median ms':>12}{'min ms':>10}{'ns/entity':>12}")
+    for name in cases:
+        for n in sizes:
+            r = measure(name, n, repeat)
+            results[f'{name}/{n}'] = r
+            print(f"{name:<18}{n:>7}{r['median_ms']:>12.4f}{r['min_ms']:>10.4f}{r['per_entity_ns']:>12.1f}")
+
+    data = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': list(sizes),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+    if out:
+        with open(out, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        print(f"[bench] {len(results)} results -> {out}")
+    return data
+
+
+def compare(old_path, new_path, threshold=DEFAULT_THRESHOLD):
+    """두 결과 파일의 중앙값을 비교합니다. threshold보다 느려진 항목 목록을 돌려줍니다."""
+    with open(old_path) as f:
+        old = json.load(f)['results']
+    with open(new_path) as f:
+        new = json.load(f)['results']
+
+    regressions = []
+    print(f"{'case/n':<26}{'old ms':>11}{'new ms':>11}{'change':>9}")
+    for key in sorted(old, key=lambda k: (old[k]['case'], old[k]['n'])):
+        if key not in new:
+            print(f"{key:<26}{old[key]['median_ms']:>11.4f}{'-':>11}{'':>9}  (없음)")
+            continue
+        a, b = old[key]['median_ms'], new[key]['median_ms']
+        change = (b - a) / a if a > 0 else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{key:<26}{a:>11.4f}{b:>11.4f}{change * 100:>8.1f}%{flag}")
+
+    print(f"[bench] {len(regressions)} regression(s) over {threshold * 100:.0f}%")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pico2d 엔진 핫패스 벤치마크')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_run = sub.add_parser('run', help='벤치마크를 돌리고 JSON으로 저장')
+    p_run.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    p_run.add_argument('--cases', default=','.join(CASES))
+    p_run.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    p_run.add_argument('--out', default=DEFAULT_OUT)
+
+    p_cmp = sub.add_parser('compare', help='두 결과 JSON을 비교')
+    p_cmp.add_argument('old')
+    p_cmp.add_argument('new')
+    p_cmp.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        cases = [c for c in args.cases.split(',') if c]
+        unknown = [c for c in cases if c not in CASES]
+        if unknown:
+            parser.error(f"알 수 없는 케이스: {', '.join(unknown)} (가능: {', '.join(CASES)})")
+        sizes = [int(s) for s in args.sizes.split(',') if s]
+        # 에셋 경로가 상대 경로이므로 이 파일 위치에서 실행
+        out = os.path.abspath(args.out) if args.out else None
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        run(cases, sizes, args.repeat, out)
+        return 0
+
+    regressions = compare(args.old, args.new, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
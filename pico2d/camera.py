@@ -0,0 +1,69 @@
+from pico2d import *
+import game_framework
+
+
+class Camera:
+    """월드 좌표와 화면 좌표 사이의 변환, 현재 보이는 영역(뷰 사각형)을 담당합니다.
+
+    play_mode가 하나 만들어 game_world.set_camera()로 등록하면
+    game_world.draw()가 화면 밖 객체를 건너뛰고, 엔티티는 game_world.to_screen()으로 그릴 위치를 구합니다.
+    """
+
+    def __init__(self, world_width, world_height, view_width=None, view_height=None):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.width = view_width if view_width is not None else get_canvas_width()
+        self.height = view_height if view_height is not None else get_canvas_height()
+
+        # 뷰 사각형의 왼쪽 아래 (월드 좌표)
+        self.left = 0
+        self.bottom = 0
+        # 직전 틱의 left/bottom (그릴 때 game_framework.alpha로 보간)
+        self.prev_left = 0
+        self.prev_bottom = 0
+
+        self.target = None
+
+    def follow(self, target):
+        """target(x, y를 가진 객체)을 화면 중앙에 두도록 따라갑니다."""
+        self.target = target
+
+    def snap(self):
+        """보간 없이 지금 target 위치로 바로 맞춥니다 (모드 시작, 순간이동 후)."""
+        self.update()
+        self.prev_left, self.prev_bottom = self.left, self.bottom
+
+    def update(self):
+        self.prev_left, self.prev_bottom = self.left, self.bottom
+        if self.target is None:
+            return
+        # 맵 밖이 보이지 않도록 뷰를 맵 안으로 제한
+        self.left = clamp(0, int(self.target.x) - self.width // 2,
+                          max(0, self.world_width - self.width))
+        self.bottom = clamp(0, int(self.target.y) - self.height // 2,
+                            max(0, self.world_height - self.height))
+
+    def origin(self):
+        """지금 그리는 화면의 왼쪽 아래 (직전 틱과 현재 틱 사이를 alpha로 보간한 월드 좌표)."""
+        a = game_framework.alpha
+        return (self.prev_left + (self.left - self.prev_left) * a,
+                self.prev_bottom + (self.bottom - self.prev_bottom) * a)
+
+    def view_rect(self):
+        """현재 보이는 영역을 (left, bottom, right, top) 월드 좌표로 돌려줍니다."""
+        left, bottom = self.origin()
+        return left, bottom, left + self.width, bottom + self.height
+
+    def to_screen(self, x, y):
+        left, bottom = self.origin()
+        return x - left, y - bottom
+
+    def to_world(self, sx, sy):
+        left, bottom = self.origin()
+        return sx + left, sy + bottom
+
+    def is_visible(self, bb):
+        """AABB가 뷰 사각형과 조금이라도 겹치면 True."""
+        left, bottom, right, top = self.view_rect()
+        x1, y1, x2, y2 = bb
+        return not (x2 < left or x1 > right or y2 < bottom or y1 > top)
@@ -0,0 +1,243 @@
+# collision_map.py
+# 맵의 막힌 칸(벽, 닫힌 문)을 비트 단위로 담은 격자와 이동/광선 질의
+#
+# 픽셀 단위로 한 칸씩 움직여 보며 is_solid_at()을 부르는 대신, 칸 단위로 계산해서 한 번에 답합니다.
+# - sweep(bb, dx, dy): 박스를 (dx, dy)만큼 옮길 때 벽 바로 앞까지 갈 수 있는 이동량 (x축, y축 순서)
+# - raycast(x0, y0, x1, y1): 선분이 처음 막힌 칸에 들어가는 지점 (DDA, 지나는 칸 수만큼만 검사)
+# - solid_array(): NumPy가 있으면 (rows, cols) bool 배열 (ProjectileBatch처럼 한꺼번에 검사할 때)
+# - segment_hits(x0, y0, x1, y1): 선분 배열 전체를 한꺼번에 DDA로 검사해서 벽에 닿는 t 배열
+# 격자 밖은 막힌 것으로 봅니다 (월드 가장자리가 벽).
+#
+# play_mode가 타일맵으로 만들어 game_world.set_collision_map()으로 등록하고,
+# 엔티티는 game_world.collision_map으로 꺼내 씁니다 (None이면 벽 없음).
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CollisionMap:
+    def __init__(self, cols, rows, cell_w, cell_h=None):
+        self.cols = cols
+        self.rows = rows
+        self.cell_w = cell_w
+        self.cell_h = cell_h if cell_h is not None else cell_w
+        self.bits = bytearray((cols * rows + 7) // 8)
+        self.solid_tiles = frozenset()
+        self._array = None      # solid_array() 캐시 (set_solid 하면 버림)
+        self.version = 0        # 칸이 바뀔 때마다 증가 (pathfinding이 캐시를 버리는 기준)
+
+    @classmethod
+    def from_tilemap(cls, tile_map, solid_tiles):
+        """TileMap에서 solid_tiles에 속한 타일을 막힌 칸으로 만듭니다.
+        이후 tile_map.set()으로 타일이 바뀌면 이 격자도 같이 바뀝니다."""
+        cmap = cls(tile_map.cols, tile_map.rows, tile_map.draw_w, tile_map.draw_h)
+        cmap.solid_tiles = frozenset(solid_tiles)
+        for i, tile in enumerate(tile_map.tiles):
+            if tile in cmap.solid_tiles:
+                cmap.bits[i >> 3] |= 1 << (i & 7)
+        tile_map.collision = cmap
+        return cmap
+
+    def on_tile_changed(self, col, row, tile):
+        self.set_solid(col, row, tile in self.solid_tiles)
+
+    # -----------------------------
+    # 칸 질의
+    # -----------------------------
+    def set_solid(self, col, row, solid=True):
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return
+        i = row * self.cols + col
+        if solid:
+            self.bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        self._array = None
+        self.version += 1
+
+    def is_solid(self, col, row):
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return True
+        i = row * self.cols + col
+        return bool(self.bits[i >> 3] & (1 << (i & 7)))
+
+    def cell_at(self, x, y):
+        return math.floor(x / self.cell_w), math.floor(y / self.cell_h)
+
+    def is_solid_at(self, x, y):
+        return self.is_solid(*self.cell_at(x, y))
+
+    def _cols_of(self, x1, x2):
+        # 박스는 [x1, x2) 로 봄: 오른쪽 끝이 칸 경계에 딱 붙어 있으면 그 칸은 겹치지 않음
+        return math.floor(x1 / self.cell_w), math.ceil(x2 / self.cell_w) - 1
+
+    def _rows_of(self, y1, y2):
+        return math.floor(y1 / self.cell_h), math.ceil(y2 / self.cell_h) - 1
+
+    def box_blocked(self, x1, y1, x2, y2):
+        """박스가 막힌 칸과 겹치면 True."""
+        c1, c2 = self._cols_of(x1, x2)
+        r1, r2 = self._rows_of(y1, y2)
+        return any(self.is_solid(c, r) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1))
+
+    # -----------------------------
+    # 이동
+    # -----------------------------
+    def _column_blocked(self, col, r1, r2):
+        return any(self.is_solid(col, r) for r in range(r1, r2 + 1))
+
+    def _row_blocked(self, row, c1, c2):
+        return any(self.is_solid(c, row) for c in range(c1, c2 + 1))
+
+    def _sweep_x(self, x1, y1, x2, y2, dx):
+        r1, r2 = self._rows_of(y1, y2)
+        if dx > 0:
+            start = math.ceil(x2 / self.cell_w) - 1
+            end = math.ceil((x2 + dx) / self.cell_w) - 1
+            for col in range(start + 1, end + 1):
+                if self._column_blocked(col, r1, r2):
+                    return col * self.cell_w - x2
+        elif dx < 0:
+            start = math.floor(x1 / self.cell_w)
+            end = math.floor((x1 + dx) / self.cell_w)
+            for col in range(start - 1, end - 1, -1):
+                if self._column_blocked(col, r1, r2):
+                    return (col + 1) * self.cell_w - x1
+        return dx
+
+    def _sweep_y(self, x1, y1, x2, y2, dy):
+        c1, c2 = self._cols_of(x1, x2)
+        if dy > 0:
+            start = math.ceil(y2 / self.cell_h) - 1
+            end = math.ceil((y2 + dy) / self.cell_h) - 1
+            for row in range(start + 1, end + 1):
+                if self._row_blocked(row, c1, c2):
+                    return row * self.cell_h - y2
+        elif dy < 0:
+            start = math.floor(y1 / self.cell_h)
+            end = math.floor((y1 + dy) / self.cell_h)
+            for row in range(start - 1, end - 1, -1):
+                if self._row_blocked(row, c1, c2):
+                    return (row + 1) * self.cell_h - y1
+        return dy
+
+    def sweep(self, bb, dx, dy):
+        """AABB bb를 (dx, dy)만큼 옮길 때 실제로 갈 수 있는 (dx, dy).
+
+        x축을 먼저 옮기고 y축을 옮기므로 벽을 따라 미끄러집니다.
+        이미 겹쳐 있는 막힌 칸은 무시해서 끼었을 때 빠져나올 수 있습니다.
+        """
+        x1, y1, x2, y2 = bb
+        dx = self._sweep_x(x1, y1, x2, y2, dx)
+        dy = self._sweep_y(x1 + dx, y1, x2 + dx, y2, dy)
+        return dx, dy
+
+    # -----------------------------
+    # 광선
+    # -----------------------------
+    def raycast(self, x0, y0, x1, y1):
+        """(x0, y0) -> (x1, y1) 선분이 처음 만나는 막힌 칸.
+
+        맞으면 (x, y, col, row) (x, y는 칸에 들어가는 지점), 안 맞으면 None.
+        시작점이 이미 막힌 칸 안이면 시작점을 돌려줍니다.
+        """
+        col, row = self.cell_at(x0, y0)
+        if self.is_solid(col, row):
+            return x0, y0, col, row
+        end_col, end_row = self.cell_at(x1, y1)
+        dx, dy = x1 - x0, y1 - y0
+        step_c = 1 if dx > 0 else -1
+        step_r = 1 if dy > 0 else -1
+        # 다음 세로/가로 경계까지의 t (선분 길이 1 기준)와 한 칸 건너는 데 드는 t
+        if dx != 0:
+            next_x = (col + (1 if dx > 0 else 0)) * self.cell_w
+            t_max_x, t_delta_x = (next_x - x0) / dx, self.cell_w / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy != 0:
+            next_y = (row + (1 if dy > 0 else 0)) * self.cell_h
+            t_max_y, t_delta_y = (next_y - y0) / dy, self.cell_h / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        while (col, row) != (end_col, end_row):
+            if t_max_x < t_max_y:
+                t = t_max_x
+                col += step_c
+                t_max_x += t_delta_x
+            else:
+                t = t_max_y
+                row += step_r
+                t_max_y += t_delta_y
+            if t > 1:
+                break
+            if self.is_solid(col, row):
+                return x0 + dx * t, y0 + dy * t, col, row
+        return None
+
+    def solid_array(self):
+        """(rows, cols) bool 배열. NumPy가 없으면 None."""
+        if np is None:
+            return None
+        if self._array is None:
+            bits = np.unpackbits(np.frombuffer(bytes(self.bits), dtype=np.uint8), bitorder='little')
+            self._array = bits[:self.cols * self.rows].astype(bool).reshape(self.rows, self.cols)
+        return self._array
+
+    def _solid_cells(self, cols, rows):
+        grid = self.solid_array()
+        inside = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        solid = ~inside
+        solid[inside] = grid[rows[inside], cols[inside]]
+        return solid
+
+    def solid_at_points(self, xs, ys):
+        """NumPy 좌표 배열의 각 점이 막힌 칸에 있는지 (bool 배열). 격자 밖은 막힌 것으로 봄."""
+        cols = np.floor(xs / self.cell_w).astype(np.int64)
+        rows = np.floor(ys / self.cell_h).astype(np.int64)
+        return self._solid_cells(cols, rows)
+
+    def segment_hits(self, x0, y0, x1, y1):
+        """raycast()를 NumPy 배열의 선분들에 한꺼번에 적용합니다.
+
+        선분마다 처음 막힌 칸에 들어가는 t (0~1, 시작점이 막힌 칸이면 0)를, 안 맞으면 inf를 담은 배열.
+        칸을 하나 건널 때마다 모든 선분을 같이 한 걸음씩 진행하므로 반복 횟수는
+        가장 많은 칸을 지나는 선분의 칸 수입니다.
+        """
+        dx, dy = x1 - x0, y1 - y0
+        col = np.floor(x0 / self.cell_w).astype(np.int64)
+        row = np.floor(y0 / self.cell_h).astype(np.int64)
+        end_col = np.floor(x1 / self.cell_w).astype(np.int64)
+        end_row = np.floor(y1 / self.cell_h).astype(np.int64)
+        t = np.where(self._solid_cells(col, row), 0.0, np.inf)
+
+        step_c = np.where(dx > 0, 1, -1)
+        step_r = np.where(dy > 0, 1, -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            next_x = (col + (dx > 0)) * self.cell_w
+            next_y = (row + (dy > 0)) * self.cell_h
+            t_max_x = np.where(dx != 0, (next_x - x0) / dx, np.inf)
+            t_max_y = np.where(dy != 0, (next_y - y0) / dy, np.inf)
+            t_delta_x = np.where(dx != 0, self.cell_w / np.abs(dx), np.inf)
+            t_delta_y = np.where(dy != 0, self.cell_h / np.abs(dy), np.inf)
+
+        remaining = np.abs(end_col - col) + np.abs(end_row - row)
+        for _ in range(int(remaining.max(initial=0))):
+            active = (remaining > 0) & np.isinf(t)
+            if not active.any():
+                break
+            go_x = active & (t_max_x < t_max_y)
+            go_y = active & ~go_x
+            t_cross = np.where(go_x, t_max_x, t_max_y)
+            col += np.where(go_x, step_c, 0)
+            row += np.where(go_y, step_r, 0)
+            t_max_x = np.where(go_x, t_max_x + t_delta_x, t_max_x)
+            t_max_y = np.where(go_y, t_max_y + t_delta_y, t_max_y)
+            remaining -= active
+            hit = active & (t_cross <= 1) & self._solid_cells(col, row)
+            t[hit] = t_cross[hit]
+        return t
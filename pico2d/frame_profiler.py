@@ -0,0 +1,169 @@
+# frame_profiler.py
+# 프레임 구간별 시간 측정기
+#
+# game_framework / game_world / play_mode가 구간마다 begin()/end()를 호출합니다.
+# 꺼져 있을 때(enabled = False)는 begin()이 0.0을 돌려주고 end()가 바로 리턴하므로
+# 비용은 구간당 함수 호출 두 번뿐입니다.
+#
+#   F3: 측정 켜기 + 화면 오버레이 표시/숨기기 (play_mode)
+#   F4: 지금까지의 프레임별 기록을 CSV로 저장
+
+import csv
+import math
+import time
+from collections import deque
+
+from pico2d import *
+import text_cache
+
+enabled = False
+overlay_visible = False
+
+# 롤링 통계(p50/p95/p99)에 쓰는 최근 프레임 수
+WINDOW = 300
+# CSV로 내보내려고 보관하는 최대 프레임 수
+MAX_ROWS = 100000
+CSV_PATH = 'frame_profile.csv'
+
+# 오버레이에 표시할 구간 (없으면 측정된 모든 구간)
+OVERLAY_PHASES = ('frame', 'handle_events', 'update', 'pathfinding', 'collisions', 'draw', 'hud')
+
+_frame = {}         # 현재 프레임: 구간 이름 -> 누적 초
+_frame_start = 0.0
+_frame_index = 0
+_history = {}       # 구간 이름 -> deque(최근 WINDOW 프레임의 초)
+_rows = deque(maxlen=MAX_ROWS)
+_columns = []       # 등장 순서대로 구간 이름 (CSV 열 순서)
+
+_font = None
+
+
+def _name(key):
+    # ('update.layer', 1) 처럼 튜플로 받은 이름은 기록할 때만 문자열로 만듦
+    if isinstance(key, tuple):
+        return f'{key[0]}{key[1]}'
+    return key
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def reset():
+    """누적된 통계와 기록을 모두 지웁니다."""
+    global _frame_index
+    _frame.clear()
+    _history.clear()
+    _rows.clear()
+    _columns.clear()
+    _frame_index = 0
+
+
+def begin():
+    """구간 측정 시작 시각을 돌려줍니다. 꺼져 있으면 0.0."""
+    return time.perf_counter() if enabled else 0.0
+
+
+def end(key, t0):
+    """begin()에서 받은 t0부터 지금까지를 key 구간 시간에 더합니다."""
+    if not enabled or not t0:
+        return
+    elapsed = time.perf_counter() - t0
+    _frame[key] = _frame.get(key, 0.0) + elapsed
+
+
+def begin_frame():
+    global _frame_start
+    if not enabled:
+        return
+    _frame.clear()
+    _frame_start = time.perf_counter()
+
+
+def end_frame():
+    """한 프레임의 측정을 마치고 롤링 통계와 CSV 기록에 넣습니다."""
+    global _frame_index
+    if not enabled or not _frame_start:
+        return
+    row = {'frame': time.perf_counter() - _frame_start}
+    for key, seconds in _frame.items():
+        row[_name(key)] = seconds
+    for name, seconds in row.items():
+        history = _history.get(name)
+        if history is None:
+            history = _history[name] = deque(maxlen=WINDOW)
+            _columns.append(name)
+        history.append(seconds)
+    row['index'] = _frame_index
+    _rows.append(row)
+    _frame_index += 1
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    # nearest-rank 방식
+    k = max(0, math.ceil(p / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def stats(name):
+    """최근 WINDOW 프레임에서 구간의 p50/p95/p99/평균(밀리초)을 돌려줍니다."""
+    values = sorted(_history.get(name, ()))
+    if not values:
+        return None
+    return {
+        'p50': _percentile(values, 50) * 1000.0,
+        'p95': _percentile(values, 95) * 1000.0,
+        'p99': _percentile(values, 99) * 1000.0,
+        'mean': sum(values) / len(values) * 1000.0,
+        'count': len(values),
+    }
+
+
+def report():
+    """측정된 모든 구간의 통계를 {구간: stats} 로 돌려줍니다."""
+    return {name: stats(name) for name in _columns}
+
+
+def dump_csv(path=None):
+    """프레임별 기록(초 단위)을 CSV로 저장하고 저장한 경로를 돌려줍니다."""
+    path = path or CSV_PATH
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['index'] + _columns)
+        for row in _rows:
+            writer.writerow([row['index']] + [f"{row.get(name, 0.0):.6f}" for name in _columns])
+    print(f"[Profiler] {len(_rows)} frames -> {path}")
+    return path
+
+
+def toggle_overlay():
+    """오버레이를 켜고 끕니다. 켤 때 측정도 함께 켭니다."""
+    global overlay_visible
+    overlay_visible = not overlay_visible
+    if overlay_visible:
+        enable(True)
+
+
+def draw_overlay():
+    """화면 왼쪽 위에 구간별 p50/p95/p99(ms)를 표시합니다."""
+    global _font
+    if not overlay_visible:
+        return
+    if _font is None:
+        try:
+            _font = text_cache.font('ENCR10B.TTF', 14)
+        except Exception:
+            return
+    names = [n for n in OVERLAY_PHASES if n in _history] or _columns
+    x = 10
+    y = get_canvas_height() - 110
+    _font.draw(x, y, 'phase         p50    p95    p99 (ms)', (255, 255, 0))
+    for name in names:
+        s = stats(name)
+        if s is None:
+            continue
+        y -= 16
+        _font.draw_glyphs(x, y, f"{name:<12}{s['p50']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f}", (255, 255, 255))
@@ -1,10 +1,121 @@
 from pico2d import *
+import time
+import frame_profiler
+
+try:
+    from sdl2 import SDL_WaitEventTimeout
+except ImportError:
+    SDL_WaitEventTimeout = None
 
 # 게임 프레임워크: 모드(상태) 전환과 메인 루프만 담당
 
 running = None          # 게임 루프 실행 여부
 stack = []              # 모드 스택 (필요시 여러 모드 쌓을 수 있음)
 
+# 한 번 init()을 마친 모드. 다시 들어올 때는 init() 없이 enter()만 호출해서
+# 모드가 init()/preload()에서 만든 자원(이미지, 폰트 등)을 exit/enter 사이에 유지합니다.
+_initialized = set()
+
+# 미리 읽기(preload): 모드 모듈이 preload() 제너레이터를 정의하면
+# 다른 모드가 도는 동안 프레임마다 PRELOAD_BUDGET 초씩 나눠서 진행합니다.
+PRELOAD_BUDGET = 0.004
+_preloading = {}        # 모드 -> 진행 중인 preload() 제너레이터
+_preloaded = set()
+
+
+def preload(mode):
+    """현재 모드가 도는 동안 mode의 자원을 조금씩 미리 읽기 시작합니다."""
+    if mode in _preloaded or mode in _preloading or not hasattr(mode, 'preload'):
+        return
+    _preloading[mode] = mode.preload()
+
+
+def is_preloaded(mode):
+    return mode in _preloaded
+
+
+def is_preloading(mode):
+    return mode in _preloading
+
+
+def _step_preloads(budget):
+    """진행 중인 미리 읽기를 budget 초 동안 진행합니다."""
+    if not _preloading:
+        return
+    deadline = time.perf_counter() + budget
+    for mode, steps in list(_preloading.items()):
+        while True:
+            try:
+                next(steps)
+            except StopIteration:
+                del _preloading[mode]
+                _preloaded.add(mode)
+                break
+            except Exception as e:
+                print(f"[preload] {getattr(mode, 'name', mode)} 실패: {e}")
+                del _preloading[mode]
+                break
+            if time.perf_counter() >= deadline:
+                return
+
+
+def _finish_preload(mode):
+    """아직 끝나지 않은 미리 읽기가 있으면 지금 모두 끝냅니다."""
+    steps = _preloading.pop(mode, None)
+    if steps is None:
+        return
+    try:
+        for _ in steps:
+            pass
+        _preloaded.add(mode)
+    except Exception as e:
+        print(f"[preload] {getattr(mode, 'name', mode)} 실패: {e}")
+
+
+# 첫 프레임을 화면에 올린 뒤 한 번 호출할 함수들 (시작 시간 추적, 무거운 모드 미리 읽기 등)
+_first_frame_done = False
+_first_frame_callbacks = []
+
+
+def after_first_frame(callback):
+    """첫 프레임이 그려진 뒤 callback()을 호출합니다. 이미 지났으면 바로 호출합니다."""
+    if _first_frame_done:
+        callback()
+    else:
+        _first_frame_callbacks.append(callback)
+
+
+def _first_frame_presented():
+    global _first_frame_done
+    _first_frame_done = True
+    callbacks = list(_first_frame_callbacks)
+    _first_frame_callbacks.clear()
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"[first frame] {callback} 실패: {e}")
+
+
+def _enter(mode):
+    """처음 들어가는 모드면 init()을 한 번 호출하고 enter()를 호출합니다.
+    미리 읽기가 덜 끝났거나 시작도 안 했으면 여기서 마저 끝냅니다."""
+    preload(mode)
+    _finish_preload(mode)
+    if mode not in _initialized:
+        mode.init()
+        _initialized.add(mode)
+    mode.enter()
+
+
+def _finish_all():
+    """init()을 불렀거나 미리 읽기를 시작한 모드들의 finish()를 한 번씩 호출합니다 (프로그램 종료 시)."""
+    modes = dict.fromkeys([*_initialized, *_preloaded, *_preloading])
+    for mode in modes:
+        if hasattr(mode, 'finish'):
+            mode.finish()
+    _initialized.clear()
+
 
 def change_mode(mode):
     """현재 모드를 종료하고 새 모드로 전환"""
@@ -14,8 +125,9 @@ def change_mode(mode):
         stack.pop()
 
     stack.append(mode)
-    mode.init()
-    mode.enter()
+    _enter(mode)
+    reset_clock()
+    invalidate()
 
 
 def push_mode(mode):
@@ -25,8 +137,9 @@ def push_mode(mode):
         stack[-1].exit()
 
     stack.append(mode)
-    mode.init()
-    mode.enter()
+    _enter(mode)
+    reset_clock()
+    invalidate()
 
 
 def pop_mode():
@@ -41,6 +154,8 @@ def pop_mode():
 
     if stack:
         stack[-1].enter()
+        reset_clock()
+        invalidate()
     else:
         running = False
 
@@ -51,36 +166,205 @@ def quit():
     running = False
 
 
-# 프레임 시간 측정용
+# 프레임 시간 측정용 (update()에서 사용하는 한 스텝의 시간, 초)
 frame_time = 0.0
 
+# 고정 시간 간격 시뮬레이션: None이면 실제 경과 시간을 그대로 frame_time으로 사용
+fixed_dt = None
+# 한 프레임에서 따라잡을 최대 경과 시간 (멈춤 후 update가 끝없이 밀리는 것을 방지)
+MAX_FRAME_TIME = 0.25
+# 초당 최대 그리기 횟수 (CPU를 다 쓰지 않도록). None이면 제한 없음 (vsync에 맡길 때)
+MAX_FPS = 144
+# 렌더 보간 계수 (0~1): 마지막 시뮬레이션 스텝 이후 다음 스텝까지 진행된 비율
+# 엔티티는 update() 앞에서 prev_x/prev_y를 기록해 두고, draw()에서
+# game_world.render_position()으로 직전/현재 위치 사이를 이 비율로 섞어 그립니다. 가변 간격 모드에서는 항상 1.0
+alpha = 1.0
+
+# 모드 전환(에셋 로드) 시간이 다음 프레임 시간에 섞이지 않도록 시계를 다시 맞출지 여부
+_clock_reset = False
+
 
-def run(start_mode):
-    """메인 루프를 돌리면서 현재 모드의 핸들러를 호출"""
-    global running, stack, frame_time
+def reset_clock():
+    """다음 프레임의 경과 시간 측정을 지금부터 다시 시작합니다."""
+    global _clock_reset
+    _clock_reset = True
+
+
+# 유휴(idle) 모드: 모듈에 idle = True 를 선언한 모드(메뉴, 일시정지 화면 등)는
+# 입력이나 타이머(idle_timeout 초, 없으면 IDLE_TIMEOUT)가 올 때까지 잠들었다가
+# 화면이 바뀌었을 때(_dirty)만 다시 그립니다.
+IDLE_TIMEOUT = 1.0
+_dirty = True
+
+
+def invalidate():
+    """유휴 모드에서 다음 루프에 화면을 다시 그리도록 표시합니다."""
+    global _dirty
+    _dirty = True
+
+
+def _wait_for_event(timeout):
+    """이벤트가 들어오거나 timeout(초)이 지날 때까지 블록합니다. 이벤트가 있으면 True.
+
+    이벤트 큐에서 꺼내지 않으므로 모드의 handle_events()가 그대로 받습니다.
+    """
+    if SDL_WaitEventTimeout is not None:
+        return SDL_WaitEventTimeout(None, int(timeout * 1000)) != 0
+    # sdl2를 직접 쓸 수 없으면 짧게 쉬었다가 이벤트를 확인
+    delay(min(timeout, 0.05))
+    return False
+
+
+def run(start_mode, timestep=None):
+    """메인 루프를 돌리면서 현재 모드의 핸들러를 호출
+
+    timestep(초)을 주면(또는 fixed_dt를 미리 설정하면) 누적기(accumulator)로 update()를
+    고정 간격으로 여러 번 호출하고, 남은 시간 비율을 alpha로 두고 draw()를 한 번 호출합니다.
+    그리기 횟수는 시뮬레이션 간격과 관계없이 MAX_FPS로만 제한합니다.
+    """
+    global running, stack, frame_time, alpha, fixed_dt, _clock_reset, _dirty
+    if timestep is not None:
+        fixed_dt = timestep
 
     running = True
     stack = [start_mode]
 
-    start_mode.init()
-    start_mode.enter()
+    _enter(start_mode)
 
     current_time = get_time()
+    accumulator = 0.0
+    _dirty = True
 
     while running:
+        # 유휴 모드이고 다시 그릴 것도, 미리 읽을 것도 없으면 입력/타이머가 올 때까지 대기
+        idle = getattr(stack[-1], 'idle', False)
+        if idle and not _dirty and not _preloading:
+            if _wait_for_event(getattr(stack[-1], 'idle_timeout', IDLE_TIMEOUT)):
+                # 입력은 화면을 바꿀 수 있다고 보고 다시 그림
+                _dirty = True
+
         # 프레임 시간 계산
         new_time = get_time()
-        frame_time = new_time - current_time
+        if _clock_reset:
+            _clock_reset = False
+            current_time = new_time
+            accumulator = 0.0
+        elapsed = new_time - current_time
         current_time = new_time
 
         # 현재 모드 하나만 사용 (스택 최상단)
         mode = stack[-1]
+        frame_profiler.begin_frame()
 
+        t0 = frame_profiler.begin()
         mode.handle_events()
-        mode.update()
+        frame_profiler.end('handle_events', t0)
+        # 이벤트 처리 중 모드가 바뀌었거나 종료되었으면 이전 모드의 update/draw는 건너뜀
+        if not running or not stack or stack[-1] is not mode:
+            continue
+
+        if idle:
+            # 유휴 모드는 한 번만 update하고, 바뀐 것이 있을 때만 그림
+            frame_time = elapsed
+            mode.update()
+            accumulator = 0.0
+            if _dirty and running and stack[-1] is mode:
+                _dirty = False
+                mode.draw()
+                if not _first_frame_done:
+                    _first_frame_presented()
+            _step_preloads(PRELOAD_BUDGET)
+            continue
+
+        t0 = frame_profiler.begin()
+        if fixed_dt is None:
+            frame_time = elapsed
+            mode.update()
+            alpha = 1.0
+        else:
+            accumulator += min(elapsed, MAX_FRAME_TIME)
+            frame_time = fixed_dt
+            while accumulator >= fixed_dt:
+                mode.update()
+                accumulator -= fixed_dt
+                if not running or stack[-1] is not mode:
+                    break
+            alpha = accumulator / fixed_dt
+        frame_profiler.end('update', t0)
+        if not running or stack[-1] is not mode:
+            continue
+
+        # 틱이 돌지 않은 루프도 그림 (alpha가 달라서 보간된 위치가 매번 다름)
+        t0 = frame_profiler.begin()
         mode.draw()
+        frame_profiler.end('draw', t0)
+        frame_profiler.end_frame()
+        if not _first_frame_done:
+            _first_frame_presented()
+
+        # 남는 시간에 다음 모드 자원을 조금씩 미리 읽음
+        _step_preloads(PRELOAD_BUDGET)
+
+        # 그리기 횟수 제한: 이번 프레임이 1 / MAX_FPS보다 빨리 끝났으면 남은 시간만큼 쉼
+        if MAX_FPS:
+            remaining = 1.0 / MAX_FPS - (get_time() - new_time)
+            if remaining > 0:
+                delay(remaining)
 
     # 루프 종료 시 현재 모드 정리
     while stack:
         stack[-1].exit()
         stack.pop()
+    _finish_all()
+
+
+def run_headless(start_mode, ticks, dt=1.0 / 60.0, render=True, on_tick=None):
+    """창 없이 ticks번 루프를 최대 속도로 돌리고 초당 틱 수를 출력/반환합니다.
+
+    headless.install()로 가짜 pico2d를 설치한 상태에서 사용합니다.
+    frame_time은 실제 시간 대신 고정된 dt를 사용하고, render=False면 draw()를 건너뜁니다.
+    on_tick(tick)은 매 틱 handle_events() 전에 불리며 봇이 입력을 넣는 용도로 씁니다.
+    """
+    global running, stack, frame_time, alpha
+
+    running = True
+    stack = [start_mode]
+    _enter(start_mode)
+
+    frame_time = dt
+    alpha = 1.0
+    done = 0
+    start = time.perf_counter()
+    while running and done < ticks:
+        if on_tick is not None:
+            on_tick(done)
+        mode = stack[-1]
+        frame_profiler.begin_frame()
+        t0 = frame_profiler.begin()
+        mode.handle_events()
+        frame_profiler.end('handle_events', t0)
+        if running and stack and stack[-1] is mode:
+            frame_time = dt
+            t0 = frame_profiler.begin()
+            mode.update()
+            frame_profiler.end('update', t0)
+            if render and running and stack[-1] is mode:
+                t0 = frame_profiler.begin()
+                mode.draw()
+                frame_profiler.end('draw', t0)
+        frame_profiler.end_frame()
+        if not _first_frame_done:
+            _first_frame_presented()
+        _step_preloads(PRELOAD_BUDGET)
+        done += 1
+    seconds = time.perf_counter() - start
+
+    while stack:
+        stack[-1].exit()
+        stack.pop()
+    _finish_all()
+    running = False
+
+    tps = done / seconds if seconds > 0 else float('inf')
+    print(f"[headless] {done} ticks in {seconds:.3f}s -> {tps:.1f} ticks/s")
+    return {'ticks': done, 'seconds': seconds, 'ticks_per_second': tps}
@@ -2,76 +2,407 @@
 
 from pico2d import *
 import game_framework
+import frame_profiler
 import sys
 
 # 게임 객체를 저장하는 레이어 리스트
 objects = []
 NUM_LAYERS = 2  # 0: 배경, 1: 캐릭터/몬스터 등으로 사용
+
+# 발 위치(y)로 그리기 순서를 맞추는 레이어. 위쪽(y가 큰) 객체를 먼저 그려 아래쪽 객체가 앞에 보이게 함
+DEPTH_SORTED_LAYERS = (1,)
+
+# 객체 -> (레이어 번호, 레이어 안의 인덱스). 제거를 O(1)로 하기 위한 색인
+_slots = {}
+# 제거 대기열 (삽입 순서를 유지하는 집합). 틱의 정해진 지점에서 한꺼번에 비움
+_pending_removals = {}
+
+# 연속 충돌 검사 대상 (클래스 속성 swept_collision = True 인 빠른 객체들)
+_swept_objects = {}
+# 이번 틱 update() 직전의 AABB (obj -> bb)
+_prev_bbs = {}
+
+# 화면 카메라 (play_mode가 set_camera로 등록). 없으면 월드 좌표 = 화면 좌표
+camera = None
+# 마지막 draw()에서 그린 객체 수 / 화면 밖이라 건너뛴 객체 수
+draw_stats = {'drawn': 0, 'culled': 0}
+
+# 충돌 그룹 레지스트리
+# 객체는 클래스 속성 collision_groups = ('guard', 'enemy') 처럼 소속 그룹을 선언하고,
+# add_object/remove_object 시점에 그룹 멤버 집합에 들어가고 빠집니다.
+collision_groups = {}   # 그룹 이름 -> 비트 (1 << n)
+group_members = {}      # 그룹 이름 -> {obj: None} (삽입 순서를 유지하는 집합)
+_object_masks = {}      # obj -> 소속 그룹 비트마스크
+_occupied_mask = 0      # 멤버가 하나 이상 있는 그룹들의 비트마스크
+
+# 충돌 쌍 디스패치 테이블: 쌍 이름 -> (그룹 a, 그룹 b, 핸들러)
 collision_pairs = {}
+# 지금 호출 중인 충돌 핸들러의 충돌 시각 (틱 안에서 0.0~1.0, 1.0 = 틱 끝). 핸들러 밖에서는 None
+collision_toi = None
+
+# 오브젝트 풀 (클래스 속성 pooled = True 이고 reset(...)을 가진 짧게 사는 객체용)
+# init()/clear()로 월드를 비워도 풀은 유지되어 다음 판에서 재사용됩니다.
+DEFAULT_POOL_CAPACITY = 256
+_pools = {}          # 클래스 -> 재사용 대기 객체 리스트
+pool_capacity = {}   # 클래스 -> 최대 보관 수 (없으면 DEFAULT_POOL_CAPACITY)
+pool_stats = {}      # 클래스 이름 -> {'hits', 'misses', 'released', 'dropped'}
+
+
+# 월드(맵) 범위 (left, bottom, right, top). 맵 밖으로 나간 탄 제거 등에 사용합니다.
+# 모드가 set_world_bounds()로 정하며, None이면 범위 검사를 하지 않습니다.
+world_bounds = None
+
+# 벽 충돌 격자 (collision_map.CollisionMap). 모드가 set_collision_map()으로 정하며, None이면 벽이 없음
+collision_map = None
+
+
+def set_world_bounds(width, height):
+    global world_bounds
+    world_bounds = (0, 0, width, height)
+
+
+def set_collision_map(cmap):
+    global collision_map
+    collision_map = cmap
 
 
 def init():
-    """게임 월드를 초기화하고 레이어를 준비합니다."""
-    global objects
+    """게임 월드를 초기화하고 레이어와 충돌 그룹을 준비합니다."""
+    global objects, camera, collision_map, _occupied_mask
     objects = [[] for _ in range(NUM_LAYERS)]
+    camera = None
+    collision_map = None
+    _slots.clear()
+    _pending_removals.clear()
+    _swept_objects.clear()
+    _prev_bbs.clear()
+    collision_groups.clear()
+    group_members.clear()
+    _object_masks.clear()
+    collision_pairs.clear()
+    _occupied_mask = 0
 
 
 def add_object(obj, layer):
-    """객체를 지정된 레이어에 추가합니다."""
+    """객체를 지정된 레이어에 추가하고 선언된 충돌 그룹에 등록합니다."""
     if layer >= NUM_LAYERS:
         # 레이어 수가 부족하면 확장
         while len(objects) <= layer:
             objects.append([])
+    _slots[obj] = (layer, len(objects[layer]))
     objects[layer].append(obj)
+    _join_groups(obj)
+    if getattr(obj, 'swept_collision', False):
+        _swept_objects[obj] = None
 
 
 def update():
-    """모든 객체의 update() 메서드를 호출합니다."""
-    for layer in objects:
-        for obj in list(layer):
+    """모든 객체의 update() 메서드를 호출하고 충돌 검사를 합니다.
+
+    틱 도중의 remove_object는 대기열에만 쌓이고, 객체 update 직후와 충돌 검사 직후에 반영됩니다.
+    """
+    # 빠른 객체들은 이동 전 AABB를 기록해 두었다가 충돌 검사에서 이동 경로 전체를 검사
+    _prev_bbs.clear()
+    for obj in _swept_objects:
+        _prev_bbs[obj] = obj.get_bb()
+
+    for layer_index, layer in enumerate(objects):
+        t0 = frame_profiler.begin()
+        # 제거가 지연되므로 레이어를 복사하지 않고 순회 (이번 틱에 추가된 객체는 다음 틱부터 update)
+        for i in range(len(layer)):
+            obj = layer[i]
             if hasattr(obj, 'update'):
                 obj.update()
+        frame_profiler.end(('update.layer', layer_index), t0)
+    _flush_removals()
+
     # 간단한 충돌 검사 호출
+    t0 = frame_profiler.begin()
     try:
         check_collisions()
     except Exception as e:
         # print(f"ERROR in check_collisions: {e}", file=sys.stderr)
         pass
+    _flush_removals()
+    frame_profiler.end('collisions', t0)
 
 
 def draw():
-    """모든 객체의 draw() 메서드를 호출합니다."""
-    for layer in objects:
+    """모든 객체의 draw() 메서드를 호출합니다. 카메라가 있으면 화면 밖 객체는 건너뜁니다."""
+    for layer_index in DEPTH_SORTED_LAYERS:
+        if layer_index < len(objects):
+            _depth_sort(layer_index)
+
+    drawn = culled = 0
+    for layer_index, layer in enumerate(objects):
+        t0 = frame_profiler.begin()
         for o in layer:
-            if hasattr(o, 'draw'):
-                o.draw()
+            if not hasattr(o, 'draw'):
+                continue
+            if camera is not None and hasattr(o, 'get_bb') and not camera.is_visible(o.get_bb()):
+                culled += 1
+                continue
+            o.draw()
+            drawn += 1
+        frame_profiler.end(('draw.layer', layer_index), t0)
+    draw_stats['drawn'] = drawn
+    draw_stats['culled'] = culled
+
+
+def _depth_key(obj):
+    """그리기 순서 기준: AABB 아래쪽(발 위치), 없으면 y. 위치가 없는 객체는 맨 뒤(먼저)에 그림."""
+    if hasattr(obj, 'get_bb'):
+        return obj.get_bb()[1]
+    y = getattr(obj, 'y', None)
+    # ProjectileBatch처럼 y가 배열인 객체도 위치가 없는 것으로 취급
+    return y if isinstance(y, (int, float)) else float('inf')
+
+
+def _depth_sort(layer_index):
+    """레이어를 y 내림차순으로 삽입 정렬합니다.
+
+    객체는 프레임마다 조금씩만 움직여 레이어가 거의 정렬된 상태이므로 비용은 O(n + 자리바꿈 수)입니다.
+    같은 y끼리는 기존 순서를 유지합니다.
+    """
+    layer = objects[layer_index]
+    n = len(layer)
+    if n < 2:
+        return
+    keys = [_depth_key(o) for o in layer]
+    first_moved = n
+    for i in range(1, n):
+        key = keys[i]
+        if keys[i - 1] >= key:
+            continue
+        obj = layer[i]
+        j = i - 1
+        while j >= 0 and keys[j] < key:
+            keys[j + 1] = keys[j]
+            layer[j + 1] = layer[j]
+            j -= 1
+        keys[j + 1] = key
+        layer[j + 1] = obj
+        first_moved = min(first_moved, j + 1)
+
+    # 자리가 바뀐 구간만 슬롯 색인 갱신
+    for i in range(first_moved, n):
+        _slots[layer[i]] = (layer_index, i)
+
+
+def set_camera(cam):
+    """화면 변환과 컬링에 사용할 카메라를 등록합니다."""
+    global camera
+    camera = cam
+
+
+def to_screen(x, y):
+    """월드 좌표를 화면 좌표로 변환합니다."""
+    if camera is None:
+        return x, y
+    return camera.to_screen(x, y)
+
+
+def lerp(prev, cur):
+    """직전 틱 값과 현재 값 사이를 game_framework.alpha만큼 보간합니다 (그리기용, NumPy 배열도 됨)."""
+    return prev + (cur - prev) * game_framework.alpha
+
+
+def render_position(obj):
+    """update() 앞에서 prev_x/prev_y를 기록하는 객체를 이번 프레임에 그릴 화면 좌표."""
+    return to_screen(lerp(obj.prev_x, obj.x), lerp(obj.prev_y, obj.y))
 
 
 def clear():
-    """모든 객체를 제거합니다."""
+    """모든 객체를 제거합니다. 풀 대상 객체는 풀로 돌려보냅니다."""
     global objects
     for layer in objects:
+        for obj in layer:
+            if getattr(obj, 'pooled', False):
+                _release(obj)
         layer.clear()
     init()
 
 
 def remove_object(obj):
-    """지정된 객체를 월드에서 제거합니다."""
-    for layer in objects:
-        if obj in layer:
-            layer.remove(obj)
-            return
+    """지정된 객체를 제거 대기열에 넣습니다. 여러 번 불러도 한 번만 제거됩니다."""
+    if obj in _slots:
+        _pending_removals[obj] = None
+
+
+def is_removed(obj):
+    """이번 틱에 제거 대기열에 들어갔거나 월드에 없는 객체면 True (충돌 처리에서 건너뛸 때 사용)."""
+    return obj in _pending_removals or obj not in _slots
+
+
+def _flush_removals():
+    """제거 대기열의 객체들을 레이어와 충돌 그룹에서 실제로 뺍니다."""
+    if not _pending_removals:
+        return
+    pending = list(_pending_removals)
+    _pending_removals.clear()
+    holes = set()
+    for obj in pending:
+        layer_index = _remove_now(obj)
+        if layer_index is not None and layer_index not in DEPTH_SORTED_LAYERS:
+            holes.add(layer_index)
+    for layer_index in holes:
+        _compact(layer_index)
+
+
+def _remove_now(obj):
+    """객체를 레이어에서 빼고 레이어 번호를 돌려줍니다.
+
+    그리기 전에 다시 정렬하는 레이어는 마지막 객체를 빈 자리로 옮겨 O(1)에 제거하고,
+    나머지 레이어는 추가된 순서가 곧 그리는 순서이므로 자리만 비워 두었다가 _compact()로 한 번에 당깁니다.
+    """
+    slot = _slots.pop(obj, None)
+    if slot is None:
+        return None
+    layer_index, i = slot
+    layer = objects[layer_index]
+    if layer_index in DEPTH_SORTED_LAYERS:
+        last = layer.pop()
+        if last is not obj:
+            layer[i] = last
+            _slots[last] = (layer_index, i)
+    else:
+        layer[i] = None
+    _leave_groups(obj)
+    _swept_objects.pop(obj, None)
+    if getattr(obj, 'pooled', False):
+        _release(obj)
+    return layer_index
+
+
+def _compact(layer_index):
+    """빈 자리(None)를 순서를 유지한 채 당기고 슬롯 색인을 고칩니다. O(n), 틱마다 최대 한 번."""
+    layer = objects[layer_index]
+    write = 0
+    for obj in layer:
+        if obj is None:
+            continue
+        if layer[write] is not obj:
+            layer[write] = obj
+            _slots[obj] = (layer_index, write)
+        write += 1
+    del layer[write:]
 
-    # 충돌 쌍에서도 제거 (선택 사항, 충돌 로직 복잡성에 따라 다름)
-    for name, pair in list(collision_pairs.items()):
-        if obj in pair:
-            del collision_pairs[name]
-            return
 
+# =========================================================================
+# 오브젝트 풀
+# =========================================================================
+
+def _stats_for(cls):
+    name = cls.__name__
+    if name not in pool_stats:
+        pool_stats[name] = {'hits': 0, 'misses': 0, 'released': 0, 'dropped': 0}
+    return pool_stats[name]
+
+
+def set_pool_capacity(cls, capacity):
+    """클래스별로 풀에 보관할 최대 객체 수를 정합니다."""
+    pool_capacity[cls] = capacity
+    pool = _pools.get(cls)
+    if pool is not None and len(pool) > capacity:
+        del pool[capacity:]
+
+
+def spawn(cls, layer, *args, **kwargs):
+    """풀에 남는 객체가 있으면 reset(...)해서 재사용하고, 없으면 새로 만들어 레이어에 추가합니다."""
+    stats = _stats_for(cls)
+    pool = _pools.get(cls)
+    if pool:
+        obj = pool.pop()
+        obj.reset(*args, **kwargs)
+        stats['hits'] += 1
+    else:
+        obj = cls(*args, **kwargs)
+        stats['misses'] += 1
+    add_object(obj, layer)
+    return obj
+
+
+def _release(obj):
+    """월드에서 빠진 객체를 용량이 허락하는 만큼 풀에 보관합니다."""
+    cls = type(obj)
+    stats = _stats_for(cls)
+    pool = _pools.setdefault(cls, [])
+    if len(pool) < pool_capacity.get(cls, DEFAULT_POOL_CAPACITY):
+        pool.append(obj)
+        stats['released'] += 1
+    else:
+        stats['dropped'] += 1
+
+
+def pool_report():
+    """클래스별 풀 통계와 현재 보관 중인 객체 수를 돌려줍니다."""
+    sizes = {cls.__name__: len(pool) for cls, pool in _pools.items()}
+    return {name: dict(stats, pooled=sizes.get(name, 0)) for name, stats in pool_stats.items()}
+
+
+# =========================================================================
+# 충돌 그룹 / 충돌 쌍 레지스트리
+# =========================================================================
 
-def add_collision_pair(a, b, group_name):
-    """충돌 쌍을 추가합니다."""
-    collision_pairs[group_name] = (a, b)
+def add_collision_group(name):
+    """충돌 그룹을 등록하고 그룹 비트를 반환합니다. 이미 있으면 기존 비트를 반환합니다."""
+    if name not in collision_groups:
+        collision_groups[name] = 1 << len(collision_groups)
+        group_members[name] = {}
+    return collision_groups[name]
+
+
+def _join_groups(obj):
+    """객체가 선언한 충돌 그룹들에 객체를 등록합니다."""
+    global _occupied_mask
+    mask = 0
+    for name in getattr(obj, 'collision_groups', ()):
+        bit = add_collision_group(name)
+        group_members[name][obj] = None
+        mask |= bit
+    if mask:
+        _object_masks[obj] = mask
+        _occupied_mask |= mask
+
+
+def _leave_groups(obj):
+    """객체를 소속된 모든 충돌 그룹에서 뺍니다."""
+    global _occupied_mask
+    mask = _object_masks.pop(obj, 0)
+    if not mask:
+        return
+    for name, bit in collision_groups.items():
+        if mask & bit:
+            members = group_members[name]
+            members.pop(obj, None)
+            if not members:
+                _occupied_mask &= ~bit
+
+
+def in_group(obj, name):
+    """객체가 해당 충돌 그룹에 속해 있는지 확인합니다."""
+    return bool(_object_masks.get(obj, 0) & collision_groups.get(name, 0))
+
+
+def _notify_both(group, a, b):
+    """기본 충돌 핸들러: 양쪽 객체의 handle_collision(group, other)를 호출합니다."""
+    if hasattr(a, 'handle_collision'):
+        a.handle_collision(group, b)
+    if hasattr(b, 'handle_collision'):
+        b.handle_collision(group, a)
+
+
+def add_collision_pair(a, b, group_name, handler=None):
+    """그룹 a와 그룹 b 사이의 충돌 쌍을 등록합니다.
+
+    handler(group_name, obj_a, obj_b)를 주지 않으면 양쪽 객체의 handle_collision이 호출됩니다.
+    핸들러가 불리는 동안 game_world.collision_toi에 이번 틱 안에서 닿은 시각(0.0~1.0)이 들어 있습니다.
+    빠른 객체(swept_collision)는 이동 경로에서 처음 닿은 비율이고, 둘 다 느린 객체면 1.0 (틱 끝의 겹침)입니다.
+    닿은 위치는 prev + (현재 - prev) * collision_toi 로 구할 수 있습니다.
+    """
+    add_collision_group(a)
+    add_collision_group(b)
+    collision_pairs[group_name] = (a, b, handler or _notify_both)
 
 
 def all_objects():
@@ -89,98 +420,156 @@ def aabb(obj):
 
 
 # =========================================================================
-# 충돌 처리 관련 함수 (기존 코드에서 그대로 유지)
+# 브로드페이즈: 균등 격자(공간 해시)
 # =========================================================================
 
-def check_collisions():
-    """간단한 AABB 충돌 검사를 수행하고 on_collision/handle_collision을 호출합니다."""
-    all_objs = list(all_objects())
-
-    # 기존 projectile/enemy/boy, Ball-Guard 충돌 로직 그대로 유지
-    projectiles = [o for o in all_objs if o.__class__.__name__.lower() == 'projectile']
-    enemies = [o for o in all_objs if o.__class__.__name__.lower() in ('bat', 'guard')]
-    boys = [o for o in all_objs if o.__class__.__name__.lower() == 'boy']
-
-    # projectile -> enemy
-    for p in projectiles:
-        p_bb = aabb(p)
-        if p_bb is None:
+# 격자 한 칸의 크기 (픽셀). Guard(96px) 정도의 박스가 2~4칸에 걸치도록 잡음
+CELL_SIZE = 128
+
+# 이번 틱에 계산한 AABB 캐시 (obj -> bb). check_collisions 시작 시 비움
+# 빠른 객체는 이동 전/후 박스를 합친 스윕 박스가 들어감
+_bb_cache = {}
+# 빠른 객체의 (이동 전 bb, 이동 후 bb)
+_motions = {}
+
+
+def _cached_bb(obj):
+    """이번 틱에서 객체의 AABB(빠른 객체는 스윕 박스)를 한 번만 계산해서 재사용합니다."""
+    if obj in _bb_cache:
+        return _bb_cache[obj]
+    bb = aabb(obj)
+    prev = _prev_bbs.get(obj)
+    if bb is not None and prev is not None:
+        _motions[obj] = (prev, bb)
+        bb = (min(prev[0], bb[0]), min(prev[1], bb[1]),
+              max(prev[2], bb[2]), max(prev[3], bb[3]))
+    _bb_cache[obj] = bb
+    return bb
+
+
+def _sweep_axis(a1, a2, b1, b2, d):
+    """한 축에서 [a1, a2]가 d만큼 움직일 때 [b1, b2]와 겹치는 시간 구간을 돌려줍니다."""
+    if d == 0:
+        if a2 < b1 or a1 > b2:
+            return None
+        return float('-inf'), float('inf')
+    if d > 0:
+        return (b1 - a2) / d, (b2 - a1) / d
+    return (b2 - a1) / d, (b1 - a2) / d
+
+
+def swept_aabb(a_prev, a_cur, b_prev, b_cur):
+    """두 박스가 틱 동안 선형으로 움직였다고 보고 처음 닿는 시각(0~1)을 돌려줍니다. 닿지 않으면 None."""
+    # b를 기준으로 한 a의 상대 이동량
+    dx = (a_cur[0] - a_prev[0]) - (b_cur[0] - b_prev[0])
+    dy = (a_cur[1] - a_prev[1]) - (b_cur[1] - b_prev[1])
+
+    x_span = _sweep_axis(a_prev[0], a_prev[2], b_prev[0], b_prev[2], dx)
+    if x_span is None:
+        return None
+    y_span = _sweep_axis(a_prev[1], a_prev[3], b_prev[1], b_prev[3], dy)
+    if y_span is None:
+        return None
+
+    t_first = max(x_span[0], y_span[0], 0.0)
+    t_last = min(x_span[1], y_span[1], 1.0)
+    if t_first > t_last:
+        return None
+    return t_first
+
+
+def _cells(bb):
+    """AABB가 걸치는 격자 칸 좌표들을 돌려줍니다."""
+    x1, y1, x2, y2 = bb
+    cx1, cx2 = int(x1 // CELL_SIZE), int(x2 // CELL_SIZE)
+    cy1, cy2 = int(y1 // CELL_SIZE), int(y2 // CELL_SIZE)
+    for cx in range(cx1, cx2 + 1):
+        for cy in range(cy1, cy2 + 1):
+            yield cx, cy
+
+
+def _build_grid(objs):
+    """objs의 인덱스를 AABB가 걸치는 격자 칸마다 등록합니다."""
+    grid = {}
+    for i, o in enumerate(objs):
+        bb = _cached_bb(o)
+        if bb is None:
             continue
-        for e in enemies:
-            e_bb = aabb(e)
-            if e_bb is None:
-                continue
-            # overlap?
-            px1, py1, px2, py2 = p_bb
-            ex1, ey1, ex2, ey2 = e_bb
-            if not (px2 < ex1 or px1 > ex2 or py2 < ey1 or py1 > ey2):
-                try:
-                    if hasattr(p, 'on_collision'):
-                        p.on_collision(e)
-                except Exception:
-                    pass
-
-    # enemy -> boy
-    for e in enemies:
-        e_bb = aabb(e)
-        if e_bb is None:
+        for cell in _cells(bb):
+            grid.setdefault(cell, []).append(i)
+    return grid
+
+
+def _overlapping_pairs(group_a, group_b):
+    """group_a x group_b 중 틱 동안 닿은 쌍을 (a, b, 충돌 시각)으로 돌려줍니다.
+
+    같은 칸을 공유하는 쌍만 검사하며, 결과는 a 순서대로이고 a 하나의 상대들은 먼저 닿은 것부터입니다
+    (빠른 공이 한 틱에 적 둘을 지나가면 앞에 있는 적이 먼저 맞고, 공이 제거되면 뒤의 적은 맞지 않음).
+    둘 다 느린 객체면 틱 끝 위치의 겹침만 보고(시각 1.0), 한쪽이라도 빠른 객체면 스윕 검사를 합니다.
+    """
+    if not group_a or not group_b:
+        return
+    grid = _build_grid(group_b)
+    for a in group_a:
+        a_bb = _cached_bb(a)
+        if a_bb is None:
             continue
-        for b in boys:
-            b_bb = aabb(b)
-            if b_bb is None:
-                continue
-            ex1, ey1, ex2, ey2 = e_bb
-            bx1, by1, bx2, by2 = b_bb
-            if not (ex2 < bx1 or ex1 > bx2 or ey2 < by1 or ey1 > by2):
-                try:
-                    if hasattr(e, 'handle_collision'):
-                        e.handle_collision(b)
-                    if hasattr(b, 'handle_collision'):
-                        b.handle_collision(e)
-                except Exception:
-                    pass
-
-    # Ball -> Guard 충돌 (Ratking이 쏜 공이 경비에게 맞는 경우)
-    from ball import Ball
-    balls = [o for o in all_objs if isinstance(o, Ball)]
-    guards = [o for o in all_objs if o.__class__.__name__.lower() == 'guard']
-
-    for b in balls:
-        b_bb = aabb(b)
-        if b_bb is None:
+        candidates = set()
+        for cell in _cells(a_bb):
+            candidates.update(grid.get(cell, ()))
+        if not candidates:
             continue
-        bx1, by1, bx2, by2 = b_bb
-        for g in guards:
-            g_bb = aabb(g)
-            if g_bb is None:
+        ax1, ay1, ax2, ay2 = a_bb
+        a_motion = _motions.get(a)
+        hits = []
+        for j in sorted(candidates):
+            b = group_b[j]
+            bx1, by1, bx2, by2 = _bb_cache[b]
+            # 경계가 맞닿는 경우도 충돌로 봄 (기존 검사와 동일)
+            if ax2 < bx1 or ax1 > bx2 or ay2 < by1 or ay1 > by2:
                 continue
-            gx1, gy1, gx2, gy2 = g_bb
-            if not (bx2 < gx1 or bx1 > gx2 or by2 < gy1 or by1 > gy2):
-                try:
-                    if hasattr(g, 'handle_collision'):
-                        g.handle_collision(b)
-                except Exception:
-                    pass
-
-    # Guard -> Ratking 충돌 (경비가 Ratking을 잡으면 게임 종료)
-    ratkings = [o for o in all_objs if o.__class__.__name__.lower() == 'ratking']
-
-    for g in guards:
-        g_bb = aabb(g)
-        if g_bb is None:
+            b_motion = _motions.get(b)
+            if a_motion is None and b_motion is None:
+                hits.append((1.0, b))
+                continue
+            a_prev, a_cur = a_motion or (a_bb, a_bb)
+            b_prev, b_cur = b_motion or (_bb_cache[b], _bb_cache[b])
+            toi = swept_aabb(a_prev, a_cur, b_prev, b_cur)
+            if toi is not None:
+                hits.append((toi, b))
+        # 같은 시각끼리는 등록 순서 유지 (안정 정렬)
+        hits.sort(key=lambda hit: hit[0])
+        for toi, b in hits:
+            yield a, b, toi
+
+
+# =========================================================================
+# 충돌 처리 관련 함수
+# =========================================================================
+
+def check_collisions():
+    """등록된 충돌 쌍마다 공간 해시로 후보를 추린 뒤 AABB(스윕) 충돌 검사를 하고 핸들러를 호출합니다."""
+    global collision_toi
+    _bb_cache.clear()
+    _motions.clear()
+
+    for group, (a, b, handler) in list(collision_pairs.items()):
+        pair_mask = collision_groups[a] | collision_groups[b]
+        # 어느 한쪽 그룹이라도 비어 있으면 건너뜀
+        if _occupied_mask & pair_mask != pair_mask:
             continue
-        gx1, gy1, gx2, gy2 = g_bb
-        for rk in ratkings:
-            rk_bb = aabb(rk) if hasattr(rk, 'get_bb') else None
-            # Ratking에 get_bb가 없다면 간단히 화면 좌표 기준으로 박스를 만들어 사용
-            if rk_bb is None:
-                half_w, half_h = 16 * 2, 16 * 2  # Ratking SCALE=4.0 기준 대략적인 크기
-                rk_bb = (rk.x - half_w, rk.y - half_h, rk.x + half_w, rk.y + half_h)
-
-            rx1, ry1, rx2, ry2 = rk_bb
-            if not (gx2 < rx1 or gx1 > rx2 or gy2 < ry1 or gy1 > ry2):
-                # 충돌 발생: Guard가 Ratking을 잡은 것으로 간주하고 게임 종료
-                print("[Collision] Guard caught Ratking -> quit game")
-                game_framework.quit()
-
-    # ...existing other collision logic...
+
+        # 제거는 지연되지만 핸들러 안에서 add_object가 불릴 수 있으므로 멤버 목록을 고정해서 순회
+        group_a = list(group_members[a])
+        group_b = list(group_members[b])
+        for obj_a, obj_b, toi in _overlapping_pairs(group_a, group_b):
+            # 앞선 충돌로 이미 제거 대기 중인 객체는 이번 검사에서 더 맞지 않음
+            if obj_a is obj_b or obj_a in _pending_removals or obj_b in _pending_removals:
+                continue
+            collision_toi = toi
+            try:
+                handler(group, obj_a, obj_b)
+            except Exception:
+                pass
+            finally:
+                collision_toi = None
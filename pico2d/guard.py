@@ -2,8 +2,15 @@ from pico2d import *
 import math
 import game_framework
 import game_world
-
-# 스프라이트 한 칸 크기
+import resources
+import atlas
+import asset_manifest
+import sound
+import pathfinding
+import os
+
+# 화면에 그리는 크기와 충돌 박스의 기준 크기
+# (스프라이트 시트의 실제 칸 크기는 asset_manifest에서 가져옴)
 CLIP_W, CLIP_H = 32, 32
 
 # 확대 비율
@@ -11,6 +18,9 @@ SCALE = 3.0
 TARGET_W = int(CLIP_W * SCALE)
 TARGET_H = int(CLIP_H * SCALE)
 
+# 벽과 부딪히는 발밑 박스의 반 크기. 그림(96px)보다 작아야 타일 한 칸(48px) 폭의 문/통로를 지나감
+FOOT_HALF = 20
+
 # 애니메이션 및 이동 속도
 MOVE_SPEED = 100
 ANIM_FPS = 6
@@ -20,26 +30,55 @@ ANIM_FPS = 6
 #  SpriteSheet 클래스 (파일 통합)
 # ============================================
 class SpriteSheet:
-    def __init__(self, filename, frame_w, frame_h, rows=1, cols=1):
-        self.image = load_image(filename)
+    def __init__(self, filename, frame_w=None, frame_h=None, rows=1, cols=1, frames=None):
+        # 칸 크기를 주지 않으면 asset_manifest가 이미지 크기로 정한 칸 구성을 사용
+        if frame_w is None or frame_h is None:
+            geometry = asset_manifest.grid(filename)
+            if geometry is None:
+                raise IOError(f'cannot load {filename}')
+            frame_w, frame_h, rows, cols, frames = geometry
         self.frame_w = frame_w
         self.frame_h = frame_h
         self.rows = rows
         self.cols = cols
 
-        self.frames = rows * cols
+        self.frames = frames if frames is not None else rows * cols
+
+        # 아틀라스에 같은 칸 구성으로 구워져 있으면 그 프레임으로 그림 (반전 프레임 포함)
+        source = os.path.splitext(os.path.basename(filename))[0]
+        grid = (frame_w, frame_h, rows, cols)
+        self.atlas_frames = atlas.sheet_frames(source, grid)
+        self.atlas_frames_h = atlas.sheet_frames(source, grid, mirrored=True)
+
+        # 아틀라스만으로 다 그릴 수 있으면 원본 텍스처는 로드하지 않음
+        if self.atlas_frames is not None and self.atlas_frames_h is not None:
+            self.image = None
+        else:
+            self.image = resources.image(filename)
 
     def draw_frame(self, index, x, y, w=None, h=None, flip=False):
         if index < 0 or index >= self.frames:
             return
 
-        col = index % self.cols
-        row = index // self.cols
+        if self.atlas_frames is not None:
+            if flip and self.atlas_frames_h is not None:
+                image, sx, sy, sw, sh = self.atlas_frames_h[index]
+                x, w = self._fit(sw, x, w, flip)
+                image.clip_draw(sx, sy, sw, sh, x, y, w, h)
+            elif flip:
+                image, sx, sy, sw, sh = self.atlas_frames[index]
+                x, w = self._fit(sw, x, w, flip)
+                image.clip_composite_draw(sx, sy, sw, sh, 0, 'h', x, y, w, h)
+            else:
+                image, sx, sy, sw, sh = self.atlas_frames[index]
+                x, w = self._fit(sw, x, w, flip)
+                image.clip_draw(sx, sy, sw, sh, x, y, w, h)
+            return
 
-        sx = col * self.frame_w
-        sy = (self.rows - 1 - row) * self.frame_h   # 상단 기준이라 이렇게 계산
-        sw = self.frame_w
-        sh = self.frame_h
+        # 상단 기준 칸 번호를 clip_draw 좌표로 (이미지 밖으로 나가는 마지막 칸은 잘라냄)
+        grid = (self.frame_w, self.frame_h, self.rows, self.cols)
+        sx, sy, sw, sh = asset_manifest.frame_rect(grid, index, self.image.w or None, self.image.h or None)
+        x, w = self._fit(sw, x, w, flip)
 
         if flip:
             self.image.clip_composite_draw(
@@ -50,14 +89,47 @@ class SpriteSheet:
                 sx, sy, sw, sh, x, y, w, h
             )
 
+    def _fit(self, sw, x, w, flip):
+        """frame_w보다 좁게 잘린 칸은 그 비율만큼 좁게, 칸의 왼쪽 끝(반전이면 오른쪽 끝)에 맞춰 그립니다."""
+        if w is None or sw == self.frame_w:
+            return x, w
+        fitted = w * sw / self.frame_w
+        shift = (w - fitted) / 2
+        return (x + shift if flip else x - shift), fitted
+
+    def release(self):
+        resources.release(self.image)
+        self.image = None
+        self.atlas_frames = self.atlas_frames_h = None
+
 
 # ============================================
 #  Guard 클래스
 # ============================================
 class Guard:
+    collision_groups = ('guard', 'enemy')
+    sheet = None
+
+    @classmethod
+    def prepare_sheet(cls):
+        """guard.png 시트를 한 번만 로드해서 모든 Guard가 공유합니다."""
+        if cls.sheet is None:
+            # 칸 구성(17x18, 6프레임)은 asset_manifest에서 가져옴
+            cls.sheet = SpriteSheet('assets/guard.png')
+        return cls.sheet
+
+    @classmethod
+    def release_sheet(cls):
+        """prepare_sheet()로 잡은 시트 참조를 돌려줍니다. 다음 prepare_sheet()가 다시 가져옵니다."""
+        if cls.sheet is not None:
+            cls.sheet.release()
+            cls.sheet = None
+
     def __init__(self, x=400, y=400, target=None):
         self.x = x
         self.y = y
+        # 직전 틱 위치 (그릴 때 game_framework.alpha로 보간)
+        self.prev_x, self.prev_y = x, y
         self.frame = 0.0
         self.dir = -1  # 기본 왼쪽
 
@@ -65,34 +137,31 @@ class Guard:
         self.max_hp = 2
         self.hp = self.max_hp
 
-        self.frames_count = 6  # guard.png는 6프레임
-
-        # SpriteSheet 로드
-        try:
-            self.sheet = SpriteSheet(
-                'assets/guard.png',
-                CLIP_W, CLIP_H,
-                rows=1, cols=6
-            )
-        except:
-            self.sheet = SpriteSheet(
-                'guard.png',
-                CLIP_W, CLIP_H,
-                rows=1, cols=6
-            )
+        # SpriteSheet 로드 (클래스 단위로 한 번만)
+        self.sheet = Guard.prepare_sheet()
+        self.frames_count = self.sheet.frames
 
     def get_bb(self):
         return (self.x - TARGET_W // 2, self.y - TARGET_H // 2,
                 self.x + TARGET_W // 2, self.y + TARGET_H // 2)
 
+    def take_damage(self, dmg):
+        self.hp -= dmg
+        print(f"[Guard] Hit! HP = {self.hp}")
+        sound.play('hit')
+
     def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+
         # 1. 애니메이션
         self.frame = (self.frame + ANIM_FPS * game_framework.frame_time) % self.frames_count
 
         # 2. 추적 AI
         if self.target:
-            dx = self.target.x - self.x
-            dy = self.target.y - self.y
+            # 벽이 있으면 공용 흐름장이 알려주는 다음 칸으로, 목표와 같은 칸이면 직진
+            goal_x, goal_y = pathfinding.next_waypoint(self.x, self.y) or (self.target.x, self.target.y)
+            dx = goal_x - self.x
+            dy = goal_y - self.y
             dist_sq = dx*dx + dy*dy
 
             if dist_sq > 0:
@@ -100,28 +169,35 @@ class Guard:
                 dir_x = dx / dist
                 dir_y = dy / dist
 
-                self.x += dir_x * MOVE_SPEED * game_framework.frame_time
-                self.y += dir_y * MOVE_SPEED * game_framework.frame_time
+                move_x = dir_x * MOVE_SPEED * game_framework.frame_time
+                move_y = dir_y * MOVE_SPEED * game_framework.frame_time
+                # 벽이 있으면 벽 바로 앞까지만 (벽을 따라 미끄러짐)
+                cmap = game_world.collision_map
+                if cmap is not None:
+                    foot = (self.x - FOOT_HALF, self.y - FOOT_HALF, self.x + FOOT_HALF, self.y + FOOT_HALF)
+                    move_x, move_y = cmap.sweep(foot, move_x, move_y)
+                self.x += move_x
+                self.y += move_y
 
                 self.dir = 1 if dir_x > 0 else -1
 
         # 3. 체력 0 → 제거
         if self.hp <= 0:
             print("[Guard] Dead")
+            sound.play('death')
             game_world.remove_object(self)
 
     def draw(self):
         idx = int(self.frame)
+        sx, sy = game_world.render_position(self)
         self.sheet.draw_frame(
             idx,
-            self.x, self.y,
+            sx, sy,
             TARGET_W, TARGET_H,
             flip=(self.dir < 0)
         )
 
-    def handle_collision(self, other):
-        from ball import Ball
-        if isinstance(other, Ball):
-            self.hp -= 1
-            print(f"[Guard] Hit! HP = {self.hp}")
+    def handle_collision(self, group, other):
+        if group == 'ball:guard':
+            self.take_damage(1)
             game_world.remove_object(other)
@@ -0,0 +1,211 @@
+# headless.py
+# 창 없이 게임 루프를 돌리기 위한 가짜(null) pico2d 백엔드
+# (소크 테스트, 봇, 빌드 서버 벤치마크용)
+#
+# 사용법: 게임 모듈을 import 하기 *전에* install()을 호출해야 합니다.
+#     import headless
+#     headless.install()
+#     import game_framework, play_mode
+#     game_framework.run_headless(play_mode, 10000)
+
+import os
+import struct
+import sys
+import time
+import types
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+
+# 봇/테스트가 넣어 둔 입력 이벤트 (get_events()가 한꺼번에 꺼내감)
+_event_queue = []
+
+# SDL2 이벤트 타입 / 키 코드 (게임 코드가 쓰는 것만)
+SDL_QUIT = 0x100
+SDL_WINDOWEVENT = 0x200
+SDL_KEYDOWN = 0x300
+SDL_KEYUP = 0x301
+SDL_MOUSEMOTION = 0x400
+SDL_MOUSEBUTTONDOWN = 0x401
+SDL_MOUSEBUTTONUP = 0x402
+SDL_MOUSEWHEEL = 0x403
+
+_KEYS = {
+    'SDLK_RETURN': 13, 'SDLK_ESCAPE': 27, 'SDLK_BACKSPACE': 8, 'SDLK_TAB': 9, 'SDLK_SPACE': 32,
+    'SDLK_RIGHT': 1073741903, 'SDLK_LEFT': 1073741904,
+    'SDLK_DOWN': 1073741905, 'SDLK_UP': 1073741906,
+}
+_KEYS.update({f'SDLK_{chr(c)}': c for c in range(ord('a'), ord('z') + 1)})
+_KEYS.update({f'SDLK_{d}': ord(str(d)) for d in range(10)})
+_KEYS.update({f'SDLK_F{n}': 1073741881 + n for n in range(1, 13)})
+
+
+class Event:
+    def __init__(self, event_type, key=None, x=0, y=0, button=0, mod=0):
+        self.type = event_type
+        self.key = key
+        self.x, self.y = x, y
+        self.button = button
+        self.mod = mod
+
+
+def post_event(event_type, key=None, **kwargs):
+    """다음 get_events() 호출에서 돌려줄 입력 이벤트를 넣습니다 (봇/테스트용)."""
+    event = Event(event_type, key, **kwargs)
+    _event_queue.append(event)
+    return event
+
+
+def _png_size(path):
+    """PNG 헤더만 읽어서 (w, h)를 돌려줍니다. PNG가 아니면 (0, 0)."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(24)
+        if head[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', head[16:24])
+    except OSError:
+        pass
+    return 0, 0
+
+
+class NullImage:
+    """그리기 호출을 모두 무시하는 이미지. 크기(w, h)는 헤더에서 읽습니다."""
+
+    def __init__(self, w=0, h=0):
+        self.w, self.h = w, h
+
+    def draw(self, *args, **kwargs):
+        pass
+
+    def clip_draw(self, *args, **kwargs):
+        pass
+
+    def composite_draw(self, *args, **kwargs):
+        pass
+
+    def clip_composite_draw(self, *args, **kwargs):
+        pass
+
+    def draw_to_origin(self, *args, **kwargs):
+        pass
+
+    def clip_draw_to_origin(self, *args, **kwargs):
+        pass
+
+    def opacify(self, o):
+        pass
+
+
+class NullFont:
+    def draw(self, *args, **kwargs):
+        pass
+
+
+class NullSound:
+    def __init__(self):
+        self.volume = 128
+
+    def set_volume(self, v):
+        self.volume = v
+
+    def get_volume(self):
+        return self.volume
+
+    def play(self, n=1):
+        pass
+
+    def repeat_play(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def _check_exists(name):
+    # 실제 pico2d처럼 파일이 없으면 실패해야 폴백 경로가 그대로 동작함
+    if not os.path.exists(name):
+        raise IOError(f'cannot load {name}')
+
+
+def load_image(name):
+    _check_exists(name)
+    return NullImage(*_png_size(name))
+
+
+def load_font(name, size=20):
+    _check_exists(name)
+    return NullFont()
+
+
+def load_wav(name):
+    _check_exists(name)
+    return NullSound()
+
+
+def load_music(name):
+    _check_exists(name)
+    return NullSound()
+
+
+def get_events():
+    events = list(_event_queue)
+    _event_queue.clear()
+    return events
+
+
+_start_time = time.perf_counter()
+
+
+def get_time():
+    return time.perf_counter() - _start_time
+
+
+def get_canvas_width():
+    return CANVAS_WIDTH
+
+
+def get_canvas_height():
+    return CANVAS_HEIGHT
+
+
+def clamp(minimum, x, maximum):
+    return max(minimum, min(x, maximum))
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def install():
+    """가짜 pico2d 모듈을 sys.modules에 등록합니다. 이미 진짜 pico2d가 로드되었으면 실패합니다."""
+    current = sys.modules.get('pico2d')
+    if current is not None:
+        if getattr(current, 'HEADLESS', False):
+            return current
+        raise RuntimeError('headless.install()은 pico2d를 import 하기 전에 호출해야 합니다.')
+
+    module = types.ModuleType('pico2d')
+    module.HEADLESS = True
+    names = {
+        'SDL_QUIT': SDL_QUIT, 'SDL_WINDOWEVENT': SDL_WINDOWEVENT,
+        'SDL_KEYDOWN': SDL_KEYDOWN, 'SDL_KEYUP': SDL_KEYUP,
+        'SDL_MOUSEMOTION': SDL_MOUSEMOTION, 'SDL_MOUSEBUTTONDOWN': SDL_MOUSEBUTTONDOWN,
+        'SDL_MOUSEBUTTONUP': SDL_MOUSEBUTTONUP, 'SDL_MOUSEWHEEL': SDL_MOUSEWHEEL,
+        'Image': NullImage, 'Font': NullFont,
+        'load_image': load_image, 'load_font': load_font,
+        'load_wav': load_wav, 'load_music': load_music,
+        'get_events': get_events, 'get_time': get_time,
+        'get_canvas_width': get_canvas_width, 'get_canvas_height': get_canvas_height,
+        'clamp': clamp,
+    }
+    names.update(_KEYS)
+    for name in ('open_canvas', 'close_canvas', 'clear_canvas', 'update_canvas',
+                 'clear_canvas_now', 'show_cursor', 'hide_cursor', 'show_lattice', 'hide_lattice',
+                 'draw_rectangle', 'draw_line', 'draw_point', 'delay'):
+        names[name] = _noop
+    for name, value in names.items():
+        setattr(module, name, value)
+    module.__all__ = list(names)
+
+    sys.modules['pico2d'] = module
+    return module
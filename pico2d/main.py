@@ -1,9 +1,41 @@
 # 필요한 모듈 임포트
-import game_framework
 import os
 import sys  # sys 모듈 임포트
+
+# --- [헤드리스 실행 옵션] ---
+# python main.py --headless 10000 [--dt 0.016]
+#   창 없이 PlayMode를 10000틱 돌리고 초당 틱 수를 출력 (그리기/에셋 로드는 no-op)
+# 가짜 pico2d는 다른 게임 모듈보다 먼저 설치해야 하므로 import 전에 인자를 확인합니다.
+HEADLESS_TICKS = None
+HEADLESS_DT = 1.0 / 60.0
+# python main.py --startup-trace
+#   첫 화면이 뜰 때까지 모듈별 import 시간, 에셋별 로드 시간을 출력
+STARTUP_TRACE = '--startup-trace' in sys.argv
+try:
+    if '--headless' in sys.argv:
+        HEADLESS_TICKS = int(sys.argv[sys.argv.index('--headless') + 1])
+    if '--dt' in sys.argv:
+        HEADLESS_DT = float(sys.argv[sys.argv.index('--dt') + 1])
+except (IndexError, ValueError):
+    print("사용법: python main.py --headless <틱 수> [--dt <초>]")
+    sys.exit(2)
+
+if HEADLESS_TICKS is not None:
+    import headless
+    headless.install()
+
+if STARTUP_TRACE:
+    import startup_trace
+    startup_trace.install()
+# --------------------------------
+
+import game_framework
 from pico2d import *
-import title_mode  # title_mode 임포트
+import text_cache
+import title_mode  # title_mode 임포트 (play_mode는 첫 화면 뒤에 title_mode가 미리 읽음)
+
+if STARTUP_TRACE:
+    game_framework.after_first_frame(startup_trace.first_frame)
 
 # --- [경로 설정 수정된 부분] ---
 try:
@@ -16,20 +48,30 @@ except Exception as e:
     # 경로 설정 실패 시 게임 실행을 중단하지 않도록 print만 사용합니다.
 # --------------------------------
 
+if HEADLESS_TICKS is not None:
+    # 타이틀은 입력을 기다리므로 바로 PlayMode로 시작
+    import play_mode
+    game_framework.run_headless(play_mode, HEADLESS_TICKS, HEADLESS_DT)
+    sys.exit(0)
+
 open_canvas(800, 600)
 try:
     hide_cursor()
 except Exception:
     pass
 
+# 시뮬레이션 고정 간격 (초). None으로 두면 실제 프레임 시간을 그대로 사용
+FIXED_TIMESTEP = 1.0 / 60.0
+
 # 디버그: 바로 PlayMode로 시작(타이틀 건너띔)
 # 기존: game_framework.run(play_mode)
 # 이제는 타이틀 모드에서 시작
 try:
-    game_framework.run(title_mode)
+    game_framework.run(title_mode, FIXED_TIMESTEP)
 finally:
-    # 게임 종료 후 캔버스 닫기(예외 발생 시에도 실행)
+    # 모든 모드가 끝난 뒤 공용 텍스트 텍스처/폰트 참조를 돌려주고 캔버스 닫기(예외 발생 시에도 실행)
+    text_cache.clear()
     try:
         close_canvas()
     except Exception:
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,200 @@
+# pathfinding.py
+# 추적하는 적들이 함께 쓰는 흐름장(flow field) 길찾기
+#
+# 적마다 A*를 돌리면 적 수만큼 비용이 늘어나므로, 목표(플레이어)가 있는 칸에서 거꾸로
+# 다익스트라를 한 번 돌려 모든 칸의 "다음에 갈 칸"을 구해 둡니다 (흐름장).
+# 목표가 다른 칸으로 옮겨가거나 벽이 바뀔 때만 다시 계산하고, 적은 next_waypoint()로 꺼내 쓰기만 합니다.
+#
+#     pathfinding.update(ratking)                     # 틱마다 한 번 (play_mode.update)
+#     waypoint = pathfinding.next_waypoint(x, y)      # 다음 칸 중심 (월드 좌표). None이면 목표로 직진
+#
+# 한 번만 필요한 길은 find_path()로 A*를 씁니다 (이웃 목록은 흐름장과 같은 캐시를 씀).
+# 격자는 game_world.collision_map (collision_map.CollisionMap)을 그대로 씁니다. 없으면 아무것도 하지 않습니다.
+
+from array import array
+import heapq
+import math
+import time
+
+import frame_profiler
+import game_world
+
+DIAGONAL_COST = math.sqrt(2)
+UNREACHABLE = math.inf
+
+# 8방향 (dc, dr, 비용)
+_DIRECTIONS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+               (1, 1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST),
+               (1, -1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST))
+
+# 이웃 목록 캐시: (격자, 격자 version) -> 칸 번호마다 [(이웃 칸 번호, 비용), ...]
+_nav_key = None
+_neighbors = None
+
+# 현재 흐름장
+_field_key = None       # (격자, 격자 version, 목표 칸 번호)
+_dist = None            # 칸 번호 -> 목표까지 거리 (칸 단위)
+_next = None            # 칸 번호 -> 다음 칸 번호 (-1: 목표 칸이거나 갈 수 없음)
+
+stats = {'recomputes': 0, 'last_ms': 0.0, 'max_ms': 0.0, 'total_ms': 0.0,
+         'astar_calls': 0, 'astar_ms': 0.0, 'astar_expanded': 0}
+
+
+def _navigation(cmap):
+    """지나갈 수 있는 칸의 이웃 목록. 격자가 바뀔 때만 다시 만듭니다.
+    대각선은 옆 두 칸이 모두 비어 있을 때만 (벽 모서리를 가로지르지 않음)."""
+    global _nav_key, _neighbors
+    key = (cmap, cmap.version)
+    if _nav_key == key:
+        return _neighbors
+    cols, rows = cmap.cols, cmap.rows
+    open_cells = [not cmap.is_solid(i % cols, i // cols) for i in range(cols * rows)]
+    neighbors = [()] * (cols * rows)
+    for i, passable in enumerate(open_cells):
+        if not passable:
+            continue
+        col, row = i % cols, i // cols
+        links = []
+        for dc, dr, cost in _DIRECTIONS:
+            c, r = col + dc, row + dr
+            if not (0 <= c < cols and 0 <= r < rows) or not open_cells[r * cols + c]:
+                continue
+            if dc and dr and not (open_cells[row * cols + c] and open_cells[r * cols + col]):
+                continue
+            links.append((r * cols + c, cost))
+        neighbors[i] = tuple(links)
+    _nav_key, _neighbors = key, neighbors
+    return neighbors
+
+
+def _cell_index(cmap, x, y):
+    col, row = cmap.cell_at(x, y)
+    if not (0 <= col < cmap.cols and 0 <= row < cmap.rows):
+        return -1
+    return row * cmap.cols + col
+
+
+def _cell_center(cmap, index):
+    col, row = index % cmap.cols, index // cmap.cols
+    return (col + 0.5) * cmap.cell_w, (row + 0.5) * cmap.cell_h
+
+
+def _recompute(cmap, goal):
+    """goal 칸에서 거꾸로 다익스트라를 돌려 모든 칸의 거리와 다음 칸을 구합니다."""
+    global _dist, _next
+    t0 = time.perf_counter()
+    neighbors = _navigation(cmap)
+    n = cmap.cols * cmap.rows
+    dist = array('d', [UNREACHABLE]) * n
+    nxt = array('i', [-1]) * n
+    if not cmap.is_solid(goal % cmap.cols, goal // cmap.cols):
+        dist[goal] = 0.0
+        heap = [(0.0, goal)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            for j, cost in neighbors[i]:
+                nd = d + cost
+                if nd < dist[j]:
+                    dist[j] = nd
+                    # 이웃 관계는 대칭이므로 j에서 목표 쪽으로는 i로 가면 됨
+                    nxt[j] = i
+                    heapq.heappush(heap, (nd, j))
+    _dist, _next = dist, nxt
+
+    ms = (time.perf_counter() - t0) * 1000.0
+    stats['recomputes'] += 1
+    stats['last_ms'] = ms
+    stats['max_ms'] = max(stats['max_ms'], ms)
+    stats['total_ms'] += ms
+
+
+def update(target):
+    """target(x, y를 가진 객체)을 향한 흐름장을 필요할 때만 다시 계산합니다. 틱마다 한 번 호출하세요."""
+    global _field_key
+    cmap = game_world.collision_map
+    if cmap is None or target is None:
+        _field_key = None
+        return
+    goal = _cell_index(cmap, target.x, target.y)
+    if goal < 0:
+        _field_key = None
+        return
+    key = (cmap, cmap.version, goal)
+    if key == _field_key:
+        return
+    t0 = frame_profiler.begin()
+    _recompute(cmap, goal)
+    _field_key = key
+    frame_profiler.end('pathfinding', t0)
+
+
+def next_waypoint(x, y):
+    """(x, y)에서 목표 쪽으로 다음에 갈 칸의 중심. 목표와 같은 칸이거나 길이 없으면 None."""
+    if _field_key is None or game_world.collision_map is not _field_key[0]:
+        return None
+    cmap = game_world.collision_map
+    i = _cell_index(cmap, x, y)
+    if i < 0 or _next[i] < 0:
+        return None
+    return _cell_center(cmap, _next[i])
+
+
+def distance(x, y):
+    """(x, y)에서 목표까지 길 따라 거리 (월드 픽셀, 대략). 흐름장이 없거나 길이 없으면 inf."""
+    if _field_key is None or game_world.collision_map is not _field_key[0]:
+        return UNREACHABLE
+    cmap = game_world.collision_map
+    i = _cell_index(cmap, x, y)
+    return _dist[i] * cmap.cell_w if i >= 0 else UNREACHABLE
+
+
+def find_path(x0, y0, x1, y1, cmap=None):
+    """A*로 (x0, y0) -> (x1, y1) 길을 찾아 칸 중심 좌표 목록을 돌려줍니다 (시작 칸 제외). 없으면 None."""
+    cmap = cmap or game_world.collision_map
+    if cmap is None:
+        return None
+    t0 = time.perf_counter()
+    stats['astar_calls'] += 1
+    try:
+        start, goal = _cell_index(cmap, x0, y0), _cell_index(cmap, x1, y1)
+        if start < 0 or goal < 0:
+            return None
+        neighbors = _navigation(cmap)
+        cols = cmap.cols
+        gc, gr = goal % cols, goal // cols
+
+        def heuristic(i):
+            # 8방향 이동의 옥타일 거리
+            dc, dr = abs(i % cols - gc), abs(i // cols - gr)
+            return (dc + dr) + (DIAGONAL_COST - 2) * min(dc, dr)
+
+        came_from = {start: -1}
+        cost = {start: 0.0}
+        heap = [(heuristic(start), 0.0, start)]
+        while heap:
+            _, d, i = heapq.heappop(heap)
+            if i == goal:
+                path = []
+                while i != start:
+                    path.append(_cell_center(cmap, i))
+                    i = came_from[i]
+                path.reverse()
+                return path
+            if d > cost[i]:
+                continue
+            stats['astar_expanded'] += 1
+            for j, step in neighbors[i]:
+                nd = d + step
+                if nd < cost.get(j, UNREACHABLE):
+                    cost[j] = nd
+                    came_from[j] = i
+                    heapq.heappush(heap, (nd + heuristic(j), nd, j))
+        return None
+    finally:
+        stats['astar_ms'] += (time.perf_counter() - t0) * 1000.0
+
+
+def report():
+    return dict(stats, field_cells=len(_next) if _next is not None else 0)
@@ -1,70 +1,114 @@
+import json
+import math
+import os
+
 from pico2d import *
 import game_framework
 import title_mode
 import game_world
+import frame_profiler
+import resources
+import asset_manifest
+import asset_loader
+import atlas
+import sound
+import text_cache
+import tilemap
+from collision_map import CollisionMap
+import pathfinding
 from ratking import Ratking
 from guard import Guard
+from ball import Ball
+import projectile
+from projectile import Projectile
+from camera import Camera
+
+try:
+    from projectile_batch import ProjectileBatch
+except ImportError:
+    # NumPy가 없으면 공을 Ball 객체로 하나씩 처리
+    ProjectileBatch = None
 
 # 가상 전체 맵 크기
 MAP_WIDTH = 1500
 MAP_HEIGHT = 900
 
+# 배경 이미지. 맵 이미지 전체가 월드 전체(MAP_WIDTH x MAP_HEIGHT)에 늘여서 대응됨
+MAP_IMAGE = 'assets/map.jpg'
+# 텍스처 한 장에 담기 어려운 큰 맵은 atlas_builder.py --split-map으로 조각을 만들어 둠 (없으면 MAP_IMAGE 한 장)
+MAP_CHUNK_INDEX = 'assets/map_chunks/chunks.json'
+
+# 배경 위에 까는 타일 레이어 (16px 타일을 3배로 그림)
+TILESET = 'assets/tiles_prison.png'
+TILE_SCALE = 3
+
 name = "PlayMode"
 
 # 전역 배경 참조
 bg = None
 
+# 배경 조각 [(이미지, 원본에서의 left, bottom, w, h)]과 원본 크기
+# (preload()에서 한 번 로드하고 모드를 나갔다 들어와도 유지)
+map_chunks = None
+map_size = None
+
+# 타일 레이어 (preload()에서 만들고 청크를 구워 둠)
+tile_map = None
+# 타일 레이어의 벽/닫힌 문 격자 (tile_map과 같이 만들고 tile_map.set()이 같이 바꿈)
+collision_map = None
+
+# 화면 카메라 (월드 -> 화면 변환, 컬링)
+camera = None
+
 # HUD 이미지
 status_pane_image = None
 toolbar_image = None
+hud_font = None
 
 
 # -----------------------------
 # 배경 클래스
 # -----------------------------
 class Background:
-    def __init__(self, ratking):
+    def __init__(self, camera):
         global bg
         print('[Background] created')
 
-        self.image = load_image('assets/map.jpg')
-        self.canvas_width = get_canvas_width()
-        self.canvas_height = get_canvas_height()
-
-        self.ratking = ratking
+        self.chunks, (self.source_width, self.source_height) = _load_map_chunks()
 
-        self.window_left = 0
-        self.window_bottom = 0
+        # 스크롤 위치는 카메라가 계산 (Ratking을 따라감)
+        self.camera = camera
 
         # 다른 파일에서도 접근 가능하도록 저장
         bg = self
 
-    def update(self):
-        half_w = self.canvas_width // 2
-        half_h = self.canvas_height // 2
-
-        from pico2d import clamp
-
-        self.window_left = clamp(
-            0,
-            int(self.ratking.x) - half_w,
-            MAP_WIDTH - self.canvas_width
-        )
+    @property
+    def window_left(self):
+        return self.camera.left
 
-        self.window_bottom = clamp(
-            0,
-            int(self.ratking.y) - half_h,
-            MAP_HEIGHT - self.canvas_height
-        )
+    @property
+    def window_bottom(self):
+        return self.camera.bottom
 
     def draw(self):
-        # 스크롤 없이 전체 맵을 화면에 표시
-        self.image.draw(
-            self.canvas_width // 2,
-            self.canvas_height // 2,
-            self.canvas_width,
-            self.canvas_height
-        )
+        # 화면에 보이는 영역만 맵 이미지에서 잘라서 그림 (보이는 조각만)
+        left, bottom, right, top = self.camera.view_rect()
+        kx = self.source_width / self.camera.world_width
+        ky = self.source_height / self.camera.world_height
+        vx1, vy1, vx2, vy2 = left * kx, bottom * ky, right * kx, top * ky
+
+        for image, cx, cy, cw, ch in self.chunks:
+            x1, x2 = max(vx1, cx), min(vx2, cx + cw)
+            y1, y2 = max(vy1, cy), min(vy2, cy + ch)
+            if x1 >= x2 or y1 >= y2:
+                continue
+            # 정수 픽셀로 자르고, 자른 사각형이 실제로 덮는 월드 영역에 그려야 스크롤할 때 흔들리지 않음
+            px1, py1 = int(x1), int(y1)
+            px2, py2 = min(cx + cw, math.ceil(x2)), min(cy + ch, math.ceil(y2))
+            sx1, sy1 = px1 / kx - left, py1 / ky - bottom
+            sx2, sy2 = px2 / kx - left, py2 / ky - bottom
+            image.clip_draw(px1 - cx, py1 - cy, px2 - px1, py2 - py1,
+                            (sx1 + sx2) / 2, (sy1 + sy2) / 2, sx2 - sx1, sy2 - sy1)
 
 
 # -----------------------------
@@ -72,179 +116,182 @@ class Background:
 # -----------------------------
 ratking_instance = None
 guard_instance = None
-
-
-# -----------------------------
-# 초기화 함수
-# -----------------------------
-def init():
-    print('PlayMode init')
-
-
-# -----------------------------
-# 모드 진입
-# -----------------------------
-def enter():
-    global ratking_instance, guard_instance
-    global status_pane_image, toolbar_image
-
-    print('PlayMode enter')
-
-    game_world.init()
-
-    # HUD 이미지 로드
-    # 참고: UIManager.py와 play_mode.py에서 로드하는 이미지 경로가 다릅니다.
-    # UIManager: 'status_pane.png', 'toolbar.png'
-    # play_mode: 'assets/status_pane.png', 'assets/toolbar.png'
-    # 현재 코드에서는 play_mode 경로를 사용합니다.
+ball_batch = None
+
+# 백그라운드 로드 핸들 (preload()가 만들고 title_mode가 진행률 표시에 사용)
+load_handle = None
+# preload()가 끝까지 진행됐는지
+preloaded = False
+
+
+def _read_chunk_index():
+    """조각 인덱스를 읽습니다. 없거나 원본이 조각을 만든 뒤에 바뀌었으면 None."""
+    try:
+        with open(MAP_CHUNK_INDEX, encoding='utf-8') as f:
+            index = json.load(f)
+        info = asset_manifest.get(MAP_IMAGE)
+        if info is None or info['hash'] != index.get('hash'):
+            print(f"[Background] {MAP_IMAGE}가 바뀌어서 조각 대신 원본을 씁니다.")
+            return None
+        return index
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _chunk_paths(index):
+    base = os.path.dirname(MAP_CHUNK_INDEX)
+    return [os.path.join(base, c['file']) for c in index['chunks']]
+
+
+def _load_map_chunks():
+    global map_chunks, map_size
+    if map_chunks is None:
+        index = _read_chunk_index()
+        if index is not None:
+            images = [resources.image(p) for p in _chunk_paths(index)]
+            map_chunks = [(image, c['x'], c['y'], c['w'], c['h'])
+                          for image, c in zip(images, index['chunks'])]
+            map_size = tuple(index['size'])
+        else:
+            image = resources.image(MAP_IMAGE)
+            map_chunks = [(image, 0, 0, image.w, image.h)]
+            map_size = (image.w, image.h)
+    return map_chunks, map_size
+
+
+def _build_cell_block(tiles, col1, row1, col2, row2):
+    """벽으로 둘러싸인 감방 하나 (아래쪽 가운데에 문)."""
+    tiles.fill_rect(col1, row1, col2, row2, tilemap.PRISON_WALL)
+    tiles.fill_rect(col1 + 1, row1 + 1, col2 - 1, row2 - 1, tilemap.PRISON_FLOOR)
+    tiles.set((col1 + col2) // 2, row1, tilemap.PRISON_DOOR)
+
+
+def _load_tilemap():
+    global tile_map
+    if tile_map is None:
+        tile_w = 16 * TILE_SCALE
+        tile_map = tilemap.TileMap(math.ceil(MAP_WIDTH / tile_w), math.ceil(MAP_HEIGHT / tile_w),
+                                   TILESET, scale=TILE_SCALE)
+        _build_cell_block(tile_map, 22, 11, 29, 16)
+        _build_cell_block(tile_map, 2, 12, 7, 16)
+        tile_map.bake_all()
+    return tile_map
+
+
+def _load_collision_map():
+    global collision_map
+    if collision_map is None:
+        # 벽/닫힌 문은 지나갈 수 없음 (문이 열리면 tile_map.set()이 격자도 바꿈)
+        collision_map = CollisionMap.from_tilemap(_load_tilemap(), tilemap.PRISON_SOLID)
+    return collision_map
+
+
+def _load_hud_images():
+    global status_pane_image, toolbar_image, hud_font
+    # UIManager는 'status_pane.png'처럼 assets/ 없이 부르지만
+    # resources가 같은 파일로 찾아주므로 같은 이미지를 공유합니다.
     if status_pane_image is None:
         try:
-            status_pane_image = load_image('assets/status_pane.png')
+            status_pane_image = resources.image('assets/status_pane.png')
         except Exception as e:
             print(f"[HUD] status_pane.png 로드 실패: {e}")
 
     if toolbar_image is None:
         try:
-            toolbar_image = load_image('assets/toolbar.png')
+            toolbar_image = resources.image('assets/toolbar.png')
         except Exception as e:
             print(f"[HUD] toolbar.png 로드 실패: {e}")
 
-    # Ratking 생성
-    ratking_instance = Ratking()
-
-    # Guard 생성 (Ratking 추적)
-    guard_instance = Guard(x=800, y=400, target=ratking_instance)
-
-    # 배경 생성
-    background = Background(ratking_instance)
-    game_world.add_object(background, 0)
-
-    # ratking 및 guard 추가
-    game_world.add_object(ratking_instance, 1)
-    game_world.add_object(guard_instance, 1)
-
-
-# -----------------------------
-# 모드 종료 처리
-# -----------------------------
-def exit():
-    global ratking_instance, guard_instance, bg
-    print('PlayMode exit')
-    game_world.clear()
-    ratking_instance = None
-    guard_instance = None
-    bg = None
-
-
-def finish():
-    pass
-
-
-# -----------------------------
-# 이벤트 처리
-# -----------------------------
-def handle_events():
-    global ratking_instance
-    events = get_events()
-    for event in events:
-        if event.type == SDL_QUIT:
-            game_framework.quit()
-        elif event.type == SDL_KEYDOWN and event.key == SDLK_ESCAPE:
-            game_framework.change_mode(title_mode)
-        else:
-            if ratking_instance:
-                ratking_instance.handle_event(event)
-
-
-# -----------------------------
-# 업데이트
-# -----------------------------
-def update():
-    game_world.update()
-
-
-# -----------------------------
-# 화면 그리기
-# -----------------------------
-from pico2d import *
-import game_framework
-import title_mode
-import game_world
-from ratking import Ratking
-from guard import Guard
-
-# 가상 전체 맵 크기
-MAP_WIDTH = 1500
-MAP_HEIGHT = 900
-
-name = "PlayMode"
-
-# 전역 배경 참조
-bg = None
-
-# HUD 이미지
-status_pane_image = None
-toolbar_image = None
-
-
-# -----------------------------
-# 배경 클래스
-# -----------------------------
-class Background:
-    def __init__(self, ratking):
-        global bg
-        print('[Background] created')
-
-        self.image = load_image('assets/map.jpg')
-        self.canvas_width = get_canvas_width()
-        self.canvas_height = get_canvas_height()
-
-        self.ratking = ratking
-
-        self.window_left = 0
-        self.window_bottom = 0
-
-        # 다른 파일에서도 접근 가능하도록 저장
-        bg = self
-
-    def update(self):
-        half_w = self.canvas_width // 2
-        half_h = self.canvas_height // 2
-
-        from pico2d import clamp
-
-        self.window_left = clamp(
-            0,
-            int(self.ratking.x) - half_w,
-            MAP_WIDTH - self.canvas_width
-        )
-
-        self.window_bottom = clamp(
-            0,
-            int(self.ratking.y) - half_h,
-            MAP_HEIGHT - self.canvas_height
-        )
-
-    def draw(self):
-        # 스크롤 없이 전체 맵을 화면에 표시
-        self.image.draw(
-            self.canvas_width // 2,
-            self.canvas_height // 2,
-            self.canvas_width,
-            self.canvas_height
-        )
+    if hud_font is None:
+        try:
+            hud_font = text_cache.font('ENCR10B.TTF', 16)
+        except Exception as e:
+            print(f"[HUD] 폰트 로드 실패: {e}")
+
+
+def _release_resources():
+    """preload()로 잡아 둔 이미지/효과음 참조를 돌려주고 미리 읽기 상태를 처음으로 되돌립니다 (finish()에서 부름).
+
+    캐시(resources)에서 바로 지우지는 않으므로 예산을 넘지 않았다면 다시 읽을 때 디스크까지 가지 않습니다.
+    """
+    global map_chunks, map_size, tile_map, collision_map, status_pane_image, toolbar_image, load_handle, preloaded
+    if map_chunks is not None:
+        for image, *_ in map_chunks:
+            resources.release(image)
+        map_chunks = map_size = None
+    if tile_map is not None:
+        tile_map.release()
+        tile_map = collision_map = None
+    resources.release(status_pane_image)
+    resources.release(toolbar_image)
+    status_pane_image = toolbar_image = None
+
+    Ratking.release_image()
+    Guard.release_sheet()
+    Ball.release_image()
+    Projectile.release_image()
+    atlas.unload()
+    sound.release()
+    if load_handle is not None:
+        load_handle.release()
+    load_handle = None
+    preloaded = False
 
 
 # -----------------------------
-# 전역 상태
+# 미리 읽기 / 초기화
 # -----------------------------
-ratking_instance = None
-guard_instance = None
+def _preload_paths():
+    index = _read_chunk_index()
+    paths = _chunk_paths(index) if index is not None else [MAP_IMAGE]
+    paths += [TILESET, 'assets/status_pane.png', 'assets/toolbar.png']
+    # 아틀라스가 있으면 캐릭터는 아틀라스 시트로 그림
+    paths += atlas.sheet_paths() or ['assets/ratking.png', 'assets/guard.png']
+    paths += [next((p for p in Ball.IMAGE_CANDIDATES if os.path.exists(p)), Ball.IMAGE_CANDIDATES[0])]
+    return paths
+
+
+def load_progress():
+    """미리 읽기 진행률 0.0 ~ 1.0."""
+    if preloaded:
+        return 1.0
+    return load_handle.progress if load_handle is not None else 0.0
+
+
+def preload():
+    """타이틀 화면이 떠 있는 동안 game_framework가 조금씩 진행하는 자원 로드.
+
+    이미지 파일 읽기/디코딩은 asset_loader의 작업 스레드가 하고, 여기서는 프레임마다
+    텍스처 업로드만 조금씩 진행합니다. 업로드가 끝나면 아래 단계들은 resources 캐시에서 바로 꺼냅니다.
+    로드한 자원(배경 조각, 구운 타일맵, 이미지/효과음 참조)은 exit() 뒤에도 모듈/클래스에 남아서
+    다음에 PlayMode에 들어올 때 다시 읽거나 굽지 않고, 프로그램이 끝날 때 finish()에서 돌려줍니다.
+    미리 읽기 없이 바로 들어오면(디버그/헤드리스) 진입할 때 한 번에 실행됩니다.
+    """
+    global load_handle, preloaded
+    load_handle = asset_loader.load_images(_preload_paths())
+    while not load_handle.done:
+        load_handle.pump()
+        yield
+
+    _load_map_chunks()
+    yield
+    _load_tilemap()
+    yield
+    _load_collision_map()
+    yield
+    Ratking.prepare_image()
+    yield
+    Guard.prepare_sheet()
+    yield
+    Ball.prepare_image()
+    yield
+    _load_hud_images()
+    yield
+    # 효과음은 재생 순간에 디코딩하면 끊기므로 미리 디코딩
+    sound.preload()
+    preloaded = True
 
 
-# -----------------------------
-# 초기화 함수
-# -----------------------------
 def init():
     print('PlayMode init')
 
@@ -253,29 +300,14 @@ def init():
 # 모드 진입
 # -----------------------------
 def enter():
-    global ratking_instance, guard_instance
-    global status_pane_image, toolbar_image
+    global ratking_instance, guard_instance, ball_batch, camera
 
     print('PlayMode enter')
 
-    game_world.init()
+    sound.play_music('game')
 
-    # HUD 이미지 로드
-    # 참고: UIManager.py와 play_mode.py에서 로드하는 이미지 경로가 다릅니다.
-    # UIManager: 'status_pane.png', 'toolbar.png'
-    # play_mode: 'assets/status_pane.png', 'assets/toolbar.png'
-    # 현재 코드에서는 play_mode 경로를 사용합니다.
-    if status_pane_image is None:
-        try:
-            status_pane_image = load_image('assets/status_pane.png')
-        except Exception as e:
-            print(f"[HUD] status_pane.png 로드 실패: {e}")
-
-    if toolbar_image is None:
-        try:
-            toolbar_image = load_image('assets/toolbar.png')
-        except Exception as e:
-            print(f"[HUD] toolbar.png 로드 실패: {e}")
+    game_world.init()
+    game_world.set_world_bounds(MAP_WIDTH, MAP_HEIGHT)
 
     # Ratking 생성
     ratking_instance = Ratking()
@@ -283,29 +315,65 @@ def enter():
     # Guard 생성 (Ratking 추적)
     guard_instance = Guard(x=800, y=400, target=ratking_instance)
 
+    # 카메라 생성 (Ratking 추적) 및 game_world에 등록
+    camera = Camera(MAP_WIDTH, MAP_HEIGHT)
+    camera.follow(ratking_instance)
+    camera.snap()
+    game_world.set_camera(camera)
+
     # 배경 생성
-    background = Background(ratking_instance)
+    background = Background(camera)
     game_world.add_object(background, 0)
+    game_world.add_object(_load_tilemap(), 0)
+    game_world.set_collision_map(_load_collision_map())
 
     # ratking 및 guard 추가
     game_world.add_object(ratking_instance, 1)
     game_world.add_object(guard_instance, 1)
 
+    # Ratking이 쏘는 공은 배열 배치로 일괄 처리 (Guard에게 맞으면 데미지)
+    if ProjectileBatch is not None:
+        radius = Ball.BASE_BB_RADIUS * 0.5
+        draw_size = int(Ball.BASE_DRAW_SIZE * 0.5)
+        ball_batch = ProjectileBatch(Ball.prepare_image(), radius, radius, 'guard',
+                                     game_world.world_bounds, draw_size, draw_size)
+        ratking_instance.ball_batch = ball_batch
+        game_world.add_object(ball_batch, 1)
+
+        # projectile.fire()로 쏘는 탄도 같은 방식으로 배치 처리 ('enemy' 그룹 전체가 대상)
+        half = projectile.TARGET_W / 2
+        Projectile.batch = ProjectileBatch(Projectile.prepare_image(), half, half, 'enemy',
+                                           game_world.world_bounds)
+        game_world.add_object(Projectile.batch, 1)
+
+    # 충돌 쌍 등록 (그룹 a, 그룹 b, 쌍 이름)
+    game_world.add_collision_pair('projectile', 'enemy', 'projectile:enemy')
+    game_world.add_collision_pair('enemy', 'boy', 'enemy:boy')
+    game_world.add_collision_pair('ball', 'guard', 'ball:guard')
+    game_world.add_collision_pair('guard', 'ratking', 'guard:ratking')
+
 
 # -----------------------------
 # 모드 종료 처리
 # -----------------------------
 def exit():
-    global ratking_instance, guard_instance, bg
+    global ratking_instance, guard_instance, ball_batch, camera, bg
     print('PlayMode exit')
     game_world.clear()
     ratking_instance = None
     guard_instance = None
+    ball_batch = None
+    Projectile.batch = None
+    camera = None
     bg = None
+    # preload()로 읽은 자원은 다음 진입 때 그대로 쓰도록 남겨 둠 (finish()에서 돌려줌)
+    # 미리 읽기는 끝났으므로 작업 스레드를 정리 (다시 load_images()를 부르면 새로 만듦)
+    asset_loader.shutdown()
 
 
 def finish():
-    pass
+    _release_resources()
+    asset_loader.shutdown()
 
 
 # -----------------------------
@@ -319,6 +387,10 @@ def handle_events():
             game_framework.quit()
         elif event.type == SDL_KEYDOWN and event.key == SDLK_ESCAPE:
             game_framework.change_mode(title_mode)
+        elif event.type == SDL_KEYDOWN and event.key == SDLK_F3:
+            frame_profiler.toggle_overlay()
+        elif event.type == SDL_KEYDOWN and event.key == SDLK_F4:
+            frame_profiler.dump_csv()
         else:
             if ratking_instance:
                 ratking_instance.handle_event(event)
@@ -328,16 +400,25 @@ def handle_events():
 # 업데이트
 # -----------------------------
 def update():
+    # 적들이 함께 쓰는 흐름장 (Ratking이 다른 칸으로 옮겼거나 벽이 바뀌었을 때만 다시 계산)
+    pathfinding.update(ratking_instance)
     game_world.update()
+    # 모든 객체가 움직인 뒤에 카메라를 맞춰야 이번 프레임 그리기와 어긋나지 않음
+    camera.update()
+    # 이번 틱에 요청된 효과음을 모아서 재생 (같은 소리는 한 번만)
+    sound.update()
 
 
-
+# -----------------------------
+# 화면 그리기
+# -----------------------------
 def draw():
     clear_canvas()
 
     game_world.draw()
 
     # HUD 그리기
+    t0 = frame_profiler.begin()
     global status_pane_image, toolbar_image
     w, h = get_canvas_width(), get_canvas_height()
 
@@ -363,6 +444,11 @@ def draw():
             status_height_scaled
         )
 
+        # 적(Guard) 체력. 숫자는 매 프레임 바뀔 수 있으므로 글자 띠 텍스처로 그림
+        if hud_font and guard_instance:
+            hud_font.draw_glyphs(w // 2 - status_width_scaled // 2 + 20, h - status_height_scaled // 2,
+                                 f'GUARD HP {max(0, guard_instance.hp)}/{guard_instance.max_hp}', (255, 255, 255))
+
     # 2. toolbar는 화면 맨 아래에서 띄워서 배치 (확대 적용)
     if toolbar_image:
         # 확대된 너비와 높이 계산
@@ -376,4 +462,7 @@ def draw():
             toolbar_height_scaled
         )
 
-    update_canvas()
\ No newline at end of file
+    frame_profiler.end('hud', t0)
+
+    frame_profiler.draw_overlay()
+    update_canvas()
@@ -1,59 +1,99 @@
 from pico2d import *
 import game_world
 import game_framework
+import resources
 
 TARGET_W = 12
 TARGET_H = 12
+# 월드 범위에서 이만큼 더 나가면 제거 (ProjectileBatch의 margin과 같은 역할)
+CULL_MARGIN = 50
 
 class Projectile:
+    collision_groups = ('projectile',)
+    swept_collision = True
+    pooled = True
+
+    # 모든 인스턴스가 공유하는 이미지 (처음 한 번만 로드 시도)
+    image = None
+    image_tried = False
+
+    # play_mode가 만든 ProjectileBatch ('enemy' 대상). 있으면 fire()가 객체 대신 배치에 넣음
+    batch = None
+
+    @classmethod
+    def prepare_image(cls):
+        """이미지를 한 번만 로드 시도합니다. 없으면 None (사각형으로 그림)."""
+        if not cls.image_tried:
+            cls.image_tried = True
+            for path in ('assets/projectile.png', 'projectile.png'):
+                try:
+                    cls.image = resources.image(path)
+                    break
+                except Exception:
+                    cls.image = None
+        return cls.image
+
+    @classmethod
+    def release_image(cls):
+        resources.release(cls.image)
+        cls.image = None
+        cls.image_tried = False
+
     def __init__(self, x, y, vx, vy=0, damage=1, owner=None, life_time=3.0):
+        Projectile.prepare_image()
+        self.reset(x, y, vx, vy, damage, owner, life_time)
+
+    def reset(self, x, y, vx, vy=0, damage=1, owner=None, life_time=3.0):
         self.x = x
         self.y = y
+        # 직전 틱 위치 (그릴 때 game_framework.alpha로 보간)
+        self.prev_x, self.prev_y = x, y
         self.vx = vx
         self.vy = vy
         self.damage = damage
         self.owner = owner
         self.life = life_time
-        self.image = None
-        try:
-            self.image = load_image('assets/projectile.png')
-        except Exception:
-            try:
-                self.image = load_image('projectile.png')
-            except Exception:
-                self.image = None
 
     def get_bb(self):
         return self.x - TARGET_W//2, self.y - TARGET_H//2, self.x + TARGET_W//2, self.y + TARGET_H//2
 
     def update(self):
         dt = getattr(game_framework, 'frame_time', 1.0/60.0)
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.vx * dt
         self.y += self.vy * dt
         self.life -= dt
-        # remove when life ended or out of canvas
-        try:
-            cw = get_canvas_width()
-            ch = get_canvas_height()
-        except Exception:
-            cw, ch = 800, 600
-        if self.life <= 0 or self.x < -50 or self.x > cw + 50 or self.y < -50 or self.y > ch + 50:
-            try:
-                game_world.remove_object(self)
-            except Exception:
-                pass
+        if self.life <= 0:
+            game_world.remove_object(self)
+            return
+
+        # 맵 밖 제거 (화면이 아니라 월드 범위 기준)
+        bounds = game_world.world_bounds
+        if bounds is None:
+            return
+        left, bottom, right, top = bounds
+        m = CULL_MARGIN
+        if (self.x < left - m or self.x > right + m or
+                self.y < bottom - m or self.y > top + m):
+            game_world.remove_object(self)
 
     def draw(self):
+        # 월드 좌표 -> 화면 좌표 (다른 엔티티처럼 카메라를 거침)
         if self.image:
             try:
-                self.image.draw(self.x, self.y)
+                self.image.draw(*game_world.render_position(self))
             except Exception:
                 pass
         else:
-            draw_rectangle(*self.get_bb())
+            x1, y1, x2, y2 = self.get_bb()
+            sx1, sy1 = game_world.to_screen(x1, y1)
+            sx2, sy2 = game_world.to_screen(x2, y2)
+            draw_rectangle(sx1, sy1, sx2, sy2)
 
-    def on_collision(self, other):
+    def handle_collision(self, group, other):
         # When colliding with an enemy, deal damage and remove self
+        if group != 'projectile:enemy':
+            return
         try:
             if hasattr(other, 'take_damage'):
                 other.take_damage(self.damage)
@@ -64,3 +104,10 @@ class Projectile:
         except Exception:
             pass
 
+
+def fire(x, y, vx, vy=0, damage=1, owner=None, life_time=3.0):
+    """탄 하나를 쏩니다. 배치가 있으면 배치에 넣고, 없으면 Projectile 객체를 월드에 추가합니다."""
+    if Projectile.batch is not None:
+        Projectile.batch.spawn(x, y, vx, vy, damage, life_time)
+        return None
+    return game_world.spawn(Projectile, 1, x, y, vx, vy, damage, owner, life_time)
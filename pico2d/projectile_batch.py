@@ -0,0 +1,205 @@
+from pico2d import *
+import numpy as np
+import game_framework
+import game_world
+
+# 한 번에 비교하는 탄 개수 (탄 x 적 불리언 행렬의 메모리 상한)
+COLLIDE_CHUNK = 4096
+
+
+def _slab(p, d, lo, hi):
+    """한 축에서 p + d*t 가 [lo, hi] 안에 있는 t 구간 (탄 x 적 행렬 두 개).
+    이 축으로 움직이지 않는 탄은 이미 안이면 (-inf, inf), 밖이면 빈 구간 (inf, -inf)."""
+    p, d = p[:, None], d[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (lo[None, :] - p) / d
+        t2 = (hi[None, :] - p) / d
+    t_lo, t_hi = np.minimum(t1, t2), np.maximum(t1, t2)
+    still = (d == 0)
+    if still.any():
+        inside = (p >= lo[None, :]) & (p <= hi[None, :])
+        still = np.broadcast_to(still, t_lo.shape)
+        t_lo = np.where(still, np.where(inside, -np.inf, np.inf), t_lo)
+        t_hi = np.where(still, np.where(inside, np.inf, -np.inf), t_hi)
+    return t_lo, t_hi
+
+
+class ProjectileBatch:
+    """같은 종류의 탄(Ball, Projectile)을 NumPy 배열(struct-of-arrays)로 한꺼번에 처리합니다.
+
+    탄 하나하나를 객체로 만들지 않고 위치/속도/수명/데미지를 배열로 보관해서
+    이동, 화면 밖 제거, 적 충돌 검사를 한 번의 벡터 연산으로 끝냅니다.
+    game_world에는 배치 하나만 객체로 등록합니다.
+    """
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, image, half_w, half_h, target_group, bounds,
+                 draw_w=None, draw_h=None, margin=100):
+        self.image = image
+        self.half_w = half_w
+        self.half_h = half_h
+        self.draw_w = draw_w if draw_w is not None else half_w * 2
+        self.draw_h = draw_h if draw_h is not None else half_h * 2
+
+        # 충돌 대상 그룹 이름 (예: 'guard', 'enemy')
+        self.target_group = target_group
+        # 이 범위(+margin)를 벗어나면 제거 (left, bottom, right, top)
+        self.bounds = bounds
+        self.margin = margin
+
+        self.n = 0
+        self._allocate(ProjectileBatch.INITIAL_CAPACITY)
+
+    def _allocate(self, capacity):
+        old_n = self.n
+        fields = {}
+        for name in ('x', 'y', 'prev_x', 'prev_y', 'vx', 'vy', 'life', 'damage'):
+            arr = np.zeros(capacity, dtype=np.float64)
+            if old_n:
+                arr[:old_n] = getattr(self, name)[:old_n]
+            fields[name] = arr
+        self.x, self.y = fields['x'], fields['y']
+        # 직전 틱 위치 (충돌 경로 검사와, 그릴 때 game_framework.alpha로 보간하는 데 씀)
+        self.prev_x, self.prev_y = fields['prev_x'], fields['prev_y']
+        self.vx, self.vy = fields['vx'], fields['vy']
+        self.life, self.damage = fields['life'], fields['damage']
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.n
+
+    def spawn(self, x, y, vx, vy=0.0, damage=1, life_time=float('inf')):
+        """탄 하나를 추가합니다. 속도 단위는 픽셀/초입니다."""
+        if self.n == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.n
+        self.x[i], self.y[i] = x, y
+        self.prev_x[i], self.prev_y[i] = x, y
+        self.vx[i], self.vy[i] = vx, vy
+        self.life[i] = life_time
+        self.damage[i] = damage
+        self.n += 1
+
+    def clear(self):
+        self.n = 0
+
+    def update(self):
+        n = self.n
+        if n == 0:
+            return
+        dt = game_framework.frame_time
+
+        x, y = self.x[:n], self.y[:n]
+        prev_x, prev_y = self.prev_x[:n], self.prev_y[:n]
+        prev_x[:] = x
+        prev_y[:] = y
+
+        # 1. 적분 (모든 탄을 한 번에 이동)
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        life = self.life[:n]
+        life -= dt
+
+        # 2. 수명 종료 / 맵 밖 제거 대상 표시
+        left, bottom, right, top = self.bounds
+        m = self.margin
+        alive = ((life > 0) &
+                 (x >= left - m) & (x <= right + m) &
+                 (y >= bottom - m) & (y <= top + m))
+
+        # 3. 이번 틱 이동 선분(prev -> 현재)이 벽에 닿는 t (안 닿으면 inf)
+        cmap = game_world.collision_map
+        if cmap is not None and cmap.solid_array() is not None:
+            wall_t = cmap.segment_hits(prev_x, prev_y, x, y)
+        else:
+            wall_t = np.full(n, np.inf)
+
+        # 4. 적과 충돌한 탄 제거 (벽에 닿기 전까지의 구간만 검사하므로 벽 뒤의 적은 맞지 않음)
+        self._collide(prev_x, prev_y, alive, np.minimum(wall_t, 1.0))
+
+        # 5. 벽에 닿은 탄 제거
+        alive &= np.isinf(wall_t)
+
+        # 6. 살아남은 탄만 앞으로 모음
+        self._compact(alive)
+
+    def _collide(self, prev_x, prev_y, alive, t_limit):
+        """이번 틱 이동 선분과 (탄 크기만큼 넓힌) 적 AABB들을 한꺼번에 교차 검사합니다 (slab 방식).
+
+        t_limit은 탄마다 선분을 어디(t)까지 볼지입니다 (벽에 막히는 지점, 없으면 1).
+        """
+        # 이번 틱에 이미 제거 대기 중인 적(죽은 Guard 등)은 맞지 않음
+        targets = [t for t in game_world.group_members.get(self.target_group, ())
+                   if not game_world.is_removed(t)]
+        if not targets:
+            return
+        boxes = np.array([t.get_bb() for t in targets], dtype=np.float64)
+        # 탄 크기만큼 적 박스를 넓히면 탄은 점(중심)으로 보고 선분 검사만 하면 됨
+        ex1 = boxes[:, 0] - self.half_w
+        ey1 = boxes[:, 1] - self.half_h
+        ex2 = boxes[:, 2] + self.half_w
+        ey2 = boxes[:, 3] + self.half_h
+
+        n = self.n
+        dx = self.x[:n] - prev_x
+        dy = self.y[:n] - prev_y
+
+        damage_taken = np.zeros(len(targets), dtype=np.float64)
+        live_idx = np.nonzero(alive)[0]
+        for start in range(0, len(live_idx), COLLIDE_CHUNK):
+            idx = live_idx[start:start + COLLIDE_CHUNK]
+            tx1, tx2 = _slab(prev_x[idx], dx[idx], ex1, ex2)
+            ty1, ty2 = _slab(prev_y[idx], dy[idx], ey1, ey2)
+            # 선분(t = 0~1)이 두 축 구간에 동시에 들어가 있는 때가 있으면 충돌
+            # 경계가 맞닿는 경우도 충돌로 봄 (game_world와 동일)
+            t_enter = np.maximum(tx1, ty1)
+            t_exit = np.minimum(tx2, ty2)
+            hit = (t_enter <= t_exit) & (t_enter <= t_limit[idx][:, None]) & (t_exit >= 0.0)
+            any_hit = hit.any(axis=1)
+            if not any_hit.any():
+                continue
+            # 탄 하나는 경로에서 가장 먼저 닿는 적 하나에만 맞음
+            t_enter = np.where(hit, t_enter, np.inf)
+            first = t_enter.argmin(axis=1)[any_hit]
+            hit_idx = idx[any_hit]
+            damage_taken += np.bincount(first, weights=self.damage[hit_idx], minlength=len(targets))
+            alive[hit_idx] = False
+
+        for target, dmg in zip(targets, damage_taken.tolist()):
+            if dmg > 0 and hasattr(target, 'take_damage'):
+                try:
+                    target.take_damage(int(dmg) if dmg.is_integer() else dmg)
+                except Exception:
+                    pass
+
+    def _compact(self, alive):
+        k = int(np.count_nonzero(alive))
+        if k == self.n:
+            return
+        n = self.n
+        for arr in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy, self.life, self.damage):
+            arr[:k] = arr[:n][alive]
+        self.n = k
+
+    def draw(self):
+        n = self.n
+        if n == 0 or self.image is None:
+            return
+        cam = game_world.camera
+        if cam is not None:
+            left, bottom, right, top = cam.view_rect()
+        else:
+            left, bottom = 0, 0
+            right, top = get_canvas_width(), get_canvas_height()
+
+        # 화면 안에 있는 탄만 그림 (직전 틱과 현재 틱 사이를 보간한 위치)
+        x = game_world.lerp(self.prev_x[:n], self.x[:n])
+        y = game_world.lerp(self.prev_y[:n], self.y[:n])
+        visible = ((x >= left - self.draw_w) & (x <= right + self.draw_w) &
+                   (y >= bottom - self.draw_h) & (y <= top + self.draw_h))
+        sx = x[visible] - left
+        sy = y[visible] - bottom
+
+        image, dw, dh = self.image, self.draw_w, self.draw_h
+        for px, py in zip(sx.tolist(), sy.tolist()):
+            image.draw(px, py, dw, dh)
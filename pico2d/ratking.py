@@ -1,69 +1,131 @@
 from pico2d import *
 import game_framework
 import game_world
-from ball import Ball
+import resources
+import atlas
+import asset_manifest
+import sound
+from ball import Ball, PIXEL_PER_METER
+import math
 
 
 class Ratking:
+    # 시트 칸 구성 (prepare_image()에서 asset_manifest 값으로 바뀜)
     FRAME_W = 16
     FRAME_H = 16
+    ROWS = 1
     COLS = 12
+    FRAME_COUNT = 12
+    # 충돌 박스 기준 크기 (SCALE=4.0이면 한 변 64px)
+    BB_SIZE = 16
+
+    collision_groups = ('ratking',)
 
     IDLE_FRAMES = [0, 1, 2, 3]
     WALK_FRAMES = [4, 5, 6, 7, 8, 9, 10, 11]
     SCALE = 4.0
-    ANIMATION_SPEED = 10
+    # 예전 기준(60fps에서 10프레임마다 한 칸, 프레임당 3px)을 초 단위로 환산
+    TIME_PER_FRAME = 10 / 60.0      # 애니메이션 한 칸당 시간 (초)
+    WALK_SPEED_PPS = 3 * 60.0       # 걷기 속도 (픽셀/초)
+
+    image = None
+    # 아틀라스 프레임 (frame_no 순서, _h는 좌우 반전). 아틀라스가 없으면 None
+    atlas_frames = None
+    atlas_frames_h = None
+
+    @classmethod
+    def prepare_image(cls):
+        """스프라이트 시트를 한 번만 로드해서 모든 인스턴스가 공유합니다."""
+        if cls.image is None and cls.atlas_frames is None:
+            geometry = asset_manifest.grid('assets/ratking.png')
+            if geometry is not None:
+                cls.FRAME_W, cls.FRAME_H, cls.ROWS, cls.COLS, cls.FRAME_COUNT = geometry
+            grid = (cls.FRAME_W, cls.FRAME_H, cls.ROWS, cls.COLS)
+            cls.atlas_frames = atlas.sheet_frames('ratking', grid)
+            cls.atlas_frames_h = atlas.sheet_frames('ratking', grid, mirrored=True)
+            if cls.atlas_frames is None or cls.atlas_frames_h is None:
+                cls.atlas_frames = cls.atlas_frames_h = None
+                cls.image = resources.image('assets/ratking.png')
+        return cls.image
+
+    @classmethod
+    def release_image(cls):
+        """prepare_image()로 잡은 시트 참조를 돌려줍니다. 다음 prepare_image()가 다시 가져옵니다."""
+        resources.release(cls.image)
+        cls.image = None
+        cls.atlas_frames = cls.atlas_frames_h = None
 
     def __init__(self, x=400, y=300):
         self.x, self.y = x, y
+        # 직전 틱 위치 (그릴 때 game_framework.alpha로 보간)
+        self.prev_x, self.prev_y = x, y
         self.dir = 1
         self.action = 'idle'
 
         self.frame_index = 0
-        self.frame_time = 0
+        self.frame_time = 0.0  # 현재 애니메이션 칸에 머문 시간 (초)
 
         self.screen_x = x
         self.screen_y = y
 
-        self.image = load_image('assets/ratking.png')
+        self.image = Ratking.prepare_image()
+
+        # 공을 배열로 일괄 처리하는 ProjectileBatch (play_mode가 할당, 없으면 Ball 객체 생성)
+        self.ball_batch = None
+
+    def get_bb(self):
+        # SCALE=4.0 기준 대략적인 크기 (한 변 64px)
+        half_w = Ratking.BB_SIZE * Ratking.SCALE // 2
+        half_h = Ratking.BB_SIZE * Ratking.SCALE // 2
+        return self.x - half_w, self.y - half_h, self.x + half_w, self.y + half_h
 
     def _current_frames(self):
         return Ratking.IDLE_FRAMES if self.action == 'idle' else Ratking.WALK_FRAMES
 
     def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+
         # 애니메이션
-        self.frame_time += 1
-        if self.frame_time >= Ratking.ANIMATION_SPEED:
-            self.frame_time = 0
+        self.frame_time += game_framework.frame_time
+        if self.frame_time >= Ratking.TIME_PER_FRAME:
+            self.frame_time %= Ratking.TIME_PER_FRAME
             frames = self._current_frames()
             self.frame_index = (self.frame_index + 1) % len(frames)
 
         # 이동
         if self.action == 'walk':
-            self.x += self.dir * 3
-
-        self.update_screen_position()
+            move_x = self.dir * Ratking.WALK_SPEED_PPS * game_framework.frame_time
+            cmap = game_world.collision_map
+            if cmap is not None:
+                move_x, _ = cmap.sweep(self.get_bb(), move_x, 0)
+            self.x += move_x
 
     def update_screen_position(self):
-        try:
-            import play_mode
-            self.screen_x = self.x - play_mode.bg.window_left
-            self.screen_y = self.y - play_mode.bg.window_bottom
-        except:
-            self.screen_x = self.x
-            self.screen_y = self.y
+        self.screen_x, self.screen_y = game_world.render_position(self)
 
     def draw(self):
-        frames = self._current_frames()
-        frame_no = frames[self.frame_index]
+        # 카메라는 모든 객체 update 이후에 움직이므로 그리기 직전에 화면 좌표를 계산
+        self.update_screen_position()
 
-        col = frame_no % Ratking.COLS
-        sx = col * Ratking.FRAME_W
-        sy = 0
+        frames = self._current_frames()
+        # 시트에 프레임이 IDLE/WALK 목록보다 적으면 있는 프레임 안에서 반복
+        frame_no = frames[self.frame_index] % Ratking.FRAME_COUNT
 
         dw = int(Ratking.FRAME_W * Ratking.SCALE)
         dh = int(Ratking.FRAME_H * Ratking.SCALE)
 
+        if Ratking.atlas_frames is not None:
+            # 아틀라스에 반전 프레임까지 구워져 있으므로 방향과 관계없이 clip_draw
+            atlas_frames = Ratking.atlas_frames if self.dir == 1 else Ratking.atlas_frames_h
+            image, sx, sy, sw, sh = atlas_frames[frame_no]
+            image.clip_draw(sx, sy, sw, sh, self.screen_x, self.screen_y, dw, dh)
+            return
+
+        col = frame_no % Ratking.COLS
+        row = frame_no // Ratking.COLS
+        sx = col * Ratking.FRAME_W
+        sy = (Ratking.ROWS - 1 - row) * Ratking.FRAME_H
+
         if self.dir == 1:
             self.image.clip_draw(sx, sy, Ratking.FRAME_W, Ratking.FRAME_H,
                                  self.screen_x, self.screen_y, dw, dh)
@@ -78,6 +140,7 @@ class Ratking:
 
     def fire_ball(self):
         speed = 30
+        sound.play('zap')
 
         if self.dir == 1:
             ball_x = self.x + 30
@@ -86,8 +149,18 @@ class Ratking:
             ball_x = self.x - 30
             angle = 180
 
-        ball = Ball(ball_x, self.y, speed, angle)
-        game_world.add_object(ball, 1)
+        if self.ball_batch is not None:
+            vx = speed * math.cos(math.radians(angle)) * PIXEL_PER_METER
+            self.ball_batch.spawn(ball_x, self.y, vx)
+            return
+
+        game_world.spawn(Ball, 1, ball_x, self.y, speed, angle)
+
+    def handle_collision(self, group, other):
+        if group == 'guard:ratking':
+            # 경비가 Ratking을 잡으면 게임 종료
+            print("[Collision] Guard caught Ratking -> quit game")
+            game_framework.quit()
 
     def handle_event(self, event):
         if event.type == SDL_KEYDOWN:
@@ -0,0 +1,182 @@
+# resources.py
+# 이미지/폰트/효과음 공용 캐시
+#
+# 같은 파일을 여러 번 load_image() 하지 않도록 정규화한 경로(폰트는 경로+크기)를 키로 한 번만 로드하고,
+# 가져간 쪽 수(참조 수)를 셉니다. 참조가 0이 된 항목은 바로 지우지 않고 남겨 두었다가
+# 전체 크기가 BUDGET_BYTES를 넘을 때 가장 오래 안 쓴 것부터 내보냅니다(LRU).
+#
+#     image = resources.image('assets/guard.png')   # 참조 +1
+#     ...
+#     resources.release(image)                     # 참조 -1 (캐시에는 남음)
+
+import os
+from collections import OrderedDict
+
+from pico2d import *
+
+# 참조가 없는 항목을 내보내기 시작하는 크기 (텍스처는 w * h * 4 바이트로 추정)
+BUDGET_BYTES = 64 * 1024 * 1024
+
+# 경로에 파일이 없으면 이 폴더 아래에서 한 번 더 찾음 ('toolbar.png' -> 'assets/toolbar.png')
+ASSET_DIR = 'assets'
+
+_entries = OrderedDict()    # 키 -> {'resource', 'refs', 'bytes', 'kind', 'path'} (오래 안 쓴 순서)
+_keys_by_id = {}            # id(resource) -> 키
+_failed = {}                # 키 -> 오류 메시지 (없는 파일을 매번 디스크에서 다시 찾지 않도록)
+total_bytes = 0
+
+stats = {'hits': 0, 'misses': 0, 'failures': 0, 'evictions': 0, 'evicted_bytes': 0}
+
+
+def texture_backend():
+    """실제 pico2d의 (renderer, Image)를 돌려줍니다. 창이 없거나 headless면 None.
+
+    SDL로 직접 만든 텍스처를 pico2d Image로 감쌀 때 씁니다 (asset_loader, text_cache).
+    """
+    try:
+        import pico2d.pico2d as backend
+    except ImportError:
+        return None
+    renderer = getattr(backend, 'renderer', None)
+    image_class = getattr(backend, 'Image', None)
+    if not renderer or image_class is None:
+        return None
+    return renderer, image_class
+
+
+def _resolve(path):
+    path = os.path.normpath(path)
+    if not os.path.exists(path):
+        fallback = os.path.join(ASSET_DIR, path)
+        if os.path.exists(fallback):
+            return fallback
+    return path
+
+
+def _key(path):
+    return os.path.normcase(path)
+
+
+def _acquire(key, kind, path, load):
+    global total_bytes
+    entry = _entries.get(key)
+    if entry is not None:
+        stats['hits'] += 1
+        entry['refs'] += 1
+        _entries.move_to_end(key)
+        return entry['resource']
+
+    if key in _failed:
+        stats['failures'] += 1
+        raise IOError(_failed[key])
+
+    stats['misses'] += 1
+    try:
+        resource = load()
+    except Exception as e:
+        stats['failures'] += 1
+        _failed[key] = str(e) or f'cannot load {path}'
+        raise
+
+    size = getattr(resource, 'w', 0) * getattr(resource, 'h', 0) * 4
+    _entries[key] = {'resource': resource, 'refs': 1, 'bytes': size, 'kind': kind, 'path': path}
+    _keys_by_id[id(resource)] = key
+    total_bytes += size
+    _evict()
+    return resource
+
+
+def image(path):
+    """이미지를 로드(또는 캐시에서 꺼내)고 참조 수를 하나 늘립니다. 실패하면 예외를 냅니다."""
+    path = _resolve(path)
+    return _acquire(_key(path), 'image', path, lambda: load_image(path))
+
+
+def font(path, size=20):
+    """폰트를 로드(또는 캐시에서 꺼내)고 참조 수를 하나 늘립니다. 실패하면 예외를 냅니다."""
+    path = _resolve(path)
+    return _acquire((_key(path), size), 'font', path, lambda: load_font(path, size))
+
+
+def adopt(path, resource):
+    """다른 곳(asset_loader)에서 로드한 이미지를 캐시에 넣고 참조 수를 하나 늘립니다 (image()와 같음).
+    다 쓰면 release() 하세요. 이미 캐시에 있으면 기존 것의 참조를 늘려서 돌려줍니다."""
+    global total_bytes
+    path = _resolve(path)
+    key = _key(path)
+    entry = _entries.get(key)
+    if entry is not None:
+        entry['refs'] += 1
+        _entries.move_to_end(key)
+        return entry['resource']
+    size = getattr(resource, 'w', 0) * getattr(resource, 'h', 0) * 4
+    _entries[key] = {'resource': resource, 'refs': 1, 'bytes': size, 'kind': 'image', 'path': path}
+    _keys_by_id[id(resource)] = key
+    _failed.pop(key, None)
+    total_bytes += size
+    _evict()
+    return resource
+
+
+def is_cached(path):
+    return _key(_resolve(path)) in _entries
+
+
+def wav(path):
+    """효과음(Mix_Chunk)을 로드(또는 캐시에서 꺼내)고 참조 수를 하나 늘립니다."""
+    path = _resolve(path)
+    return _acquire(_key(path), 'wav', path, lambda: load_wav(path))
+
+
+def release(resource):
+    """image()/font()로 받은 자원의 참조를 하나 줄입니다. 캐시에 없는 자원이면 무시합니다."""
+    if resource is None:
+        return
+    key = _keys_by_id.get(id(resource))
+    entry = _entries.get(key) if key is not None else None
+    if entry is None or entry['refs'] == 0:
+        return
+    entry['refs'] -= 1
+    if entry['refs'] == 0:
+        _evict()
+
+
+def _evict():
+    """예산을 넘으면 참조가 없는 항목을 오래 안 쓴 순서대로 내보냅니다."""
+    global total_bytes
+    if total_bytes <= BUDGET_BYTES:
+        return
+    for key in [k for k, e in _entries.items() if e['refs'] == 0]:
+        entry = _entries.pop(key)
+        _keys_by_id.pop(id(entry['resource']), None)
+        total_bytes -= entry['bytes']
+        stats['evictions'] += 1
+        stats['evicted_bytes'] += entry['bytes']
+        if total_bytes <= BUDGET_BYTES:
+            break
+
+
+def set_budget(budget_bytes):
+    global BUDGET_BYTES
+    BUDGET_BYTES = budget_bytes
+    _evict()
+
+
+def clear():
+    """캐시를 모두 비웁니다 (통계는 유지). 아직 쓰는 쪽이 있는 자원도 목록에서 빠집니다."""
+    global total_bytes
+    _entries.clear()
+    _keys_by_id.clear()
+    _failed.clear()
+    total_bytes = 0
+
+
+def report():
+    """통계와 현재 캐시 상태를 돌려줍니다."""
+    lookups = stats['hits'] + stats['misses']
+    return dict(stats,
+                entries=len(_entries),
+                referenced=sum(1 for e in _entries.values() if e['refs'] > 0),
+                bytes=total_bytes,
+                budget=BUDGET_BYTES,
+                hit_rate=stats['hits'] / lookups if lookups else 0.0)
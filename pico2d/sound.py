@@ -0,0 +1,217 @@
+# sound.py
+# 효과음/배경음 관리
+#
+# - 효과음(snd_*.mp3)은 preload()로 미리 디코딩해서 resources 캐시에 보관합니다.
+#   (발사/피격 순간에 load_wav()를 부르면 디코딩 때문에 프레임이 끊김)
+# - 배경음(*.ogg)은 load_music()으로 스트리밍 재생합니다 (한 번에 하나).
+# - 효과음은 CHANNELS개 채널 풀에서 재생하고, 빈 채널이 없으면 우선순위가 더 낮은 소리를 끊고 재생합니다.
+# - play()는 바로 재생하지 않고 모아 두었다가 update()에서 한 번에 재생하므로,
+#   같은 틱에 같은 소리가 50번 요청돼도(공 50개가 Guard에 맞는 경우 등) 한 번만, 조금 크게 재생됩니다.
+
+import math
+import time
+
+from pico2d import *
+import resources
+
+try:
+    from sdl2.sdlmixer import (Mix_AllocateChannels, Mix_PlayChannel, Mix_Playing,
+                               Mix_HaltChannel, Mix_Volume)
+except ImportError:
+    Mix_PlayChannel = None
+
+SOUND_DIR = 'assets'
+CHANNELS = 16
+MAX_VOLUME = 128
+
+# 믹서가 없을 때(headless 등) 채널이 차 있다고 보는 시간 (초)
+FALLBACK_DURATION = 0.5
+
+# 효과음 이름 -> (파일, 우선순위, 볼륨 0~128). 우선순위가 높을수록 채널을 뺏을 수 있음
+SFX = {
+    'hit': ('snd_hit.mp3', 2, 96),
+    'zap': ('snd_zap.mp3', 1, 64),
+    'death': ('snd_death.mp3', 3, 112),
+    'miss': ('snd_miss.mp3', 1, 64),
+    'step': ('snd_step.mp3', 0, 48),
+    'click': ('snd_click.mp3', 3, 96),
+    'item': ('snd_item.mp3', 2, 96),
+    'levelup': ('snd_levelup.mp3', 3, 112),
+}
+
+MUSIC = {
+    'title': 'surface.ogg',
+    'game': 'game.ogg',
+}
+
+enabled = True
+
+_initialized = False
+_channels = []          # 채널 번호 -> [이름, 우선순위, 시작 시각, 끝 시각(믹서 없을 때)] 또는 None
+_requests = {}          # 이번 틱에 요청된 효과음 이름 -> [요청 수, 우선순위, 볼륨]
+_sounds = {}            # 효과음 이름 -> 디코딩한 효과음 (resources 참조를 하나씩 잡고 있음)
+_music = None
+_music_name = None
+
+stats = {'requested': 0, 'played': 0, 'collapsed': 0, 'stolen': 0, 'dropped': 0,
+         'failed': 0, 'voices': 0, 'peak_voices': 0}
+
+
+def _init():
+    global _initialized, _channels
+    if _initialized:
+        return
+    _initialized = True
+    _channels = [None] * CHANNELS
+    if Mix_PlayChannel is not None:
+        try:
+            Mix_AllocateChannels(CHANNELS)
+        except Exception as e:
+            print(f"[sound] 채널 할당 실패: {e}")
+
+
+def _path(file_name):
+    return f'{SOUND_DIR}/{file_name}'
+
+
+def _load(name):
+    wav = _sounds.get(name)
+    if wav is None:
+        file_name = SFX[name][0] if name in SFX else name
+        wav = _sounds[name] = resources.wav(_path(file_name))
+    return wav
+
+
+def preload(names=None):
+    """효과음을 미리 디코딩해 둡니다 (names가 없으면 SFX 전체). 실패한 것은 건너뜁니다."""
+    _init()
+    for name in (names if names is not None else SFX):
+        try:
+            _load(name)
+        except Exception as e:
+            print(f"[sound] {name} 로드 실패: {e}")
+
+
+def release():
+    """preload()/play()로 잡은 효과음 참조를 모두 돌려줍니다 (다음에 재생하면 다시 가져옴)."""
+    for wav in _sounds.values():
+        resources.release(wav)
+    _sounds.clear()
+
+
+def play(name, priority=None, volume=None):
+    """효과음 재생을 요청합니다. 실제 재생은 update()에서 합니다."""
+    if not enabled:
+        return
+    stats['requested'] += 1
+    request = _requests.get(name)
+    if request is not None:
+        request[0] += 1
+        stats['collapsed'] += 1
+        return
+    _, default_priority, default_volume = SFX.get(name, (name, 1, MAX_VOLUME))
+    _requests[name] = [1,
+                       priority if priority is not None else default_priority,
+                       volume if volume is not None else default_volume]
+
+
+def _is_busy(channel, now):
+    slot = _channels[channel]
+    if slot is None:
+        return False
+    if Mix_PlayChannel is not None:
+        busy = bool(Mix_Playing(channel))
+    else:
+        busy = now < slot[3]
+    if not busy:
+        _channels[channel] = None
+    return busy
+
+
+def _pick_channel(priority, now):
+    """빈 채널, 없으면 priority보다 낮은 소리 중 가장 오래된 채널. 둘 다 없으면 -1."""
+    victim = -1
+    for channel in range(CHANNELS):
+        if not _is_busy(channel, now):
+            return channel
+        slot = _channels[channel]
+        if slot[1] < priority and (victim < 0 or (slot[1], slot[2]) < (_channels[victim][1], _channels[victim][2])):
+            victim = channel
+    if victim >= 0:
+        stats['stolen'] += 1
+        if Mix_PlayChannel is not None:
+            Mix_HaltChannel(victim)
+    return victim
+
+
+def update():
+    """이번 틱에 모인 효과음 요청을 우선순위가 높은 것부터 재생합니다. 틱마다 한 번 호출하세요."""
+    if not _requests:
+        _count_voices()
+        return
+    _init()
+    now = time.perf_counter()
+    requests = sorted(_requests.items(), key=lambda kv: -kv[1][1])
+    _requests.clear()
+
+    for name, (count, priority, volume) in requests:
+        try:
+            wav = _load(name)
+        except Exception:
+            stats['failed'] += 1
+            continue
+        channel = _pick_channel(priority, now)
+        if channel < 0:
+            stats['dropped'] += 1
+            continue
+        # 여러 번 겹친 소리는 한 번만, 겹친 수에 따라 조금 크게
+        if count > 1:
+            volume = min(MAX_VOLUME, int(volume * (1.0 + 0.25 * math.log2(count))))
+        if Mix_PlayChannel is not None:
+            Mix_Volume(channel, volume)
+            Mix_PlayChannel(channel, wav.wav, 0)
+        else:
+            wav.set_volume(volume)
+            wav.play()
+        _channels[channel] = [name, priority, now, now + FALLBACK_DURATION]
+        stats['played'] += 1
+    _count_voices()
+
+
+def _count_voices():
+    if not _initialized:
+        return
+    now = time.perf_counter()
+    voices = sum(1 for channel in range(CHANNELS) if _is_busy(channel, now))
+    stats['voices'] = voices
+    stats['peak_voices'] = max(stats['peak_voices'], voices)
+
+
+def play_music(name, loop=True):
+    """배경음을 스트리밍 재생합니다. 이미 같은 곡이 나오고 있으면 그대로 둡니다."""
+    global _music, _music_name
+    if not enabled or name == _music_name:
+        return
+    stop_music()
+    try:
+        _music = load_music(_path(MUSIC.get(name, name)))
+    except Exception as e:
+        print(f"[sound] 배경음 {name} 로드 실패: {e}")
+        return
+    _music_name = name
+    if loop:
+        _music.repeat_play()
+    else:
+        _music.play()
+
+
+def stop_music():
+    global _music, _music_name
+    if _music is not None:
+        _music.stop()
+    _music = None
+    _music_name = None
+
+
+def report():
+    return dict(stats, channels=CHANNELS, pending=len(_requests), music=_music_name)
@@ -0,0 +1,172 @@
+# startup_trace.py
+# 실행부터 첫 화면이 그려질 때까지의 시작 시간 추적기
+#
+#   python main.py --startup-trace
+#
+# install()은 다른 게임 모듈을 import 하기 전에 불러야 합니다 (headless.install() 다음).
+# - 모듈별 import 시간 (처음 로드될 때만, 자기 시간 = 전체 - 하위 import)
+# - 에셋별 로드 시간 (load_image / load_font / load_wav / load_music)
+# - open_canvas (SDL 초기화) 시간
+# 을 기록하고, game_framework가 첫 프레임을 화면에 올린 직후 first_frame()에서 보고서를 출력합니다.
+
+import builtins
+import importlib.util
+import sys
+import time
+
+# 보고서에 표시할 최대 행 수
+TOP_MODULES = 15
+TOP_PACKAGES = 10
+
+active = False
+
+_t0 = 0.0
+_original_import = None
+_imports = []       # (모듈 이름, 자기 시간, 전체 시간)
+_child_time = []    # import 중첩 단계별 하위 import 누적 시간
+_assets = []        # (종류, 경로, 초, 성공 여부)
+_phases = []        # (이름, 초)
+_result = None
+
+_ASSET_LOADERS = {
+    'load_image': 'image',
+    'load_font': 'font',
+    'load_wav': 'wav',
+    'load_music': 'music',
+}
+_PHASE_CALLS = ('open_canvas',)
+
+
+def _module_name(name, globals, level):
+    if level == 0:
+        return name
+    package = (globals or {}).get('__package__') or ''
+    try:
+        return importlib.util.resolve_name('.' * level + name, package)
+    except (ImportError, ValueError):
+        return name
+
+
+def _traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+    full_name = _module_name(name, globals, level)
+    if not active or full_name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _child_time.append(0.0)
+    t0 = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        total = time.perf_counter() - t0
+        children = _child_time.pop()
+        if _child_time:
+            _child_time[-1] += total
+        _imports.append((full_name, total - children, total))
+
+
+def _timed_loader(kind, loader):
+    def load(name, *args, **kwargs):
+        if not active:
+            return loader(name, *args, **kwargs)
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            result = loader(name, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            _assets.append((kind, name, time.perf_counter() - t0, ok))
+    return load
+
+
+def _timed_phase(name, func):
+    def call(*args, **kwargs):
+        if not active:
+            return func(*args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _phases.append((name, time.perf_counter() - t0))
+    return call
+
+
+def install():
+    """import 훅을 걸고 pico2d의 로드 함수들을 시간 측정 함수로 바꿉니다."""
+    global active, _t0, _original_import
+    if active:
+        return
+    active = True
+    _t0 = time.perf_counter()
+    _original_import = builtins.__import__
+    builtins.__import__ = _traced_import
+
+    # 다른 모듈이 'from pico2d import *'로 복사해 가기 전에 바꿔 두어야 함
+    import pico2d
+    for attr, kind in _ASSET_LOADERS.items():
+        if hasattr(pico2d, attr):
+            setattr(pico2d, attr, _timed_loader(kind, getattr(pico2d, attr)))
+    for attr in _PHASE_CALLS:
+        if hasattr(pico2d, attr):
+            setattr(pico2d, attr, _timed_phase(attr, getattr(pico2d, attr)))
+
+
+def first_frame():
+    """첫 프레임을 올린 직후 호출됩니다. 추적을 멈추고 보고서를 출력/반환합니다."""
+    global active, _result
+    if not active:
+        return _result
+    elapsed = time.perf_counter() - _t0
+    active = False
+    builtins.__import__ = _original_import
+
+    _result = {
+        'first_frame_ms': elapsed * 1000.0,
+        'imports': [{'module': m, 'self_ms': s * 1000.0, 'total_ms': t * 1000.0}
+                    for m, s, t in _imports],
+        'assets': [{'kind': k, 'path': p, 'ms': s * 1000.0, 'ok': ok}
+                   for k, p, s, ok in _assets],
+        'phases': [{'name': n, 'ms': s * 1000.0} for n, s in _phases],
+    }
+    _print_report(_result)
+    return _result
+
+
+def report():
+    """마지막 보고서 (first_frame() 전이면 None)."""
+    return _result
+
+
+def _print_report(result):
+    imports = result['imports']
+    import_ms = sum(i['self_ms'] for i in imports)
+    asset_ms = sum(a['ms'] for a in result['assets'])
+
+    print(f"[startup] first frame after {result['first_frame_ms']:.1f} ms "
+          f"(imports {import_ms:.1f} ms / {len(imports)} modules, "
+          f"assets {asset_ms:.1f} ms / {len(result['assets'])} files)")
+
+    # 최상위 패키지별 합계 (numpy 같은 큰 패키지는 하위 모듈이 많으므로)
+    packages = {}
+    for i in imports:
+        root = i['module'].split('.')[0]
+        ms, count = packages.get(root, (0.0, 0))
+        packages[root] = (ms + i['self_ms'], count + 1)
+    print("  packages (self ms, modules):")
+    for root, (ms, count) in sorted(packages.items(), key=lambda kv: -kv[1][0])[:TOP_PACKAGES]:
+        print(f"    {ms:8.1f}  {count:4d}  {root}")
+
+    print("  modules (self ms, total ms):")
+    for i in sorted(imports, key=lambda i: -i['self_ms'])[:TOP_MODULES]:
+        print(f"    {i['self_ms']:8.1f}  {i['total_ms']:8.1f}  {i['module']}")
+
+    if result['phases']:
+        print("  phases (ms):")
+        for p in result['phases']:
+            print(f"    {p['ms']:8.1f}  {p['name']}")
+
+    if result['assets']:
+        print("  assets (ms):")
+        for a in result['assets']:
+            status = '' if a['ok'] else '  (실패)'
+            print(f"    {a['ms']:8.1f}  {a['kind']:<6} {a['path']}{status}")
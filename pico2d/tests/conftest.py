@@ -0,0 +1,22 @@
+# conftest.py
+# 테스트는 창 없이 headless 백엔드로 돌립니다 (게임 모듈을 import 하기 전에 install() 해야 함).
+#
+#     cd pico2d && python -m pytest -q
+
+import os
+import sys
+
+import pytest
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import headless
+
+headless.install()
+
+
+@pytest.fixture(autouse=True)
+def _game_dir(monkeypatch):
+    # 에셋 경로('assets/...')가 게임 폴더 기준 상대 경로이므로 거기서 실행
+    monkeypatch.chdir(GAME_DIR)
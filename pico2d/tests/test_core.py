@@ -0,0 +1,320 @@
+# test_core.py
+# 충돌(브로드페이즈, 스윕, 지연 제거), 벽 격자, 길찾기, 자원 캐시 테스트 (headless 백엔드)
+
+import math
+import random
+
+import pytest
+
+import game_world
+import pathfinding
+import resources
+from collision_map import CollisionMap
+
+
+class Box:
+    """get_bb()만 있는 충돌 테스트용 객체."""
+
+    def __init__(self, bb, groups):
+        self.bb = bb
+        self.collision_groups = groups
+
+    def get_bb(self):
+        return self.bb
+
+
+class Mover(Box):
+    """틱마다 (dx, dy)만큼 움직이는 객체."""
+
+    def __init__(self, bb, groups, dx, dy=0):
+        super().__init__(bb, groups)
+        self.dx, self.dy = dx, dy
+
+    def update(self):
+        x1, y1, x2, y2 = self.bb
+        self.bb = (x1 + self.dx, y1 + self.dy, x2 + self.dx, y2 + self.dy)
+
+
+class FastMover(Mover):
+    swept_collision = True
+
+
+@pytest.fixture
+def world():
+    game_world.init()
+    yield game_world
+    game_world.init()
+
+
+def _record_pairs(name, a, b):
+    hits = []
+    game_world.add_collision_pair(a, b, name,
+                                  lambda group, x, y: hits.append((x, y, game_world.collision_toi)))
+    return hits
+
+
+def _walled_map():
+    """10 x 8칸(16px) 격자. 5열의 0~5행이 벽이고 6, 7행은 뚫려 있음."""
+    cmap = CollisionMap(10, 8, 16)
+    for row in range(6):
+        cmap.set_solid(5, row)
+    return cmap
+
+
+# -----------------------------
+# 브로드페이즈
+# -----------------------------
+def _random_box(rng):
+    x, y = rng.uniform(-300, 900), rng.uniform(-300, 900)
+    w, h = rng.choice((rng.uniform(1, 40), rng.uniform(40, 300))), rng.uniform(1, 200)
+    return x, y, x + w, y + h
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_broad_phase_matches_brute_force(world, seed):
+    rng = random.Random(seed)
+    group_a = [Box(_random_box(rng), ('a',)) for _ in range(60)]
+    group_b = [Box(_random_box(rng), ('b',)) for _ in range(60)]
+    # 경계가 딱 맞닿는 쌍도 충돌로 봄
+    group_b.append(Box((group_a[0].bb[2], group_a[0].bb[1], group_a[0].bb[2] + 5, group_a[0].bb[3]), ('b',)))
+    for obj in group_a + group_b:
+        world.add_object(obj, 1)
+    hits = _record_pairs('a:b', 'a', 'b')
+
+    world.check_collisions()
+
+    expected = {(a, b) for a in group_a for b in group_b
+                if not (a.bb[2] < b.bb[0] or a.bb[0] > b.bb[2] or a.bb[3] < b.bb[1] or a.bb[1] > b.bb[3])}
+    found = [(a, b) for a, b, _ in hits]
+    assert len(found) == len(set(found))
+    assert set(found) == expected
+    assert all(toi == 1.0 for _, _, toi in hits)
+
+
+# -----------------------------
+# 스윕 충돌 / 지연 제거
+# -----------------------------
+def test_swept_aabb_time_of_impact():
+    # x 0~10 -> 100~110 으로 움직이는 박스가 50~60의 정지 박스에 닿는 시각
+    assert game_world.swept_aabb((0, 0, 10, 10), (100, 0, 110, 10),
+                                 (50, 0, 60, 10), (50, 0, 60, 10)) == pytest.approx(0.4)
+    # 위로 비켜 지나가면 닿지 않음
+    assert game_world.swept_aabb((0, 20, 10, 30), (100, 20, 110, 30),
+                                 (50, 0, 60, 10), (50, 0, 60, 10)) is None
+    # 처음부터 겹쳐 있으면 0
+    assert game_world.swept_aabb((45, 0, 55, 10), (145, 0, 155, 10),
+                                 (50, 0, 60, 10), (50, 0, 60, 10)) == 0.0
+
+
+def test_fast_object_does_not_tunnel(world):
+    target = Box((50, 0, 60, 10), ('target',))
+    fast = FastMover((0, 0, 10, 10), ('shot',), 100)
+    slow = Mover((0, 20, 10, 30), ('shot',), 100)
+    world.add_object(Box((50, 20, 60, 30), ('target',)), 1)
+    for obj in (target, fast, slow):
+        world.add_object(obj, 1)
+    hits = _record_pairs('shot:target', 'shot', 'target')
+
+    world.update()
+
+    # 느린 객체는 틱 끝 위치만 보므로 대상을 건너뛰어 지나감. 빠른 객체는 경로에서 닿은 시각이 같이 옴
+    assert [(a, b) for a, b, _ in hits] == [(fast, target)]
+    assert hits[0][2] == pytest.approx(0.4)
+    assert world.collision_toi is None
+
+
+def test_removal_is_deferred_until_flush(world):
+    shot = Box((0, 0, 10, 10), ('shot',))
+    first, second = Box((5, 0, 15, 10), ('target',)), Box((8, 0, 18, 10), ('target',))
+    for obj in (shot, first, second):
+        world.add_object(obj, 1)
+    seen = []
+
+    def handler(group, a, b):
+        # 제거는 대기열에만 들어가고 이번 틱에는 레이어에 남아 있음
+        world.remove_object(a)
+        world.remove_object(a)
+        seen.append((b, world.is_removed(a), a in world.objects[1]))
+
+    world.add_collision_pair('shot', 'target', 'shot:target', handler)
+    world.update()
+
+    # 제거 대기 중인 탄은 두 번째 적과 더 충돌하지 않음
+    assert seen == [(first, True, True)]
+    assert shot not in world.objects[1]
+    assert shot not in world.group_members['shot']
+    assert world.is_removed(shot)
+    assert set(world.objects[1]) == {first, second}
+
+
+# -----------------------------
+# 벽 격자
+# -----------------------------
+def test_sweep_stops_at_walls():
+    cmap = _walled_map()
+    box = (10, 10, 20, 20)
+    assert cmap.sweep(box, 100, 0) == (60, 0)
+    # 격자 밖은 벽
+    assert cmap.sweep(box, -100, 0) == (-10, 0)
+    assert cmap.sweep(box, 0, -50) == (0, -10)
+    # x로 막힌 뒤 y로는 미끄러짐
+    assert cmap.sweep(box, 100, 30) == (60, 30)
+    # 뚫린 행(6, 7행)으로는 지나감
+    assert cmap.sweep((10, 100, 20, 110), 100, 0) == (100, 0)
+    # 이미 겹친 칸은 무시해서 빠져나올 수 있음
+    assert cmap.sweep((78, 10, 88, 20), -20, 0) == (-20, 0)
+
+
+def test_raycast_hits_first_solid_cell():
+    cmap = _walled_map()
+    assert cmap.raycast(8, 8, 150, 8) == (80, 8, 5, 0)
+    assert cmap.raycast(150, 8, 8, 8) == (96, 8, 5, 0)
+    assert cmap.raycast(8, 104, 150, 104) is None
+    # 시작점이 벽 안이면 시작점
+    assert cmap.raycast(85, 8, 150, 8) == (85, 8, 5, 0)
+
+    x, y, col, row = cmap.raycast(8, 8, 150, 40)
+    assert (col, row) == (5, 1)
+    assert x == pytest.approx(80)
+    assert y == pytest.approx(8 + 32 * 72 / 142)
+
+
+def test_segment_hits_matches_raycast():
+    np = pytest.importorskip('numpy')
+    rng = random.Random(3)
+    cmap = CollisionMap(20, 15, 16)
+    for _ in range(60):
+        cmap.set_solid(rng.randrange(20), rng.randrange(15))
+
+    x0 = np.array([rng.uniform(-10, 330) for _ in range(500)])
+    y0 = np.array([rng.uniform(-10, 250) for _ in range(500)])
+    x1 = x0 + np.array([rng.uniform(-80, 80) for _ in range(500)])
+    y1 = y0 + np.array([rng.uniform(-80, 80) for _ in range(500)])
+    t = cmap.segment_hits(x0, y0, x1, y1)
+
+    for i in range(len(t)):
+        hit = cmap.raycast(x0[i], y0[i], x1[i], y1[i])
+        if hit is None:
+            assert math.isinf(t[i])
+        else:
+            assert x0[i] + (x1[i] - x0[i]) * t[i] == pytest.approx(hit[0])
+            assert y0[i] + (y1[i] - y0[i]) * t[i] == pytest.approx(hit[1])
+
+
+# -----------------------------
+# 길찾기
+# -----------------------------
+def _path_cost(cmap, start, path):
+    cost = 0.0
+    col, row = cmap.cell_at(*start)
+    for x, y in path:
+        c, r = cmap.cell_at(x, y)
+        assert not cmap.is_solid(c, r)
+        assert max(abs(c - col), abs(r - row)) == 1
+        if c != col and r != row:
+            # 대각선은 벽 모서리를 가로지르지 않음
+            assert not cmap.is_solid(c, row) and not cmap.is_solid(col, r)
+            cost += pathfinding.DIAGONAL_COST
+        else:
+            cost += 1.0
+        col, row = c, r
+    return cost
+
+
+def test_find_path_goes_around_wall():
+    cmap = _walled_map()
+    path = pathfinding.find_path(8, 8, 150, 8, cmap)
+    assert path is not None
+    assert path[-1] == (152, 8)
+    assert any(cmap.cell_at(x, y)[1] >= 6 for x, y in path)
+    cost = _path_cost(cmap, (8, 8), path)
+
+    # 흐름장으로 따라간 길도 같은 거리
+    game_world.init()
+    game_world.set_collision_map(cmap)
+    target = Box(None, ())
+    target.x, target.y = 150, 8
+    pathfinding.update(target)
+    assert pathfinding.distance(8, 8) / cmap.cell_w == pytest.approx(cost)
+
+    x, y, steps = 8, 8, []
+    while (waypoint := pathfinding.next_waypoint(x, y)) is not None:
+        assert pathfinding.distance(*waypoint) < pathfinding.distance(x, y)
+        x, y = waypoint
+        steps.append(waypoint)
+    assert cmap.cell_at(x, y) == cmap.cell_at(150, 8)
+    assert _path_cost(cmap, (8, 8), steps) == pytest.approx(cost)
+    game_world.init()
+
+
+def test_find_path_unreachable():
+    cmap = _walled_map()
+    cmap.set_solid(5, 6)
+    cmap.set_solid(5, 7)
+    assert pathfinding.find_path(8, 8, 150, 8, cmap) is None
+    # 격자 밖
+    assert pathfinding.find_path(8, 8, 500, 8, cmap) is None
+
+
+# -----------------------------
+# 자원 캐시
+# -----------------------------
+@pytest.fixture
+def cache():
+    budget = resources.BUDGET_BYTES
+    resources.clear()
+    yield resources
+    resources.clear()
+    resources.set_budget(budget)
+
+
+def _refs(path):
+    return resources._entries[resources._key(resources._resolve(path))]['refs']
+
+
+def test_resources_share_and_count_refs(cache):
+    hits = cache.stats['hits']
+    image = cache.image('assets/guard.png')
+    # assets/ 없이 불러도 같은 파일이면 같은 이미지
+    assert cache.image('guard.png') is image
+    assert _refs('assets/guard.png') == 2
+    assert cache.stats['hits'] == hits + 1
+
+    cache.release(image)
+    cache.release(image)
+    cache.release(image)     # 0 아래로는 내려가지 않음
+    assert _refs('assets/guard.png') == 0
+    # 참조가 없어도 예산 안이면 캐시에 남음
+    assert cache.is_cached('assets/guard.png')
+    assert cache.report()['referenced'] == 0
+
+
+def test_resources_evict_unreferenced_lru(cache):
+    guard = cache.image('assets/guard.png')
+    bat = cache.image('assets/bat.png')
+    cache.release(guard)
+    cache.release(bat)
+    # guard를 다시 써서 bat이 가장 오래 안 쓴 항목이 됨
+    cache.release(cache.image('assets/guard.png'))
+
+    cache.set_budget((guard.w * guard.h + 256 * 64) * 4)
+    rat = cache.image('assets/rat.png')
+    assert not cache.is_cached('assets/bat.png')
+    assert cache.is_cached('assets/guard.png')
+    assert cache.total_bytes <= cache.BUDGET_BYTES
+
+    # 참조 중인 항목은 예산을 넘어도 내보내지 않음
+    cache.set_budget(0)
+    assert cache.is_cached('assets/rat.png')
+    assert not cache.is_cached('assets/guard.png')
+    cache.release(rat)
+    assert not cache.is_cached('assets/rat.png')
+
+
+def test_resources_remember_failures(cache):
+    failures = cache.stats['failures']
+    for _ in range(2):
+        with pytest.raises(IOError):
+            cache.image('assets/no_such_image.png')
+    assert cache.stats['failures'] == failures + 2
+    assert cache.stats['misses'] >= 1
@@ -0,0 +1,171 @@
+# text_cache.py
+# 글자를 텍스처로 한 번만 렌더링해서 다시 쓰는 텍스트 캐시
+#
+# pico2d Font.draw()는 부를 때마다 TTF 래스터화 -> 텍스처 생성 -> 삭제를 하므로
+# 매 프레임 같은 문자열을 그리면 그만큼 낭비입니다.
+#
+# - 고정 문자열(타이틀 문구, 'BAT' 같은 라벨)은 (폰트, 크기, 문자열, 색) 하나당 텍스처 하나로 만들어
+#   LRU로 보관합니다 (MAX_LABELS개를 넘으면 가장 오래 안 쓴 것부터 버림).
+# - 매 프레임 바뀌는 숫자(HP, 프로파일러 수치 등)는 문자열마다 텍스처를 만들면 캐시만 휘저으므로,
+#   GLYPHS 글자들을 한 장의 띠 텍스처로 구워 두고 글자마다 clip_draw 합니다 (draw_glyphs).
+#
+#     font = text_cache.font('ENCR10B.TTF', 24)     # 실패하면 resources.font처럼 예외
+#     font.draw(x, y, '게임 시작', (255, 255, 255))    # Font.draw와 같은 좌표 (x = 왼쪽, y = 가운데)
+#     font.draw_glyphs(x, y, f'HP {hp}', (255, 255, 255))
+#
+# 실제 pico2d 렌더러가 없으면(headless 등) 텍스처를 만들 수 없으므로 원래 Font.draw로 그립니다.
+
+from collections import OrderedDict
+import ctypes
+
+from pico2d import *
+import resources
+
+try:
+    from sdl2 import SDL_Color, SDL_CreateTextureFromSurface, SDL_FreeSurface
+    from sdl2.sdlttf import TTF_RenderUTF8_Blended, TTF_SizeUTF8
+except ImportError:
+    TTF_RenderUTF8_Blended = None
+
+MAX_LABELS = 256
+
+# 띠 텍스처로 굽는 글자 (출력 가능한 ASCII 전부). 이 밖의 글자가 섞이면 문자열째로 라벨 캐시를 씀
+GLYPHS = ''.join(chr(c) for c in range(32, 127))
+
+_fonts = {}             # (경로, 크기) -> TextFont
+_labels = OrderedDict() # (경로, 크기, 문자열, 색) -> 라벨 (LRU 순서)
+
+stats = {'hits': 0, 'misses': 0, 'evicted': 0, 'glyph_strips': 0, 'fallback': 0}
+
+
+def _render(ttf, text, color):
+    """text를 텍스처(pico2d Image)로 렌더링합니다. 렌더러가 없으면 None."""
+    backend = resources.texture_backend() if TTF_RenderUTF8_Blended is not None else None
+    if backend is None or not text:
+        return None
+    renderer, image_class = backend
+    surface = TTF_RenderUTF8_Blended(ttf.font, text.encode('utf-8'), SDL_Color(*color[:3]))
+    if not surface:
+        return None
+    texture = SDL_CreateTextureFromSurface(renderer, surface)
+    SDL_FreeSurface(surface)
+    if not texture:
+        return None
+    return image_class(texture)
+
+
+def _text_width(ttf, text):
+    w, h = ctypes.c_int(), ctypes.c_int()
+    TTF_SizeUTF8(ttf.font, text.encode('utf-8'), ctypes.byref(w), ctypes.byref(h))
+    return w.value
+
+
+class _Label:
+    """미리 렌더링한 문자열 하나. 텍스처가 없으면 원래 폰트로 그립니다."""
+
+    def __init__(self, ttf, text, color):
+        self.image = _render(ttf, text, color)
+        if self.image is None:
+            self.ttf, self.text, self.color = ttf, text, color
+        self.w = self.image.w if self.image else 0
+        self.h = self.image.h if self.image else 0
+
+    def draw(self, x, y):
+        if self.image:
+            self.image.draw(x + self.w / 2, y)
+        else:
+            stats['fallback'] += 1
+            self.ttf.draw(x, y, self.text, self.color)
+
+
+class _GlyphStrip:
+    """GLYPHS를 한 줄로 렌더링한 텍스처와 글자별 (왼쪽, 너비)."""
+
+    def __init__(self, ttf, color):
+        self.image = _render(ttf, GLYPHS, color)
+        self.cells = {}
+        if self.image is None:
+            return
+        # 앞 글자들까지의 너비 차이로 글자 위치를 구함 (커닝까지 띠 렌더링과 맞음)
+        left = 0
+        for i, ch in enumerate(GLYPHS):
+            right = _text_width(ttf, GLYPHS[:i + 1])
+            self.cells[ch] = (left, right - left)
+            left = right
+
+    def draw(self, x, y, text):
+        image, cells = self.image, self.cells
+        h = image.h
+        for ch in text:
+            left, w = cells[ch]
+            if ch != ' ':
+                image.clip_draw(left, 0, w, h, x + w / 2, y)
+            x += w
+
+
+class TextFont:
+    """pico2d Font와 같은 draw()를 가진, 렌더링 결과를 재사용하는 폰트."""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.ttf = resources.font(path, size)
+        self._strips = {}   # 색 -> _GlyphStrip
+
+    def label(self, text, color=(0, 0, 0)):
+        key = (self.path, self.size, text, tuple(color))
+        label = _labels.get(key)
+        if label is not None:
+            _labels.move_to_end(key)
+            stats['hits'] += 1
+            return label
+        stats['misses'] += 1
+        label = _labels[key] = _Label(self.ttf, text, tuple(color))
+        while len(_labels) > MAX_LABELS:
+            _labels.popitem(last=False)
+            stats['evicted'] += 1
+        return label
+
+    def draw(self, x, y, text, color=(0, 0, 0)):
+        self.label(text, color).draw(x, y)
+
+    def draw_glyphs(self, x, y, text, color=(0, 0, 0)):
+        """자주 바뀌는 문자열(숫자 등)을 글자 띠 텍스처에서 한 글자씩 그립니다."""
+        color = tuple(color)
+        strip = self._strips.get(color)
+        if strip is None:
+            strip = self._strips[color] = _GlyphStrip(self.ttf, color)
+            stats['glyph_strips'] += 1
+        if strip.image is None:
+            stats['fallback'] += 1
+            self.ttf.draw(x, y, text, color)
+        elif all(ch in strip.cells for ch in text):
+            strip.draw(x, y, text)
+        else:
+            self.draw(x, y, text, color)
+
+    def release(self):
+        resources.release(self.ttf)
+        self.ttf = None
+        self._strips.clear()
+
+
+def font(path, size):
+    """(path, size)의 TextFont. 한 번 만든 것은 clear() 전까지 계속 씁니다."""
+    key = (path, size)
+    text_font = _fonts.get(key)
+    if text_font is None:
+        text_font = _fonts[key] = TextFont(path, size)
+    return text_font
+
+
+def clear():
+    """라벨과 글자 띠 텍스처를 모두 버리고 폰트 참조를 돌려줍니다."""
+    _labels.clear()
+    for text_font in _fonts.values():
+        text_font.release()
+    _fonts.clear()
+
+
+def report():
+    return dict(stats, labels=len(_labels), fonts=len(_fonts))
@@ -0,0 +1,387 @@
+# tilemap.py
+# 청크 단위로 미리 구워 그리는 타일맵 레이어
+#
+# 타일 번호는 타일셋(예: assets/tiles_prison.png, 16x16 칸)의 칸 번호이고 (왼쪽 위부터 행 순서),
+# 맵 전체를 array('H') 하나에 담습니다 (행 0이 맨 아래, 월드 좌표와 같은 방향).
+#
+# 타일을 하나씩 clip_draw 하면 화면 하나에 수천 번을 부르게 되므로
+# CHUNK_TILES x CHUNK_TILES 타일 묶음(청크)을 이미지 한 장으로 합성해 두고 청크당 한 번만 그립니다.
+# - 합성한 이미지는 CACHE_DIR에 (타일셋 해시 + 청크 타일 내용) 해시 이름으로 저장해서 다음 실행에 다시 씁니다.
+#   파일이 CACHE_LIMIT개를 넘으면 지금 쓰지 않는 것부터 오래된 순서로 지웁니다 (prune_cache).
+# - set()으로 타일이 바뀐 청크(문이 열림, 약한 바닥이 무너짐 등)만 다시 굽습니다.
+#   게임 중에는 합성/저장/디코딩을 asset_loader 작업 스레드가 하고 update()는 텍스처 업로드만
+#   BAKE_BUDGET 안에서 하며, 그동안 그 청크는 타일 단위로 그립니다.
+# - 합성에는 Pillow가 필요합니다. 없으면 캐시에 이미 있는 청크만 쓰고 나머지는 타일 단위로 그립니다.
+#
+#     tiles = TileMap(32, 19, 'assets/tiles_prison.png', scale=3)
+#     tiles.fill_rect(2, 2, 10, 2, tilemap.PRISON_WALL)
+#     game_world.add_object(tiles, 0)
+
+from array import array
+import hashlib
+import os
+import threading
+import time
+
+from pico2d import *
+import asset_loader
+import asset_manifest
+import game_world
+import resources
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+TILE_SIZE = 16
+CHUNK_TILES = 16
+EMPTY = 0xFFFF          # 타일 없음 (뒤의 배경이 보임)
+
+CACHE_DIR = os.path.join(asset_manifest.CACHE_DIR, 'tile_cache')
+# 캐시에 남겨 두는 청크 이미지 수 (넘으면 지금 쓰지 않는 오래된 것부터 지움)
+CACHE_LIMIT = 256
+# update() 한 번에 청크 굽기(작업 시작, 텍스처 업로드)에 쓰는 최대 시간 (초)
+BAKE_BUDGET = 0.002
+
+# tiles_*.png (Pixel Dungeon 배치) 에서 자주 쓰는 칸 번호
+PRISON_FLOOR = 0
+PRISON_WALL = 64
+PRISON_DOOR = 80
+PRISON_DOOR_OPEN = 81
+PRISON_DOOR_LOCKED = 82
+# 지나갈 수 없는 칸 (collision_map.CollisionMap.from_tilemap에 넘김)
+PRISON_SOLID = frozenset({PRISON_WALL, PRISON_DOOR, PRISON_DOOR_LOCKED})
+
+
+class TileMap:
+    def __init__(self, cols, rows, tileset, scale=1.0, chunk_tiles=CHUNK_TILES, fill=EMPTY):
+        self.cols = cols
+        self.rows = rows
+        self.tileset = tileset
+        self.chunk_tiles = chunk_tiles
+        self.tiles = array('H', [fill]) * (cols * rows)
+
+        fw, fh, sheet_rows, sheet_cols, frames = asset_manifest.grid(tileset) or (TILE_SIZE, TILE_SIZE, 1, 1, 1)
+        self.tile_w, self.tile_h = fw, fh
+        self.sheet_rows, self.sheet_cols = sheet_rows, sheet_cols
+        info = asset_manifest.get(tileset)
+        self.tileset_hash = info['hash'] if info else os.path.basename(tileset)
+        self.image = resources.image(tileset)
+
+        # 화면에 그리는 타일 한 칸 크기 (월드 픽셀)
+        self.draw_w = fw * scale
+        self.draw_h = fh * scale
+        self.width = cols * self.draw_w
+        self.height = rows * self.draw_h
+
+        self.chunk_cols = (cols + chunk_tiles - 1) // chunk_tiles
+        self.chunk_rows = (rows + chunk_tiles - 1) // chunk_tiles
+        count = self.chunk_cols * self.chunk_rows
+        self._chunk_images = [None] * count     # 구운 청크 이미지 (없으면 타일 단위로 그림)
+        self._chunk_keys = [None] * count       # 구운 이미지의 내용 해시
+        self._dirty = dict.fromkeys(range(count))   # 다시 구워야 하는 청크 (순서 유지 집합)
+        self._jobs = {}                         # 작업 스레드에서 굽는 중인 청크 -> 작업 상태
+        self._sheet = None                      # Pillow로 연 타일셋 (처음 구울 때 한 번만 엶)
+
+        self.stats = {'baked': 0, 'cache_hits': 0, 'tile_draws': 0, 'chunk_draws': 0}
+
+        # 이 타일맵으로 만든 CollisionMap (있으면 set()할 때 같이 바꿈)
+        self.collision = None
+
+    # -----------------------------
+    # 타일 읽기/쓰기
+    # -----------------------------
+    def in_bounds(self, col, row):
+        return 0 <= col < self.cols and 0 <= row < self.rows
+
+    def get(self, col, row):
+        if not self.in_bounds(col, row):
+            return EMPTY
+        return self.tiles[row * self.cols + col]
+
+    def set(self, col, row, tile):
+        """타일 하나를 바꾸고, 실제로 바뀌었으면 그 청크를 다시 굽도록 표시합니다."""
+        if not self.in_bounds(col, row):
+            return
+        i = row * self.cols + col
+        if self.tiles[i] != tile:
+            self.tiles[i] = tile
+            self._dirty[self._chunk_index(col, row)] = None
+            if self.collision is not None:
+                self.collision.on_tile_changed(col, row, tile)
+
+    def fill_rect(self, col1, row1, col2, row2, tile):
+        """(col1, row1) ~ (col2, row2) 칸(양 끝 포함)을 tile로 채웁니다."""
+        for row in range(max(0, row1), min(self.rows, row2 + 1)):
+            for col in range(max(0, col1), min(self.cols, col2 + 1)):
+                self.set(col, row, tile)
+
+    def cell_at(self, x, y):
+        """월드 좌표가 속한 (col, row)."""
+        return int(x // self.draw_w), int(y // self.draw_h)
+
+    def tile_at(self, x, y):
+        return self.get(*self.cell_at(x, y))
+
+    # -----------------------------
+    # 청크 굽기
+    # -----------------------------
+    def _chunk_index(self, col, row):
+        return (row // self.chunk_tiles) * self.chunk_cols + col // self.chunk_tiles
+
+    def _chunk_cells(self, index):
+        """청크의 (첫 열, 첫 행, 열 수, 행 수)."""
+        ccol, crow = index % self.chunk_cols, index // self.chunk_cols
+        col1, row1 = ccol * self.chunk_tiles, crow * self.chunk_tiles
+        return col1, row1, min(self.chunk_tiles, self.cols - col1), min(self.chunk_tiles, self.rows - row1)
+
+    def _chunk_tiles(self, index):
+        col1, row1, w, h = self._chunk_cells(index)
+        tiles = array('H')
+        for row in range(row1, row1 + h):
+            start = row * self.cols + col1
+            tiles.extend(self.tiles[start:start + w])
+        return tiles, w, h
+
+    def _chunk_key(self, tiles, w, h):
+        digest = hashlib.sha1(f'{self.tileset_hash}:{self.tile_w}x{self.tile_h}:{w}x{h}:'.encode())
+        digest.update(tiles.tobytes())
+        return digest.hexdigest()[:16]
+
+    def _cell_rect(self, tile):
+        """타일셋에서 tile 칸의 (left, bottom, w, h) (clip_draw 좌표)."""
+        col, row = tile % self.sheet_cols, tile // self.sheet_cols
+        return col * self.tile_w, (self.sheet_rows - 1 - row) * self.tile_h, self.tile_w, self.tile_h
+
+    def _load_sheet(self):
+        """Pillow로 타일셋을 한 번만 열어 둡니다 (작업 스레드는 읽기만 하므로 여기서 디코딩까지 끝냄)."""
+        if self._sheet is None:
+            self._sheet = Image.open(self.tileset).convert('RGBA')
+        return self._sheet
+
+    def _compose(self, sheet, path, tiles, w, h):
+        """청크 이미지를 합성해서 path에 저장합니다. asset_loader 작업 스레드에서 실행됩니다."""
+        chunk = Image.new('RGBA', (w * self.tile_w, h * self.tile_h), (0, 0, 0, 0))
+        for i, tile in enumerate(tiles):
+            if tile == EMPTY:
+                continue
+            col, row = i % w, i // w
+            sx, sy = (tile % self.sheet_cols) * self.tile_w, (tile // self.sheet_cols) * self.tile_h
+            cell = sheet.crop((sx, sy, sx + self.tile_w, sy + self.tile_h))
+            # 타일 행 0이 맨 아래이므로 이미지(왼쪽 위 기준)에서는 뒤집어서 놓음
+            chunk.paste(cell, (col * self.tile_w, (h - 1 - row) * self.tile_h))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 다 쓴 파일만 보이도록 임시 파일에 저장한 뒤 이름을 바꿈
+        temp = f'{path}.{threading.get_ident()}.tmp'
+        chunk.save(temp, format='PNG')
+        os.replace(temp, path)
+
+    def _prepare(self, index):
+        """청크를 다시 구울 준비: 이전 이미지를 돌려주고 (키, 저장 경로, 타일)을 돌려줍니다.
+        빈 청크거나 구울 수 없으면 path는 None (타일 단위로 그림)."""
+        tiles, w, h = self._chunk_tiles(index)
+        old = self._chunk_images[index]
+        self._chunk_images[index] = None
+        if old is not None:
+            resources.release(old)
+
+        if all(t == EMPTY for t in tiles):
+            self._chunk_keys[index] = None
+            return None, None, None
+        key = self._chunk_key(tiles, w, h)
+        self._chunk_keys[index] = key
+        path = os.path.join(CACHE_DIR, f'{key}.png')
+        if os.path.exists(path):
+            self.stats['cache_hits'] += 1
+            # 최근에 쓴 파일은 prune_cache()에서 남기도록 수정 시각을 갱신
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return key, path, None
+        if Image is None:
+            return key, None, None
+        return key, path, (tiles, w, h)
+
+    def _bake(self, index):
+        """청크 하나를 지금 굽고 로드합니다 (메인 스레드에서 바로)."""
+        key, path, work = self._prepare(index)
+        if path is None:
+            return
+        if work is not None:
+            try:
+                self._compose(self._load_sheet(), path, *work)
+            except Exception as e:
+                print(f"[tilemap] 청크 {index} 굽기 실패: {e}")
+                return
+            self.stats['baked'] += 1
+        try:
+            self._chunk_images[index] = resources.image(path)
+        except Exception as e:
+            print(f"[tilemap] {path} 로드 실패: {e}")
+
+    def bake_all(self):
+        """바뀐 청크를 모두 지금 굽습니다 (로딩 화면 등)."""
+        self._cancel_jobs()
+        for index in list(self._dirty):
+            self._bake(index)
+        self._dirty.clear()
+        prune_cache(self._chunk_keys)
+
+    # -----------------------------
+    # 게임 중 다시 굽기 (작업 스레드)
+    # -----------------------------
+    def _start_job(self, index):
+        """합성/저장과 파일 디코딩은 asset_loader 작업 스레드에 맡기고, 텍스처 업로드만 나중에 update()에서 합니다."""
+        key, path, work = self._prepare(index)
+        if path is None:
+            return
+        job = {'key': key, 'path': path, 'future': None, 'handle': None}
+        if work is not None:
+            try:
+                sheet = self._load_sheet()
+            except Exception as e:
+                print(f"[tilemap] {self.tileset} 열기 실패: {e}")
+                return
+            job['future'] = asset_loader.submit(self._compose, sheet, path, *work)
+        else:
+            job['handle'] = asset_loader.load_images([path])
+        self._jobs[index] = job
+
+    def _step_job(self, index, job, deadline):
+        """작업을 한 단계 진행합니다. 청크 이미지가 준비됐거나 실패해서 끝났으면 True."""
+        future = job['future']
+        if future is not None:
+            if not future.done():
+                return False
+            job['future'] = None
+            try:
+                future.result()
+            except Exception as e:
+                print(f"[tilemap] 청크 {index} 굽기 실패: {e}")
+                return True
+            self.stats['baked'] += 1
+            job['handle'] = asset_loader.load_images([job['path']])
+
+        handle = job['handle']
+        handle.pump(max(0.0, deadline - time.perf_counter()), wait=False)
+        if not handle.done:
+            return False
+        try:
+            if not handle.failed and self._chunk_keys[index] == job['key']:
+                self._chunk_images[index] = resources.image(job['path'])
+        except Exception as e:
+            print(f"[tilemap] {job['path']} 로드 실패: {e}")
+        handle.release()
+        return True
+
+    def _cancel_jobs(self):
+        for job in self._jobs.values():
+            if job['future'] is not None:
+                job['future'].cancel()
+            if job['handle'] is not None:
+                job['handle'].release()
+        self._jobs.clear()
+
+    def update(self):
+        # 끝난 작업의 텍스처를 올리고, 바뀐 청크의 굽기를 작업 스레드에 맡김 (모두 BAKE_BUDGET 안에서)
+        if not self._dirty and not self._jobs:
+            return
+        deadline = time.perf_counter() + BAKE_BUDGET
+        for index, job in list(self._jobs.items()):
+            if self._step_job(index, job, deadline):
+                del self._jobs[index]
+            if time.perf_counter() >= deadline:
+                return
+        for index in list(self._dirty):
+            # 굽는 중에 다시 바뀐 청크는 이전 작업이 끝난 뒤에 다시 구움
+            if index in self._jobs:
+                continue
+            self._start_job(index)
+            del self._dirty[index]
+            if time.perf_counter() >= deadline:
+                break
+
+    # -----------------------------
+    # 그리기
+    # -----------------------------
+    def _visible_chunks(self):
+        camera = game_world.camera
+        if camera is None:
+            left, bottom, right, top = 0, 0, get_canvas_width(), get_canvas_height()
+        else:
+            left, bottom, right, top = camera.view_rect()
+        chunk_w = self.chunk_tiles * self.draw_w
+        chunk_h = self.chunk_tiles * self.draw_h
+        c1, c2 = max(0, int(left // chunk_w)), min(self.chunk_cols - 1, int(right // chunk_w))
+        r1, r2 = max(0, int(bottom // chunk_h)), min(self.chunk_rows - 1, int(top // chunk_h))
+        for crow in range(r1, r2 + 1):
+            for ccol in range(c1, c2 + 1):
+                yield crow * self.chunk_cols + ccol
+
+    def draw(self):
+        for index in self._visible_chunks():
+            image = self._chunk_images[index]
+            if image is not None and index not in self._dirty and index not in self._jobs:
+                col1, row1, w, h = self._chunk_cells(index)
+                x1, y1 = game_world.to_screen(col1 * self.draw_w, row1 * self.draw_h)
+                draw_w, draw_h = w * self.draw_w, h * self.draw_h
+                image.draw(x1 + draw_w / 2, y1 + draw_h / 2, draw_w, draw_h)
+                self.stats['chunk_draws'] += 1
+            elif self._chunk_keys[index] is not None or index in self._dirty or index in self._jobs:
+                self._draw_tiles(index)
+
+    def _draw_tiles(self, index):
+        """아직 굽지 못한 청크를 타일 단위로 그립니다."""
+        col1, row1, w, h = self._chunk_cells(index)
+        for row in range(row1, row1 + h):
+            for col in range(col1, col1 + w):
+                tile = self.tiles[row * self.cols + col]
+                if tile == EMPTY:
+                    continue
+                x, y = game_world.to_screen((col + 0.5) * self.draw_w, (row + 0.5) * self.draw_h)
+                self.image.clip_draw(*self._cell_rect(tile), x, y, self.draw_w, self.draw_h)
+                self.stats['tile_draws'] += 1
+
+    def release(self):
+        self._cancel_jobs()
+        prune_cache(self._chunk_keys)
+        self._sheet = None
+        for image in self._chunk_images:
+            if image is not None:
+                resources.release(image)
+        self._chunk_images = [None] * len(self._chunk_images)
+        self._dirty = dict.fromkeys(range(len(self._chunk_images)))
+        resources.release(self.image)
+        self.image = None
+
+
+def prune_cache(keep=(), limit=None):
+    """CACHE_DIR의 청크 이미지가 limit(기본 CACHE_LIMIT)개를 넘으면
+    keep에 없는 것을 수정 시각이 오래된 순서로 지웁니다. 지운 수를 돌려줍니다."""
+    limit = CACHE_LIMIT if limit is None else limit
+    try:
+        names = [n for n in os.listdir(CACHE_DIR) if n.endswith('.png')]
+    except OSError:
+        return 0
+    if len(names) <= limit:
+        return 0
+    keep = {f'{key}.png' for key in keep if key}
+    stale = []
+    for name in names:
+        if name in keep:
+            continue
+        try:
+            stale.append((os.path.getmtime(os.path.join(CACHE_DIR, name)), name))
+        except OSError:
+            pass
+    stale.sort()
+    removed = 0
+    for _, name in stale[:len(names) - limit]:
+        try:
+            os.remove(os.path.join(CACHE_DIR, name))
+            removed += 1
+        except OSError:
+            pass
+    return removed
@@ -2,25 +2,61 @@
 
 from pico2d import *
 import game_framework
+import sound
+import text_cache
 
 name = "TITLE_MODE"
 
+# 움직이는 것이 없으므로 입력이 올 때까지 잠들었다가 필요할 때만 다시 그림
+idle = True
+
 # 캔버스 크기는 main.py에서 이미 설정되어 있으므로, 여기서는 get_canvas_width/height 사용
 font = None
 
+# 첫 화면 뒤에 import 하는 play_mode 모듈, SPACE를 눌렀지만 아직 로딩 중이면 True
+play_mode = None
+start_requested = False
+_shown_progress = -1
+
 
 def init():
     global font
     print(f"[{name}] - init")
     try:
-        font = load_font('ENCR10B.TTF', 24)
+        font = text_cache.font('ENCR10B.TTF', 24)
     except Exception as e:
         print(f"폰트 로드 실패: {e}. 기본 폰트로 폴백.")
         font = None
 
 
+def _preload_play_mode():
+    global play_mode
+    # play_mode는 ratking/guard/ball/numpy까지 끌고 오므로 첫 화면을 띄운 다음에 import
+    import play_mode
+    game_framework.preload(play_mode)
+
+
+def _start_play():
+    global start_requested
+    if play_mode is None:
+        _preload_play_mode()
+    # 로딩이 끝났으면(또는 미리 읽기가 실패해서 멈췄으면) 바로 전환, 아니면 진행률을 보여주며 기다림
+    if game_framework.is_preloading(play_mode):
+        start_requested = True
+        game_framework.invalidate()
+    else:
+        start_requested = False
+        game_framework.change_mode(play_mode)
+
+
 def enter():
+    global start_requested
     print(f"[{name}] - enter")
+    start_requested = False
+    # 타이틀이 떠 있는 동안 PlayMode 자원을 프레임마다 조금씩 미리 읽음
+    game_framework.after_first_frame(_preload_play_mode)
+    # 배경음도 첫 화면을 띄운 뒤에 시작
+    game_framework.after_first_frame(lambda: sound.play_music('title'))
 
 
 def exit():
@@ -37,17 +73,43 @@ def handle_events():
         if event.type == SDL_QUIT:
             game_framework.quit()
         elif event.type == SDL_KEYDOWN:
-            # 스페이스바: 플레이 모드로 전환 (필요하면 play_mode import 후 change_mode 호출)
+            # 스페이스바: 플레이 모드로 전환 (로딩이 덜 끝났으면 끝날 때까지 진행률 표시)
             if event.key == SDLK_SPACE:
-                import play_mode
-                game_framework.change_mode(play_mode)
+                _start_play()
             # ESC: 게임 종료
             elif event.key == SDLK_ESCAPE:
                 game_framework.quit()
 
 
 def update():
-    pass
+    global _shown_progress
+    if play_mode is None:
+        return
+    # 진행률이 바뀌었을 때만 다시 그림 (유휴 모드)
+    progress = int(play_mode.load_progress() * 100)
+    if progress != _shown_progress:
+        _shown_progress = progress
+        game_framework.invalidate()
+    if start_requested and not game_framework.is_preloading(play_mode):
+        _start_play()
+
+
+def _draw_progress_bar(w, h):
+    if play_mode is None:
+        return
+    progress = play_mode.load_progress()
+    if progress >= 1.0 and not start_requested:
+        return
+    bar_w, bar_h = 300, 12
+    x1, y1 = w // 2 - bar_w // 2, h // 2 - 80
+    draw_rectangle(x1, y1, x1 + bar_w, y1 + bar_h)
+    # 채워진 부분은 가로줄을 쌓아서 그림
+    fill_x2 = x1 + int(bar_w * progress)
+    if fill_x2 > x1:
+        for y in range(y1 + 2, y1 + bar_h - 1):
+            draw_rectangle(x1 + 2, y, max(x1 + 2, fill_x2 - 2), y)
+    if font and start_requested:
+        font.draw(x1, y1 - 20, f'로딩 중... {int(progress * 100)}%', (255, 255, 255))
 
 
 def draw():
@@ -59,4 +121,6 @@ def draw():
         font.draw(w // 2 - 120, h // 2 + 50, '게임 시작', (255, 255, 255))
         font.draw(w // 2 - 180, h // 2, '(SPACE 키를 누르세요)', (255, 255, 0))
 
+    _draw_progress_bar(w, h)
+
     update_canvas()
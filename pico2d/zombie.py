@@ -4,6 +4,7 @@ import game_framework
 import game_world
 
 from pico2d import *
+import resources
 
 # Boss Run Speed (좀비보다 느리게 설정)
 BOSS_RUN_SPEED_KMPH = 5.0
@@ -24,7 +25,7 @@ class Boss:
         if Boss.image is None:
             # './assets/boss.png' 경로를 사용하거나,
             # 프로젝트 구조에 따라 실제 경로를 지정해야 합니다.
-            Boss.image = load_image('./assets/boss.png')
+            Boss.image = resources.image('./assets/boss.png')
 
             # 2. 초기 월드 좌표 설정 (맵 중앙 상단 부근)
         self.x, self.y = 800, 700  # 1600x900 맵 기준 중앙 상단
@@ -62,18 +63,15 @@ class Boss:
         self.x = clamp(self.left_boundary, self.x, self.right_boundary)
 
     def draw(self):
-        # 맵이 스크롤되는 경우, Ratking을 기준으로 화면 좌표를 계산해야 합니다.
-        # (이 코드는 Ratking 클래스가 있는 PlayMode2의 draw 로직을 따라야 합니다.)
-
-        # **현재는 맵 좌표(World Coordinate)를 그대로 화면 좌표로 가정하고 그립니다.**
-        # 만약 PlayMode2의 Ratking 스크롤링 로직을 사용한다면, 아래 코드를 수정해야 합니다.
+        # 맵이 스크롤되므로 카메라 기준 화면 좌표로 변환해서 그림
+        self.screen_x, self.screen_y = game_world.to_screen(self.x, self.y)
 
         if self.dir < 0:
             # 왼쪽 방향: 수평 반전(h)하여 그리기
-            Boss.image.composite_draw(0, 'h', self.x, self.y, Boss.BOSS_WIDTH, Boss.BOSS_HEIGHT)
+            Boss.image.composite_draw(0, 'h', self.screen_x, self.screen_y, Boss.BOSS_WIDTH, Boss.BOSS_HEIGHT)
         else:
             # 오른쪽 방향: 그대로 그리기
-            Boss.image.draw(self.x, self.y, Boss.BOSS_WIDTH, Boss.BOSS_HEIGHT)
+            Boss.image.draw(self.screen_x, self.screen_y, Boss.BOSS_WIDTH, Boss.BOSS_HEIGHT)
 
         # 충돌 박스 그리기 (디버깅용)
         # draw_rectangle(*self.get_bb())